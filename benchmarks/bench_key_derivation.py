@@ -0,0 +1,171 @@
+"""
+Benchmarks of the EIP-2333 key derivation (and EIP-2334 paths) used by the CLI.
+
+Run from the repository root, without network access:
+
+    python -m benchmarks.bench_key_derivation [--iterations N] [--warmup N] [--output FILE]
+
+Every benchmarked function is first checked against the EIP-2333 test vectors in `tests/`, then timed;
+the results (ops/sec and latency percentiles, in milliseconds) are reported as JSON.
+"""
+import argparse
+from functools import partial
+import json
+import math
+import os
+import platform
+import sys
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+from staking_deposit.key_handling.key_derivation.mnemonic import get_seed
+from staking_deposit.key_handling.key_derivation.path import mnemonic_and_path_to_key
+from staking_deposit.key_handling.key_derivation.tree import (
+    _parent_SK_to_lamport_PK,
+    derive_child_SK,
+    derive_master_SK,
+)
+from staking_deposit.utils.crypto import (
+    SHA256,
+    SHA256_chunks,
+)
+
+TEST_VECTORS_FOLDER = os.path.join('tests', 'test_key_handling', 'test_key_derivation', 'test_vectors')
+
+# The withdrawal and signing key paths of the first validator
+VALIDATOR_PATHS = ['m/12381/3600/0/0', 'm/12381/3600/0/0/0']
+
+# The two concatenated lamport SKs of a `_parent_SK_to_lamport_PK` call: 2 * 255 chunks of 32 bytes
+LAMPORT_CHUNK_SIZE = 32
+LAMPORT_DATA = bytes(i % 256 for i in range(2 * 255 * LAMPORT_CHUNK_SIZE))
+
+
+def SHA256_each_chunk(*, data: bytes, chunk_size: int) -> bytes:
+    """
+    The reference for `SHA256_chunks`: a new PyCryptodome hash object for every chunk.
+    """
+    return b''.join([SHA256(data[i: i + chunk_size]) for i in range(0, len(data), chunk_size)])
+
+
+def load_test_vectors() -> Dict[str, Any]:
+    with open(os.path.join(TEST_VECTORS_FOLDER, 'tree_kdf_intermediate.json'), 'r') as f:
+        intermediate = json.load(f)
+    with open(os.path.join(TEST_VECTORS_FOLDER, 'tree_kdf.json'), 'r') as f:
+        kdf_tests = json.load(f)['kdf_tests']
+    return {'intermediate': intermediate, 'kdf_tests': kdf_tests}
+
+
+def check_test_vectors(test_vectors: Dict[str, Any]) -> None:
+    """
+    Raise a `ValueError` if any benchmarked function disagrees with the EIP-2333 test vectors.
+    """
+    intermediate = test_vectors['intermediate']
+    checks = [
+        get_seed(mnemonic=intermediate['mnemonic'], password=intermediate['password'])
+        == bytes.fromhex(intermediate['seed']),
+        _parent_SK_to_lamport_PK(parent_SK=intermediate['master_SK'], index=intermediate['child_index'])
+        == bytes.fromhex(intermediate['compressed_lamport_PK']),
+        mnemonic_and_path_to_key(mnemonic=intermediate['mnemonic'], path=intermediate['path'],
+                                 password=intermediate['password']) == intermediate['child_SK'],
+    ]
+    for test in test_vectors['kdf_tests']:
+        checks.append(derive_master_SK(bytes.fromhex(test['seed'])) == test['master_SK'])
+        checks.append(derive_child_SK(parent_SK=test['master_SK'], index=test['child_index']) == test['child_SK'])
+    checks.append(SHA256_chunks(data=LAMPORT_DATA, chunk_size=LAMPORT_CHUNK_SIZE)
+                  == SHA256_each_chunk(data=LAMPORT_DATA, chunk_size=LAMPORT_CHUNK_SIZE))
+    if not all(checks):
+        raise ValueError("The key derivation does not match the EIP-2333 test vectors.")
+
+
+def summarize(timings: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize the `timings` (in seconds) of a benchmark; the percentiles use the nearest-rank method.
+    """
+    ordered = sorted(timings)
+
+    def percentile_ms(p: float) -> float:
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] * 1000
+
+    total = sum(ordered)
+    return {
+        'iterations': len(ordered),
+        'ops_per_sec': len(ordered) / total,
+        'mean_ms': total / len(ordered) * 1000,
+        'min_ms': ordered[0] * 1000,
+        'p50_ms': percentile_ms(50),
+        'p90_ms': percentile_ms(90),
+        'p99_ms': percentile_ms(99),
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def time_function(function: Callable[[], Any], *, iterations: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        function()
+    timings: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def run_benchmarks(*, iterations: int, warmup: int) -> Dict[str, Any]:
+    if iterations < 1:
+        raise ValueError(f"`iterations` should be greater than or equal to 1. Got {iterations}.")
+    test_vectors = load_test_vectors()
+    check_test_vectors(test_vectors)
+
+    intermediate = test_vectors['intermediate']
+    mnemonic, password = intermediate['mnemonic'], intermediate['password']
+    seed = bytes.fromhex(intermediate['seed'])
+    master_SK, child_index = intermediate['master_SK'], intermediate['child_index']
+    benchmarks: Dict[str, Callable[[], Any]] = {
+        'get_seed': lambda: get_seed(mnemonic=mnemonic, password=password),
+        'derive_master_SK': lambda: derive_master_SK(seed),
+        'derive_child_SK': lambda: derive_child_SK(parent_SK=master_SK, index=child_index),
+        '_parent_SK_to_lamport_PK': lambda: _parent_SK_to_lamport_PK(parent_SK=master_SK, index=child_index),
+        'SHA256_chunks': partial(SHA256_chunks, data=LAMPORT_DATA, chunk_size=LAMPORT_CHUNK_SIZE),
+        'SHA256_each_chunk': partial(SHA256_each_chunk, data=LAMPORT_DATA, chunk_size=LAMPORT_CHUNK_SIZE),
+    }
+    for path in VALIDATOR_PATHS:
+        benchmarks[f'mnemonic_and_path_to_key[{path}]'] = partial(
+            mnemonic_and_path_to_key, mnemonic=mnemonic, path=path, password=password,
+        )
+    return {
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'iterations': iterations,
+        'warmup': warmup,
+        'results': {
+            name: time_function(function, iterations=iterations, warmup=warmup)
+            for name, function in benchmarks.items()
+        },
+    }
+
+
+def main(argv: Optional[Sequence[str]]=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the EIP-2333/2334 key derivation.")
+    parser.add_argument('--iterations', type=int, default=50, help="The number of timed calls per benchmark.")
+    parser.add_argument('--warmup', type=int, default=2, help="The number of untimed calls per benchmark.")
+    parser.add_argument('--output', default=None, help="The JSON file to write the results to (stdout by default).")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(iterations=args.iterations, warmup=args.warmup)
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=4)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,14 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(SPECPATH, '..', '..')))
+from staking_deposit.key_handling.key_derivation.bundle_word_lists import write_word_lists_bundle
+
+# Compile the word-lists into the binary, rather than reading each of them from _MEIPASS at runtime
+write_word_lists_bundle()
+
 block_cipher = None
 
 
@@ -0,0 +1,136 @@
+import click
+from itertools import tee
+from typing import (
+    Any,
+    IO,
+    Iterator,
+    Tuple,
+)
+
+from staking_deposit.credentials import iter_mnemonic_signing_pubkeys
+from staking_deposit.exceptions import ValidationError
+from staking_deposit.utils.constants import WORD_LISTS_PATH
+from staking_deposit.utils.validation import (
+    validate_int_range,
+    validate_pubkeys_list,
+)
+from staking_deposit.utils.click import (
+    captive_prompt_callback,
+    jit_option,
+)
+from staking_deposit.utils.intl import load_text
+
+
+FUNC_NAME = 'audit_mnemonics'
+
+
+def _read_mnemonics(mnemonics_file: IO[str]) -> Iterator[Tuple[int, str]]:
+    """
+    Yield the (line number, mnemonic) of every mnemonic in `mnemonics_file`, skipping blank and comment lines.
+    """
+    for line_number, line in enumerate(mnemonics_file, start=1):
+        mnemonic = ' '.join(line.split())
+        if mnemonic != '' and not mnemonic.startswith('#'):
+            yield line_number, mnemonic
+
+
+@click.command(
+    help=load_text(['arg_audit_mnemonics', 'help'], func=FUNC_NAME),
+)
+@jit_option(
+    help=lambda: load_text(['arg_mnemonics_file', 'help'], func=FUNC_NAME),
+    param_decls='--mnemonics_file',
+    required=True,
+    type=click.File('r', encoding='utf-8'),
+)
+@jit_option(
+    help=lambda: load_text(['arg_expected_pubkeys', 'help'], func=FUNC_NAME),
+    param_decls='--expected_pubkeys',
+    required=True,
+    type=click.File('r', encoding='utf-8'),
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda x: x,
+        lambda: load_text(['arg_mnemonic_password', 'prompt'], func=FUNC_NAME),
+        lambda: load_text(['arg_mnemonic_password', 'confirm'], func=FUNC_NAME),
+        lambda: load_text(['arg_mnemonic_password', 'mismatch'], func=FUNC_NAME),
+        True,
+    ),
+    default='',
+    help=lambda: load_text(['arg_mnemonic_password', 'help'], func=FUNC_NAME),
+    hidden=True,
+    param_decls='--mnemonic-password',
+    prompt=False,
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda num: validate_int_range(num, 0, 2**32),
+        lambda: load_text(['arg_validator_start_index', 'help'], func=FUNC_NAME),
+    ),
+    default=0,
+    help=lambda: load_text(['arg_validator_start_index', 'help'], func=FUNC_NAME),
+    param_decls='--validator_start_index',
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda num: validate_int_range(num, 1, 2**32),
+        lambda: load_text(['arg_num_keys', 'help'], func=FUNC_NAME),
+    ),
+    default=1,
+    help=lambda: load_text(['arg_num_keys', 'help'], func=FUNC_NAME),
+    param_decls='--num_keys',
+)
+@jit_option(
+    default=1,
+    help=lambda: load_text(['arg_num_workers', 'help'], func=FUNC_NAME),
+    param_decls='--num_workers',
+    type=click.IntRange(min=1),
+)
+@click.pass_context
+def audit_mnemonics(
+        ctx: click.Context,
+        mnemonics_file: IO[str],
+        expected_pubkeys: IO[str],
+        mnemonic_password: str,
+        validator_start_index: int,
+        num_keys: int,
+        num_workers: int,
+        **kwargs: Any) -> None:
+    try:
+        expected = frozenset(validate_pubkeys_list(expected_pubkeys.read()))
+    except ValidationError as e:
+        raise click.BadParameter(str(e), param_hint='--expected_pubkeys')
+    num_keys = min(num_keys, 2**32 - validator_start_index)
+
+    # The mnemonics are streamed: `tee` only buffers the line numbers of the mnemonics in flight
+    numbered_mnemonics, numbered_lines = tee(_read_mnemonics(mnemonics_file))
+    signing_pubkeys = iter_mnemonic_signing_pubkeys(
+        mnemonics=(mnemonic for _, mnemonic in numbered_mnemonics),
+        password=mnemonic_password,
+        words_path=WORD_LISTS_PATH,
+        start_index=validator_start_index,
+        num_keys=num_keys,
+        num_workers=num_workers,
+    )
+    num_ok = num_mismatched = num_invalid = 0
+    for (line_number, _), pubkeys in zip(numbered_lines, signing_pubkeys):
+        if pubkeys is None:
+            num_invalid += 1
+            click.echo(load_text(['msg_mnemonic_invalid']) % line_number)
+            continue
+        missing_indices = [validator_start_index + i for i, pubkey in enumerate(pubkeys) if pubkey not in expected]
+        if len(missing_indices) == 0:
+            num_ok += 1
+            click.echo(load_text(['msg_mnemonic_ok']) % (line_number, len(pubkeys)))
+        else:
+            num_mismatched += 1
+            click.echo(load_text(['msg_mnemonic_mismatch']) % (
+                line_number, len(pubkeys) - len(missing_indices), len(pubkeys),
+                ', '.join(str(index) for index in missing_indices),
+            ))
+
+    click.echo(load_text(['msg_audit_summary']) % (num_ok + num_mismatched + num_invalid, num_ok,
+                                                   num_mismatched, num_invalid))
+    if num_mismatched + num_invalid > 0:
+        ctx.exit(1)
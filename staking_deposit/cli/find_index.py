@@ -0,0 +1,122 @@
+import click
+from typing import (
+    Any,
+    Optional,
+    Sequence,
+)
+
+from staking_deposit.credentials import find_key_indices
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+from staking_deposit.key_handling.pubkey_index import open_pubkey_index
+from staking_deposit.utils.validation import (
+    validate_int_range,
+    validate_pubkeys_or_bls_withdrawal_credentials_list,
+)
+from staking_deposit.utils.click import (
+    captive_prompt_callback,
+    jit_option,
+)
+from staking_deposit.utils.intl import load_text
+from .existing_mnemonic import (
+    load_mnemonic_arguments_decorator,
+)
+
+
+FUNC_NAME = 'find_index'
+
+
+@click.command(
+    help=load_text(['arg_find_index', 'help'], func=FUNC_NAME),
+)
+@load_mnemonic_arguments_decorator
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda targets: validate_pubkeys_or_bls_withdrawal_credentials_list(targets),
+        lambda: load_text(['arg_targets', 'prompt'], func=FUNC_NAME),
+    ),
+    help=lambda: load_text(['arg_targets', 'help'], func=FUNC_NAME),
+    param_decls='--targets',
+    prompt=lambda: load_text(['arg_targets', 'prompt'], func=FUNC_NAME),
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda num: validate_int_range(num, 0, 2**32),
+        lambda: load_text(['arg_validator_start_index', 'help'], func=FUNC_NAME),
+    ),
+    default=0,
+    help=lambda: load_text(['arg_validator_start_index', 'help'], func=FUNC_NAME),
+    param_decls='--validator_start_index',
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda num: validate_int_range(num, 1, 2**32),
+        lambda: load_text(['arg_num_indices', 'help'], func=FUNC_NAME),
+    ),
+    default=1000,
+    help=lambda: load_text(['arg_num_indices', 'help'], func=FUNC_NAME),
+    param_decls='--num_indices',
+)
+@jit_option(
+    default=1,
+    help=lambda: load_text(['arg_num_workers', 'help'], func=FUNC_NAME),
+    param_decls='--num_workers',
+    type=click.IntRange(min=1),
+)
+@jit_option(
+    default=None,
+    help=lambda: load_text(['arg_pubkey_index', 'help'], func=FUNC_NAME),
+    param_decls=['--pubkey_index', 'pubkey_index_path'],
+    type=click.Path(file_okay=True, dir_okay=False),
+)
+@jit_option(
+    default=False,
+    help=lambda: load_text(['arg_check_pubkey_index', 'help'], func=FUNC_NAME),
+    is_flag=True,
+    param_decls='--check_pubkey_index',
+)
+@jit_option(
+    default=False,
+    help=lambda: load_text(['arg_rebuild_pubkey_index', 'help'], func=FUNC_NAME),
+    is_flag=True,
+    param_decls='--rebuild_pubkey_index',
+)
+@click.pass_context
+def find_index(
+        ctx: click.Context,
+        mnemonic: str,
+        mnemonic_password: str,
+        targets: Sequence[bytes],
+        validator_start_index: int,
+        num_indices: int,
+        num_workers: int,
+        pubkey_index_path: Optional[str],
+        check_pubkey_index: bool,
+        rebuild_pubkey_index: bool,
+        **kwargs: Any) -> None:
+    num_indices = min(num_indices, 2**32 - validator_start_index)
+    with DerivationContext(mnemonic=mnemonic, password=mnemonic_password) as derivation_context, \
+            open_pubkey_index(pubkey_index_path, master_SK=derivation_context.master_SK) as pubkey_index:
+        if pubkey_index is not None and rebuild_pubkey_index:
+            # Every entry of this seed is discarded, and derived and recorded again
+            pubkey_index.invalidate()
+        elif pubkey_index is not None and check_pubkey_index:
+            click.echo(load_text(['msg_pubkey_index_check']) % pubkey_index.check_integrity())
+        found = find_key_indices(
+            derivation_context=derivation_context,
+            targets=targets,
+            start_index=validator_start_index,
+            num_indices=num_indices,
+            num_workers=num_workers,
+            pubkey_index=pubkey_index,
+        )
+
+    click.echo()
+    for target in targets:
+        if target in found:
+            click.echo(load_text(['msg_index_found']) % ('0x' + target.hex(), found[target]))
+        else:
+            click.echo(load_text(['msg_index_not_found']) % (
+                '0x' + target.hex(), validator_start_index, validator_start_index + num_indices - 1,
+            ))
+
+    click.pause(load_text(['msg_pause']))
@@ -3,14 +3,18 @@ import click
 import json
 from typing import (
     Any,
+    Optional,
     Sequence,
 )
 
 from eth_typing import HexAddress
 
 from staking_deposit.credentials import (
+    WITHDRAWAL_KEY,
     CredentialList,
 )
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+from staking_deposit.key_handling.pubkey_index import open_pubkey_index
 from staking_deposit.utils.validation import (
     validate_bls_withdrawal_credentials_list,
     validate_bls_withdrawal_credentials_matching,
@@ -117,6 +121,30 @@ FUNC_NAME = 'generate_bls_to_execution_change'
     param_decls=['--execution_address', '--eth1_withdrawal_address'],
     prompt=lambda: load_text(['arg_execution_address', 'prompt'], func=FUNC_NAME),
 )
+@jit_option(
+    default=1,
+    help=lambda: load_text(['arg_num_workers', 'help'], func=FUNC_NAME),
+    param_decls='--num_workers',
+    type=click.IntRange(min=1),
+)
+@jit_option(
+    default=None,
+    help=lambda: load_text(['arg_pubkey_index', 'help'], func=FUNC_NAME),
+    param_decls=['--pubkey_index', 'pubkey_index_path'],
+    type=click.Path(file_okay=True, dir_okay=False),
+)
+@jit_option(
+    default=False,
+    help=lambda: load_text(['arg_check_pubkey_index', 'help'], func=FUNC_NAME),
+    is_flag=True,
+    param_decls='--check_pubkey_index',
+)
+@jit_option(
+    default=False,
+    help=lambda: load_text(['arg_rebuild_pubkey_index', 'help'], func=FUNC_NAME),
+    is_flag=True,
+    param_decls='--rebuild_pubkey_index',
+)
 @jit_option(
     # Only for devnet tests
     default=None,
@@ -135,6 +163,10 @@ def generate_bls_to_execution_change(
         bls_withdrawal_credentials_list: Sequence[bytes],
         execution_address: HexAddress,
         devnet_chain_setting: str,
+        num_workers: int,
+        pubkey_index_path: Optional[str],
+        check_pubkey_index: bool,
+        rebuild_pubkey_index: bool,
         **kwargs: Any) -> None:
     # Generate folder
     bls_to_execution_changes_folder = os.path.join(
@@ -165,35 +197,48 @@ def generate_bls_to_execution_change(
     num_validators = len(validator_indices)
     amounts = [MAX_DEPOSIT_AMOUNT] * num_validators
 
-    credentials = CredentialList.from_mnemonic(
-        mnemonic=mnemonic,
-        mnemonic_password=mnemonic_password,
-        num_keys=num_validators,
-        amounts=amounts,
-        chain_setting=chain_setting,
-        start_index=validator_start_index,
-        hex_eth1_withdrawal_address=execution_address,
-    )
+    with DerivationContext(mnemonic=mnemonic, password=mnemonic_password) as derivation_context, \
+            open_pubkey_index(pubkey_index_path, master_SK=derivation_context.master_SK) as pubkey_index:
+        if pubkey_index is not None and rebuild_pubkey_index:
+            # Every entry of this seed is discarded, and derived and recorded again
+            pubkey_index.invalidate()
+        elif pubkey_index is not None and check_pubkey_index:
+            click.echo(load_text(['msg_pubkey_index_check']) % pubkey_index.check_integrity())
+        credentials = CredentialList.from_mnemonic(
+            mnemonic=mnemonic,
+            mnemonic_password=mnemonic_password,
+            num_keys=num_validators,
+            amounts=amounts,
+            chain_setting=chain_setting,
+            start_index=validator_start_index,
+            hex_eth1_withdrawal_address=execution_address,
+            derivation_context=derivation_context,
+            num_workers=num_workers,
+            pubkey_index=pubkey_index,
+            # The changes are signed with the withdrawal keys only
+            keys=(WITHDRAWAL_KEY,),
+        )
 
-    # Check if the given old bls_withdrawal_credentials is as same as the mnemonic generated
-    for i, credential in enumerate(credentials.credentials):
-        try:
-            validate_bls_withdrawal_credentials_matching(bls_withdrawal_credentials_list[i], credential)
-        except ValidationError as e:
-            click.echo('\n[Error] ' + str(e))
-            return
-
-    btec_file = credentials.export_bls_to_execution_change_json(bls_to_execution_changes_folder, validator_indices)
-
-    json_file_validation_result = verify_bls_to_execution_change_json(
-        btec_file,
-        credentials.credentials,
-        input_validator_indices=validator_indices,
-        input_execution_address=execution_address,
-        chain_setting=chain_setting,
-    )
-    if not json_file_validation_result:
-        raise ValidationError(load_text(['err_verify_btec']))
+        # Check if the given old bls_withdrawal_credentials is as same as the mnemonic generated
+        for i, credential in enumerate(credentials.credentials):
+            try:
+                validate_bls_withdrawal_credentials_matching(bls_withdrawal_credentials_list[i], credential)
+            except ValidationError as e:
+                click.echo('\n[Error] ' + str(e))
+                return
+
+        btec_file = credentials.export_bls_to_execution_change_json(
+            bls_to_execution_changes_folder, validator_indices, num_workers=num_workers)
+
+        json_file_validation_result = verify_bls_to_execution_change_json(
+            btec_file,
+            credentials.credentials,
+            input_validator_indices=validator_indices,
+            input_execution_address=execution_address,
+            chain_setting=chain_setting,
+        )
+        if not json_file_validation_result:
+            raise ValidationError(load_text(['err_verify_btec']))
 
     click.echo(load_text(['msg_creation_success']) + str(bls_to_execution_changes_folder))
 
@@ -0,0 +1,150 @@
+import click
+import json
+import os
+from typing import (
+    Any,
+)
+
+from eth_typing import HexAddress
+from staking_deposit.credentials import save_deposit_data_json
+from staking_deposit.devnet import generate_devnet_keys as generate_insecure_devnet_keys
+from staking_deposit.exceptions import ValidationError
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+from staking_deposit.settings import (
+    BaseChainSetting,
+    get_devnet_chain_setting,
+    is_public_chain_setting,
+)
+from staking_deposit.utils.constants import DEFAULT_VALIDATOR_KEYS_FOLDER_NAME
+from staking_deposit.utils.click import (
+    captive_prompt_callback,
+    jit_option,
+)
+from staking_deposit.utils.intl import load_text
+from staking_deposit.utils.validation import (
+    validate_eth1_withdrawal_address,
+    validate_int_range,
+    validate_password_strength,
+    verify_saved_deposit_data_json,
+)
+from .existing_mnemonic import load_mnemonic_arguments_decorator
+
+
+FUNC_NAME = 'generate_devnet_keys'
+
+
+def validate_devnet_chain_setting(devnet_chain_setting: str) -> BaseChainSetting:
+    try:
+        devnet_chain_setting_dict = json.loads(devnet_chain_setting)
+        chain_setting = get_devnet_chain_setting(
+            network_name=devnet_chain_setting_dict['network_name'],
+            genesis_fork_version=devnet_chain_setting_dict['genesis_fork_version'],
+            genesis_validator_root=devnet_chain_setting_dict['genesis_validator_root'],
+        )
+    except (ValueError, TypeError, KeyError):
+        raise ValidationError(load_text(['err_invalid_devnet_chain_setting']))
+    if len(chain_setting.GENESIS_FORK_VERSION) != 4:
+        raise ValidationError(load_text(['err_invalid_devnet_chain_setting']))
+    if is_public_chain_setting(chain_setting):
+        raise ValidationError(load_text(['err_public_chain']) % chain_setting.NETWORK_NAME)
+    return chain_setting
+
+
+@click.command(
+    help=load_text(['arg_generate_devnet_keys', 'help'], func=FUNC_NAME),
+)
+@load_mnemonic_arguments_decorator
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda devnet_chain_setting: validate_devnet_chain_setting(devnet_chain_setting),
+        lambda: load_text(['arg_devnet_chain_setting', 'prompt'], func=FUNC_NAME),
+    ),
+    help=lambda: load_text(['arg_devnet_chain_setting', 'help'], func=FUNC_NAME),
+    param_decls='--devnet_chain_setting',
+    prompt=lambda: load_text(['arg_devnet_chain_setting', 'prompt'], func=FUNC_NAME),
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda num: validate_int_range(num, 0, 2**32),
+        lambda: load_text(['arg_validator_start_index', 'help'], func=FUNC_NAME),
+    ),
+    default=0,
+    help=lambda: load_text(['arg_validator_start_index', 'help'], func=FUNC_NAME),
+    param_decls='--validator_start_index',
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda num: validate_int_range(num, 1, 2**32),
+        lambda: load_text(['arg_num_validators', 'prompt'], func=FUNC_NAME),
+    ),
+    help=lambda: load_text(['arg_num_validators', 'help'], func=FUNC_NAME),
+    param_decls='--num_validators',
+    prompt=lambda: load_text(['arg_num_validators', 'prompt'], func=FUNC_NAME),
+)
+@jit_option(
+    default=os.getcwd(),
+    help=lambda: load_text(['arg_folder', 'help'], func=FUNC_NAME),
+    param_decls='--folder',
+    type=click.Path(exists=True, file_okay=False, dir_okay=True),
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        validate_password_strength,
+        lambda: load_text(['arg_keystore_password', 'prompt'], func=FUNC_NAME),
+        lambda: load_text(['arg_keystore_password', 'confirm'], func=FUNC_NAME),
+        lambda: load_text(['arg_keystore_password', 'mismatch'], func=FUNC_NAME),
+        True,
+    ),
+    help=lambda: load_text(['arg_keystore_password', 'help'], func=FUNC_NAME),
+    hide_input=True,
+    param_decls='--keystore_password',
+    prompt=lambda: load_text(['arg_keystore_password', 'prompt'], func=FUNC_NAME),
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda address: validate_eth1_withdrawal_address(None, None, address),
+        lambda: load_text(['arg_execution_address', 'help'], func=FUNC_NAME),
+    ),
+    default=None,
+    help=lambda: load_text(['arg_execution_address', 'help'], func=FUNC_NAME),
+    param_decls=['--execution_address', '--eth1_withdrawal_address'],
+)
+@jit_option(
+    default=lambda: os.cpu_count() or 1,
+    help=lambda: load_text(['arg_num_workers', 'help'], func=FUNC_NAME),
+    param_decls='--num_workers',
+    type=click.IntRange(min=1),
+)
+@click.pass_context
+def generate_devnet_keys(
+        ctx: click.Context,
+        mnemonic: str,
+        mnemonic_password: str,
+        devnet_chain_setting: BaseChainSetting,
+        validator_start_index: int,
+        num_validators: int,
+        folder: str,
+        keystore_password: str,
+        execution_address: HexAddress,
+        num_workers: int,
+        **kwargs: Any) -> None:
+    folder = os.path.join(folder, DEFAULT_VALIDATOR_KEYS_FOLDER_NAME)
+    if not os.path.exists(folder):
+        os.mkdir(folder)
+    click.echo('\n%s\n' % load_text(['msg_insecure_warning']))
+    with DerivationContext(mnemonic=mnemonic, password=mnemonic_password) as derivation_context:
+        devnet_keys = generate_insecure_devnet_keys(
+            derivation_context=derivation_context,
+            num_keys=num_validators,
+            chain_setting=devnet_chain_setting,
+            start_index=validator_start_index,
+            hex_eth1_withdrawal_address=execution_address,
+            password=keystore_password,
+            folder=folder,
+            num_workers=num_workers,
+        )
+        deposit_data = [deposit_datum for _, deposit_datum in devnet_keys]
+    deposits_file = save_deposit_data_json(deposit_data, folder, insecure=True)
+    if not verify_saved_deposit_data_json(deposits_file, deposit_data):
+        raise ValidationError(load_text(['err_verify_deposit']))
+    click.echo(load_text(['msg_creation_success']) + folder)
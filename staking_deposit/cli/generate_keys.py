@@ -3,15 +3,24 @@ import click
 from typing import (
     Any,
     Callable,
+    Optional,
 )
 
 from eth_typing import HexAddress
 from staking_deposit.credentials import (
-    CredentialList,
+    Credential,
+    deposit_datum_to_json,
+    iter_credentials,
+    save_deposit_data_json,
+    signing_key_path,
 )
 from staking_deposit.exceptions import ValidationError
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+from staking_deposit.key_handling.pubkey_index import master_PK_fingerprint, open_pubkey_index
 from staking_deposit.utils.validation import (
-    verify_deposit_data_json,
+    validate_deposit,
+    verify_deposit_signatures,
+    verify_saved_deposit_data_json,
     validate_int_range,
     validate_password_strength,
     validate_eth1_withdrawal_address,
@@ -30,6 +39,7 @@ from staking_deposit.utils.intl import (
     closest_match,
     load_text,
 )
+from staking_deposit.utils.journal import KeyGenerationJournal
 from staking_deposit.settings import (
     ALL_CHAINS,
     MAINNET,
@@ -102,6 +112,24 @@ def generate_keys_arguments_decorator(function: Callable[..., Any]) -> Callable[
             help=lambda: load_text(['arg_execution_address', 'help'], func='generate_keys_arguments_decorator'),
             param_decls=['--execution_address', '--eth1_withdrawal_address'],
         ),
+        jit_option(
+            default=1,
+            help=lambda: load_text(['num_workers', 'help'], func='generate_keys_arguments_decorator'),
+            param_decls='--num_workers',
+            type=click.IntRange(min=1),
+        ),
+        jit_option(
+            default=None,
+            help=lambda: load_text(['pubkey_index', 'help'], func='generate_keys_arguments_decorator'),
+            param_decls=['--pubkey_index', 'pubkey_index_path'],
+            type=click.Path(file_okay=True, dir_okay=False),
+        ),
+        jit_option(
+            default=False,
+            help=lambda: load_text(['resume', 'help'], func='generate_keys_arguments_decorator'),
+            is_flag=True,
+            param_decls='--resume',
+        ),
     ]
     for decorator in reversed(decorators):
         function = decorator(function)
@@ -112,7 +140,8 @@ def generate_keys_arguments_decorator(function: Callable[..., Any]) -> Callable[
 @click.pass_context
 def generate_keys(ctx: click.Context, validator_start_index: int,
                   num_validators: int, folder: str, chain: str, keystore_password: str,
-                  execution_address: HexAddress, **kwargs: Any) -> None:
+                  execution_address: HexAddress, num_workers: int, pubkey_index_path: Optional[str],
+                  resume: bool, **kwargs: Any) -> None:
     mnemonic = ctx.obj['mnemonic']
     mnemonic_password = ctx.obj['mnemonic_password']
     amounts = [MAX_DEPOSIT_AMOUNT] * num_validators
@@ -123,20 +152,72 @@ def generate_keys(ctx: click.Context, validator_start_index: int,
     click.clear()
     click.echo(RHINO_0)
     click.echo(load_text(['msg_key_creation']))
-    credentials = CredentialList.from_mnemonic(
-        mnemonic=mnemonic,
-        mnemonic_password=mnemonic_password,
-        num_keys=num_validators,
-        amounts=amounts,
-        chain_setting=chain_setting,
-        start_index=validator_start_index,
-        hex_eth1_withdrawal_address=execution_address,
-    )
-    keystore_filefolders = credentials.export_keystores(password=keystore_password, folder=folder)
-    deposits_file = credentials.export_deposit_data_json(folder=folder)
-    if not credentials.verify_keystores(keystore_filefolders=keystore_filefolders, password=keystore_password):
-        raise ValidationError(load_text(['err_verify_keystores']))
-    if not verify_deposit_data_json(deposits_file, credentials.credentials):
-        raise ValidationError(load_text(['err_verify_deposit']))
+    with DerivationContext(mnemonic=mnemonic, password=mnemonic_password) as derivation_context, \
+            open_pubkey_index(pubkey_index_path, master_SK=derivation_context.master_SK) as pubkey_index:
+        # The journal records the completed indices so that an interrupted run can be resumed
+        journal = KeyGenerationJournal.open(folder, {
+            'seed_fingerprint': master_PK_fingerprint(derivation_context.master_SK),
+            'network_name': chain_setting.NETWORK_NAME,
+            'fork_version': chain_setting.GENESIS_FORK_VERSION.hex(),
+            'execution_address': execution_address,
+            'start_index': validator_start_index,
+            'num_validators': num_validators,
+        }, resume=resume)
+        num_completed = len(journal.completed)
+        if journal.resumed:
+            journal.verify_keystore_password(keystore_password)
+        # The journaled deposits are only reused if they are those of the keys derived here
+        for position, entry in enumerate(journal.completed):
+            if entry['index'] != validator_start_index + position:
+                raise ValidationError(load_text(['err_verify_deposit']))
+            journaled_credential = Credential(
+                derivation_context=derivation_context,
+                index=entry['index'],
+                amount=amounts[position],
+                chain_setting=chain_setting,
+                hex_eth1_withdrawal_address=execution_address,
+                pubkey_index=pubkey_index,
+            )
+            if not validate_deposit(entry['deposit_datum'], journaled_credential, verify_signature=False):
+                raise ValidationError(load_text(['err_verify_deposit']))
+        if journal.resumed and num_completed < num_validators:
+            # Drop the keystore that the interrupted run may have written for its next index but not recorded
+            recorded_keystores = {entry['keystore'] for entry in journal.completed}
+            stale_prefix = 'keystore-%s-' % signing_key_path(journal.next_index).replace('/', '_')
+            for file_name in os.listdir(folder):
+                if file_name.startswith(stale_prefix) and file_name not in recorded_keystores:
+                    os.remove(os.path.join(folder, file_name))
+        credentials = iter_credentials(
+            derivation_context=derivation_context,
+            num_keys=num_validators - num_completed,
+            amounts=amounts[num_completed:],
+            chain_setting=chain_setting,
+            start_index=journal.next_index,
+            hex_eth1_withdrawal_address=execution_address,
+            num_workers=num_workers,
+            pubkey_index=pubkey_index,
+            sign_deposits=True,
+        )
+        # Each credential is saved and verified as soon as it is created and is then dropped,
+        # so only its (public) deposit datum is kept until the deposit data JSON file is written
+        with click.progressbar(credentials, length=num_validators - num_completed,
+                               label=load_text(['msg_keystore_creation']), show_percent=False, show_pos=True) as bar:
+            for credential in bar:
+                keystore_filefolder = credential.save_signing_keystore(password=keystore_password, folder=folder)
+                if not credential.verify_keystore(keystore_filefolder=keystore_filefolder, password=keystore_password):
+                    raise ValidationError(load_text(['err_verify_keystores']))
+                deposit_datum = deposit_datum_to_json(credential.deposit_datum_dict)
+                if not validate_deposit(deposit_datum, credential, verify_signature=False):
+                    raise ValidationError(load_text(['err_verify_deposit']))
+                journal.record(index=journal.next_index, keystore=os.path.basename(keystore_filefolder),
+                               deposit_datum=deposit_datum)
+        deposit_data = journal.deposit_data
+        # The new deposits were verified as they were signed, the deposits of a resumed run are verified at once
+        if not verify_deposit_signatures(deposit_data[:num_completed]):
+            raise ValidationError(load_text(['err_verify_deposit']))
+        deposits_file = save_deposit_data_json(deposit_data, folder)
+        if not verify_saved_deposit_data_json(deposits_file, deposit_data):
+            raise ValidationError(load_text(['err_verify_deposit']))
+        journal.remove()
     click.echo(load_text(['msg_creation_success']) + folder)
     click.pause(load_text(['msg_pause']))
@@ -0,0 +1,122 @@
+import click
+import os
+from typing import (
+    Any,
+    Sequence,
+)
+
+from staking_deposit.mnemonic_recovery import recover_mnemonic_from_pubkeys
+from staking_deposit.exceptions import ValidationError
+from staking_deposit.key_handling.key_derivation.mnemonic import get_mnemonic_candidates
+from staking_deposit.utils.constants import WORD_LISTS_PATH
+from staking_deposit.utils.validation import (
+    validate_int_range,
+    validate_pubkeys_list,
+)
+from staking_deposit.utils.click import (
+    captive_prompt_callback,
+    jit_option,
+)
+from staking_deposit.utils.intl import load_text
+
+
+FUNC_NAME = 'recover_mnemonic'
+
+
+def validate_partial_mnemonic(mnemonic: str) -> str:
+    try:
+        get_mnemonic_candidates(mnemonic, WORD_LISTS_PATH)
+    except ValueError:
+        raise ValidationError(load_text(['err_invalid_partial_mnemonic']))
+    return mnemonic
+
+
+@click.command(
+    help=load_text(['arg_recover_mnemonic', 'help'], func=FUNC_NAME),
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda mnemonic: validate_partial_mnemonic(mnemonic),
+        lambda: load_text(['arg_mnemonic', 'prompt'], func=FUNC_NAME),
+    ),
+    help=lambda: load_text(['arg_mnemonic', 'help'], func=FUNC_NAME),
+    param_decls='--mnemonic',
+    prompt=lambda: load_text(['arg_mnemonic', 'prompt'], func=FUNC_NAME),
+    type=str,
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda x: x,
+        lambda: load_text(['arg_mnemonic_password', 'prompt'], func=FUNC_NAME),
+        lambda: load_text(['arg_mnemonic_password', 'confirm'], func=FUNC_NAME),
+        lambda: load_text(['arg_mnemonic_password', 'mismatch'], func=FUNC_NAME),
+        True,
+    ),
+    default='',
+    help=lambda: load_text(['arg_mnemonic_password', 'help'], func=FUNC_NAME),
+    hidden=True,
+    param_decls='--mnemonic-password',
+    prompt=False,
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda targets: validate_pubkeys_list(targets),
+        lambda: load_text(['arg_targets', 'prompt'], func=FUNC_NAME),
+    ),
+    help=lambda: load_text(['arg_targets', 'help'], func=FUNC_NAME),
+    param_decls='--targets',
+    prompt=lambda: load_text(['arg_targets', 'prompt'], func=FUNC_NAME),
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda num: validate_int_range(num, 0, 2**32),
+        lambda: load_text(['arg_validator_start_index', 'help'], func=FUNC_NAME),
+    ),
+    default=0,
+    help=lambda: load_text(['arg_validator_start_index', 'help'], func=FUNC_NAME),
+    param_decls='--validator_start_index',
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda num: validate_int_range(num, 1, 2**32),
+        lambda: load_text(['arg_num_indices', 'help'], func=FUNC_NAME),
+    ),
+    default=1,
+    help=lambda: load_text(['arg_num_indices', 'help'], func=FUNC_NAME),
+    param_decls='--num_indices',
+)
+@jit_option(
+    default=lambda: os.cpu_count() or 1,
+    help=lambda: load_text(['arg_num_workers', 'help'], func=FUNC_NAME),
+    param_decls='--num_workers',
+    type=click.IntRange(min=1),
+)
+@click.pass_context
+def recover_mnemonic(
+        ctx: click.Context,
+        mnemonic: str,
+        mnemonic_password: str,
+        targets: Sequence[bytes],
+        validator_start_index: int,
+        num_indices: int,
+        num_workers: int,
+        **kwargs: Any) -> None:
+    num_indices = min(num_indices, 2**32 - validator_start_index)
+    found = recover_mnemonic_from_pubkeys(
+        mnemonic=mnemonic,
+        password=mnemonic_password,
+        words_path=WORD_LISTS_PATH,
+        targets=targets,
+        start_index=validator_start_index,
+        num_indices=num_indices,
+        num_workers=num_workers,
+    )
+
+    click.echo()
+    if found is None:
+        click.echo(load_text(['msg_mnemonic_not_found']))
+    else:
+        recovered_mnemonic, index = found
+        click.echo(load_text(['msg_mnemonic_found']) % index)
+        click.echo('\n\n%s\n\n' % recovered_mnemonic)
+    click.pause(load_text(['msg_pause']))
@@ -0,0 +1,131 @@
+import click
+import os
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    IO,
+    Iterable,
+    List,
+    Sequence,
+)
+
+from staking_deposit.mnemonic_recovery import find_mnemonic_password
+from staking_deposit.utils.validation import (
+    validate_int_range,
+    validate_pubkeys_list,
+)
+from staking_deposit.utils.click import (
+    captive_prompt_callback,
+    jit_option,
+)
+from staking_deposit.utils.intl import load_text
+from .existing_mnemonic import validate_mnemonic
+
+
+FUNC_NAME = 'recover_mnemonic_password'
+
+_LEET_TABLE = str.maketrans({'a': '4', 'e': '3', 'i': '1', 'o': '0', 's': '5', 't': '7'})
+
+# Each mutation maps a candidate password to its variants (including the candidate itself)
+PASSWORD_MUTATIONS: Dict[str, Callable[[str], Iterable[str]]] = {
+    'case': lambda password: (password, password.lower(), password.upper(), password.capitalize(),
+                              password.swapcase()),
+    'whitespace': lambda password: (password, password.strip(), password + ' ', ' ' + password),
+    'digit': lambda password: (password, *(password + digit for digit in '0123456789')),
+    'symbol': lambda password: (password, *(password + symbol for symbol in '!@#$%&*?.')),
+    'leet': lambda password: (password, password.translate(_LEET_TABLE)),
+}
+
+
+def expand_password_candidates(passwords: Iterable[str], mutations: Sequence[str]) -> List[str]:
+    """
+    Apply the `mutations` (see `PASSWORD_MUTATIONS`), one after the other, to the candidate `passwords` and return
+    the distinct candidates in order.
+    """
+    candidates = dict.fromkeys(passwords)
+    for mutation in mutations:
+        candidates = dict.fromkeys(
+            variant for password in candidates for variant in PASSWORD_MUTATIONS[mutation](password))
+    return list(candidates)
+
+
+@click.command(
+    help=load_text(['arg_recover_mnemonic_password', 'help'], func=FUNC_NAME),
+)
+@jit_option(
+    callback=validate_mnemonic,
+    help=lambda: load_text(['arg_mnemonic', 'help'], func=FUNC_NAME),
+    param_decls='--mnemonic',
+    prompt=lambda: load_text(['arg_mnemonic', 'prompt'], func=FUNC_NAME),
+    type=str,
+)
+@jit_option(
+    help=lambda: load_text(['arg_passwords_file', 'help'], func=FUNC_NAME),
+    param_decls='--passwords_file',
+    required=True,
+    type=click.File('r', encoding='utf-8'),
+)
+@jit_option(
+    default=[],
+    help=lambda: load_text(['arg_mutation', 'help'], func=FUNC_NAME),
+    multiple=True,
+    param_decls='--mutation',
+    type=click.Choice(list(PASSWORD_MUTATIONS.keys())),
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda targets: validate_pubkeys_list(targets),
+        lambda: load_text(['arg_targets', 'prompt'], func=FUNC_NAME),
+    ),
+    help=lambda: load_text(['arg_targets', 'help'], func=FUNC_NAME),
+    param_decls='--targets',
+    prompt=lambda: load_text(['arg_targets', 'prompt'], func=FUNC_NAME),
+)
+@jit_option(
+    callback=captive_prompt_callback(
+        lambda num: validate_int_range(num, 0, 2**32),
+        lambda: load_text(['arg_validator_index', 'help'], func=FUNC_NAME),
+    ),
+    default=0,
+    help=lambda: load_text(['arg_validator_index', 'help'], func=FUNC_NAME),
+    param_decls='--validator_index',
+)
+@jit_option(
+    default=lambda: os.cpu_count() or 1,
+    help=lambda: load_text(['arg_num_workers', 'help'], func=FUNC_NAME),
+    param_decls='--num_workers',
+    type=click.IntRange(min=1),
+)
+@click.pass_context
+def recover_mnemonic_password(
+        ctx: click.Context,
+        mnemonic: str,
+        passwords_file: IO[str],
+        mutation: Sequence[str],
+        targets: Sequence[bytes],
+        validator_index: int,
+        num_workers: int,
+        **kwargs: Any) -> None:
+    # Only the line breaks are stripped: leading and trailing spaces may be part of a password
+    passwords = expand_password_candidates((line.rstrip('\r\n') for line in passwords_file), mutation)
+
+    start_time = time.perf_counter()
+    found, num_tried = find_mnemonic_password(
+        mnemonic=mnemonic,
+        passwords=passwords,
+        targets=targets,
+        index=validator_index,
+        num_workers=num_workers,
+    )
+    elapsed = time.perf_counter() - start_time
+
+    click.echo()
+    click.echo(load_text(['msg_throughput']) % (num_tried, elapsed, num_tried / elapsed if elapsed > 0 else 0))
+    if found is None:
+        click.echo(load_text(['msg_password_not_found']))
+    else:
+        click.echo(load_text(['msg_password_found']))
+        click.echo('\n\n%r\n\n' % found)
+    click.pause(load_text(['msg_pause']))
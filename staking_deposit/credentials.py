@@ -1,21 +1,28 @@
 import os
 import click
+from collections import deque
+from contextlib import closing
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from enum import Enum
 import time
 import json
-from typing import Dict, List, Optional, Any, Sequence
+from typing import (
+    AbstractSet, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type,
+)
 
-from eth_typing import Address, HexAddress
+from eth_typing import Address, BLSPubkey, BLSSignature, HexAddress
 from eth_utils import to_canonical_address
-from py_ecc.bls import G2ProofOfPossession as bls
 
 from staking_deposit.exceptions import ValidationError
-from staking_deposit.key_handling.key_derivation.path import mnemonic_and_path_to_key
+from staking_deposit.key_handling.key_derivation.mnemonic import reconstruct_mnemonic
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
 from staking_deposit.key_handling.keystore import (
     Keystore,
     ScryptKeystore,
 )
+from staking_deposit.key_handling.pubkey_index import PubkeyIndex
 from staking_deposit.settings import DEPOSIT_CLI_VERSION, BaseChainSetting
+from staking_deposit.utils import bls
 from staking_deposit.utils.constants import (
     BLS_WITHDRAWAL_PREFIX,
     ETH1_ADDRESS_WITHDRAWAL_PREFIX,
@@ -25,6 +32,13 @@ from staking_deposit.utils.constants import (
 )
 from staking_deposit.utils.crypto import SHA256
 from staking_deposit.utils.intl import load_text
+from staking_deposit.utils.parallel import (
+    CHUNKS_PER_WORKER,
+    MAX_STREAMING_CHUNK_SIZE,
+    iter_search_results,
+    search_stopped,
+    split_into_chunks,
+)
 from staking_deposit.utils.ssz import (
     compute_deposit_domain,
     compute_bls_to_execution_change_domain,
@@ -41,37 +55,123 @@ class WithdrawalType(Enum):
     ETH1_ADDRESS_WITHDRAWAL = 1
 
 
+def _withdrawal_key_path(index: int) -> str:
+    """
+    Return the EIP-2334 path of the withdrawal key of the validator at `index`; its signing key is its child `0`.
+    https://eips.ethereum.org/EIPS/eip-2334
+    """
+    purpose = '12381'
+    coin_type = '3600'
+    account = str(index)
+    return f'm/{purpose}/{coin_type}/{account}/0'
+
+
+def signing_key_path(index: int) -> str:
+    """
+    Return the EIP-2334 path of the signing key of the validator at `index`.
+    """
+    return f'{_withdrawal_key_path(index)}/0'
+
+
+# The names of the keys of a credential, see `Credential.derive_keys`
+SIGNING_KEY = 'signing'
+WITHDRAWAL_KEY = 'withdrawal'
+
+
 class Credential:
     """
     A Credential object contains all of the information for a single validator and the corresponding functionality.
     Once created, it is the only object that should be required to perform any processing for a validator.
     """
-    def __init__(self, *, mnemonic: str, mnemonic_password: str,
+    def __init__(self, *, derivation_context: DerivationContext,
                  index: int, amount: int, chain_setting: BaseChainSetting,
-                 hex_eth1_withdrawal_address: Optional[HexAddress]):
+                 hex_eth1_withdrawal_address: Optional[HexAddress],
+                 pubkey_index: Optional[PubkeyIndex]=None):
         # Set path as EIP-2334 format
-        # https://eips.ethereum.org/EIPS/eip-2334
-        purpose = '12381'
-        coin_type = '3600'
-        account = str(index)
-        withdrawal_key_path = f'm/{purpose}/{coin_type}/{account}/0'
-        self.signing_key_path = f'{withdrawal_key_path}/0'
-
-        self.withdrawal_sk = mnemonic_and_path_to_key(
-            mnemonic=mnemonic, path=withdrawal_key_path, password=mnemonic_password)
-        self.signing_sk = mnemonic_and_path_to_key(
-            mnemonic=mnemonic, path=self.signing_key_path, password=mnemonic_password)
+        self.withdrawal_key_path = _withdrawal_key_path(index)
+        self.signing_key_path = signing_key_path(index)
+
+        # The SKs are only derived when they are first needed
+        self._derivation_context: Optional[DerivationContext] = derivation_context
+        self._withdrawal_sk: Optional[int] = None
+        self._signing_sk: Optional[int] = None
+        # Everything derived from the keys is computed once, on first use, since each public key costs
+        # a G1 scalar multiplication
+        self._withdrawal_pk: Optional[bytes] = None
+        self._signing_pk: Optional[bytes] = None
+        self._withdrawal_credentials: Optional[bytes] = None
+        self._deposit_message: Optional[DepositMessage] = None
+        self._signed_deposit: Optional[DepositData] = None
+        self._deposit_datum_dict: Optional[Dict[str, bytes]] = None
+        # The public keys are looked up in (and recorded to) the optional on-disk index
+        self._pubkey_index = pubkey_index
         self.amount = amount
         self.chain_setting = chain_setting
         self.hex_eth1_withdrawal_address = hex_eth1_withdrawal_address
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # The derivation context and pubkey index are process-local and are never pickled along with the credential.
+        # The SSZ objects can't be pickled either: only the signature of the deposit is, to rebuild it
+        state = self.__dict__.copy()
+        state['_derivation_context'] = None
+        state['_pubkey_index'] = None
+        state['_deposit_message'] = None
+        if self._signed_deposit is not None:
+            state['_signed_deposit'] = bytes(self._signed_deposit.signature)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        signature = state.pop('_signed_deposit')
+        self.__dict__.update(state, _signed_deposit=None)
+        if signature is not None:
+            self._signed_deposit = self._deposit_data(signature)
+
+    def _derive_key(self, path: str) -> int:
+        if self._derivation_context is None:
+            raise ValueError(f"No derivation context is available to derive the key at {path}.")
+        return self._derivation_context.derive_key(path)
+
+    @property
+    def withdrawal_sk(self) -> int:
+        if self._withdrawal_sk is None:
+            self._withdrawal_sk = self._derive_key(self.withdrawal_key_path)
+        return self._withdrawal_sk
+
+    @property
+    def signing_sk(self) -> int:
+        if self._signing_sk is None:
+            self._signing_sk = self._derive_key(self.signing_key_path)
+        return self._signing_sk
+
+    def derive_keys(self, keys: Sequence[str]) -> None:
+        """
+        Derive the SKs named in `keys` now, eg. before the derivation context is wiped or left behind by a worker.
+        """
+        if SIGNING_KEY in keys and self._signing_sk is None:
+            self._signing_sk = self._derive_key(self.signing_key_path)
+        if WITHDRAWAL_KEY in keys and self._withdrawal_sk is None:
+            self._withdrawal_sk = self._derive_key(self.withdrawal_key_path)
+
+    def _public_key(self, path: str, get_sk: Callable[[], int]) -> bytes:
+        if self._pubkey_index is None:
+            return bls.SkToPk(get_sk())
+        pubkey = self._pubkey_index.get(path)
+        if pubkey is None:
+            pubkey = bls.SkToPk(get_sk())
+            self._pubkey_index.put(path, pubkey)
+        return pubkey
+
     @property
     def signing_pk(self) -> bytes:
-        return bls.SkToPk(self.signing_sk)
+        if self._signing_pk is None:
+            self._signing_pk = self._public_key(self.signing_key_path, lambda: self.signing_sk)
+        return self._signing_pk
 
     @property
     def withdrawal_pk(self) -> bytes:
-        return bls.SkToPk(self.withdrawal_sk)
+        if self._withdrawal_pk is None:
+            self._withdrawal_pk = self._public_key(self.withdrawal_key_path, lambda: self.withdrawal_sk)
+        return self._withdrawal_pk
 
     @property
     def eth1_withdrawal_address(self) -> Optional[Address]:
@@ -97,6 +197,11 @@ class Credential:
 
     @property
     def withdrawal_credentials(self) -> bytes:
+        if self._withdrawal_credentials is None:
+            self._withdrawal_credentials = self._compute_withdrawal_credentials()
+        return self._withdrawal_credentials
+
+    def _compute_withdrawal_credentials(self) -> bytes:
         if self.withdrawal_type == WithdrawalType.BLS_WITHDRAWAL:
             withdrawal_credentials = BLS_WITHDRAWAL_PREFIX
             withdrawal_credentials += SHA256(self.withdrawal_pk)[1:]
@@ -113,23 +218,35 @@ class Credential:
 
     @property
     def deposit_message(self) -> DepositMessage:
-        if not MIN_DEPOSIT_AMOUNT <= self.amount <= MAX_DEPOSIT_AMOUNT:
-            raise ValidationError(f"{self.amount / ETH2GWEI} ETH deposits are not within the bounds of this cli.")
-        return DepositMessage(
-            pubkey=self.signing_pk,
-            withdrawal_credentials=self.withdrawal_credentials,
-            amount=self.amount,
-        )
+        if self._deposit_message is None:
+            if not MIN_DEPOSIT_AMOUNT <= self.amount <= MAX_DEPOSIT_AMOUNT:
+                raise ValidationError(f"{self.amount / ETH2GWEI} ETH deposits are not within the bounds of this cli.")
+            self._deposit_message = DepositMessage(
+                pubkey=self.signing_pk,
+                withdrawal_credentials=self.withdrawal_credentials,
+                amount=self.amount,
+            )
+        return self._deposit_message
 
     @property
-    def signed_deposit(self) -> DepositData:
+    def deposit_signing_root(self) -> bytes:
         domain = compute_deposit_domain(fork_version=self.chain_setting.GENESIS_FORK_VERSION)
-        signing_root = compute_signing_root(self.deposit_message, domain)
-        signed_deposit = DepositData(
+        return compute_signing_root(self.deposit_message, domain)
+
+    @property
+    def signed_deposit(self) -> DepositData:
+        if self._signed_deposit is None:
+            self._signed_deposit = self._deposit_data(bls.Sign(self.signing_sk, self.deposit_signing_root))
+        return self._signed_deposit
+
+    def _deposit_data(self, signature: bytes) -> DepositData:
+        """
+        Return the deposit with the `signature` of `deposit_signing_root`, which may have been computed by a worker.
+        """
+        return DepositData(
             **self.deposit_message.as_dict(),
-            signature=bls.Sign(self.signing_sk, signing_root)
+            signature=signature,
         )
-        return signed_deposit
 
     @property
     def deposit_datum_dict(self) -> Dict[str, bytes]:
@@ -137,54 +254,74 @@ class Credential:
         Return a single deposit datum for 1 validator including all
         the information needed to verify and process the deposit.
         """
-        signed_deposit_datum = self.signed_deposit
-        datum_dict = signed_deposit_datum.as_dict()
-        datum_dict.update({'deposit_message_root': self.deposit_message.hash_tree_root})
-        datum_dict.update({'deposit_data_root': signed_deposit_datum.hash_tree_root})
-        datum_dict.update({'fork_version': self.chain_setting.GENESIS_FORK_VERSION})
-        datum_dict.update({'network_name': self.chain_setting.NETWORK_NAME})
-        datum_dict.update({'deposit_cli_version': DEPOSIT_CLI_VERSION})
-        return datum_dict
-
-    def signing_keystore(self, password: str) -> Keystore:
+        if self._deposit_datum_dict is None:
+            signed_deposit_datum = self.signed_deposit
+            datum_dict = signed_deposit_datum.as_dict()
+            datum_dict.update({'deposit_message_root': self.deposit_message.hash_tree_root})
+            datum_dict.update({'deposit_data_root': signed_deposit_datum.hash_tree_root})
+            datum_dict.update({'fork_version': self.chain_setting.GENESIS_FORK_VERSION})
+            datum_dict.update({'network_name': self.chain_setting.NETWORK_NAME})
+            datum_dict.update({'deposit_cli_version': DEPOSIT_CLI_VERSION})
+            self._deposit_datum_dict = datum_dict
+        # A copy, so that the cached datum can't be altered by the caller
+        return dict(self._deposit_datum_dict)
+
+    def signing_keystore(self, password: str, keystore_cls: Type[Keystore]=ScryptKeystore) -> Keystore:
         secret = self.signing_sk.to_bytes(32, 'big')
-        return ScryptKeystore.encrypt(secret=secret, password=password, path=self.signing_key_path)
-
-    def save_signing_keystore(self, password: str, folder: str) -> str:
-        keystore = self.signing_keystore(password)
-        filefolder = os.path.join(folder, 'keystore-%s-%i.json' % (keystore.path.replace('/', '_'), time.time()))
+        return keystore_cls.encrypt(secret=secret, password=password, path=self.signing_key_path,
+                                    pubkey=self.signing_pk)
+
+    def save_signing_keystore(self, password: str, folder: str, keystore_cls: Type[Keystore]=ScryptKeystore) -> str:
+        keystore = self.signing_keystore(password, keystore_cls)
+        # Keystores with an insecure KDF are marked as such in their file name
+        prefix = 'keystore-insecure' if keystore_cls.insecure_kdf else 'keystore'
+        filefolder = os.path.join(folder, '%s-%s-%i.json' % (prefix, keystore.path.replace('/', '_'), time.time()))
         keystore.save(filefolder)
         return filefolder
 
-    def verify_keystore(self, keystore_filefolder: str, password: str) -> bool:
-        saved_keystore = Keystore.from_file(keystore_filefolder)
+    def verify_keystore(self, keystore_filefolder: str, password: str,
+                        keystore_cls: Type[Keystore]=Keystore) -> bool:
+        saved_keystore = keystore_cls.from_file(keystore_filefolder)
         secret_bytes = saved_keystore.decrypt(password)
         return self.signing_sk == int.from_bytes(secret_bytes, 'big')
 
-    def get_bls_to_execution_change(self, validator_index: int) -> SignedBLSToExecutionChange:
+    def _get_bls_to_execution_change_message(self, validator_index: int) -> BLSToExecutionChange:
         if self.eth1_withdrawal_address is None:
             raise ValueError("The execution address should NOT be empty.")
 
-        message = BLSToExecutionChange(
+        return BLSToExecutionChange(
             validator_index=validator_index,
             from_bls_pubkey=self.withdrawal_pk,
             to_execution_address=self.eth1_withdrawal_address,
         )
+
+    def get_bls_to_execution_change_signing_root(self, validator_index: int) -> bytes:
+        message = self._get_bls_to_execution_change_message(validator_index)
         domain = compute_bls_to_execution_change_domain(
             fork_version=self.chain_setting.GENESIS_FORK_VERSION,
             genesis_validators_root=self.chain_setting.GENESIS_VALIDATORS_ROOT,
         )
-        signing_root = compute_signing_root(message, domain)
-        signature = bls.Sign(self.withdrawal_sk, signing_root)
+        return compute_signing_root(message, domain)
+
+    def get_bls_to_execution_change(self, validator_index: int,
+                                    signature: Optional[bytes]=None) -> SignedBLSToExecutionChange:
+        """
+        Return the signed BLSToExecutionChange of the validator at `validator_index`. The `signature` of its
+        signing root is computed here unless it is supplied (eg. by a signing worker).
+        """
+        message = self._get_bls_to_execution_change_message(validator_index)
+        if signature is None:
+            signature = bls.Sign(self.withdrawal_sk, self.get_bls_to_execution_change_signing_root(validator_index))
 
         return SignedBLSToExecutionChange(
             message=message,
             signature=signature,
         )
 
-    def get_bls_to_execution_change_dict(self, validator_index: int) -> Dict[str, bytes]:
+    def get_bls_to_execution_change_dict(self, validator_index: int,
+                                         signature: Optional[bytes]=None) -> Dict[str, bytes]:
         result_dict: Dict[str, Any] = {}
-        signed_bls_to_execution_change = self.get_bls_to_execution_change(validator_index)
+        signed_bls_to_execution_change = self.get_bls_to_execution_change(validator_index, signature)
         message = {
             'validator_index': str(signed_bls_to_execution_change.message.validator_index),
             'from_bls_pubkey': '0x' + signed_bls_to_execution_change.message.from_bls_pubkey.hex(),
@@ -204,6 +341,189 @@ class Credential:
         return result_dict
 
 
+_worker_derivation_context: Optional[DerivationContext] = None
+
+
+def init_credential_worker(master_SK: int) -> None:
+    """
+    Process-pool initializer: every worker derives its keys from the master SK of the parent's context.
+    """
+    global _worker_derivation_context
+    _worker_derivation_context = DerivationContext.from_master_SK(master_SK)
+
+
+def get_worker_derivation_context() -> DerivationContext:
+    """
+    Return the derivation context of a worker process started with `init_credential_worker`.
+    """
+    assert _worker_derivation_context is not None
+    return _worker_derivation_context
+
+
+def _deposit_keys(hex_eth1_withdrawal_address: Optional[HexAddress]) -> Tuple[str, ...]:
+    """
+    Return the keys a deposit needs: the withdrawal key is only needed for 0x00 credentials.
+    """
+    return (SIGNING_KEY,) if hex_eth1_withdrawal_address is not None else (SIGNING_KEY, WITHDRAWAL_KEY)
+
+
+def _check_keys(keys: Sequence[str]) -> None:
+    unknown_keys = set(keys) - {SIGNING_KEY, WITHDRAWAL_KEY}
+    if unknown_keys:
+        raise ValueError(f"Unknown keys {sorted(unknown_keys)}. Expected some of {[SIGNING_KEY, WITHDRAWAL_KEY]}.")
+
+
+def sign_and_verify_deposits(credentials: Sequence[Credential]) -> None:
+    """
+    Sign the deposits of `credentials` and batch verify their signatures right away, while the hashes of their
+    signing roots to G2 are still cached by this process: each message is only hashed once to be signed and verified.
+    """
+    signed_deposits = [credential.signed_deposit for credential in credentials]
+    invalid_signatures = bls.find_invalid_signatures(
+        [BLSPubkey(credential.signing_pk) for credential in credentials],
+        [credential.deposit_signing_root for credential in credentials],
+        [BLSSignature(signed_deposit.signature) for signed_deposit in signed_deposits],
+    )
+    if invalid_signatures:
+        pubkeys = ', '.join('0x' + credentials[position].signing_pk.hex() for position in invalid_signatures)
+        raise ValidationError(f"Invalid deposit signatures for the public keys {pubkeys}.")
+
+
+def _derive_credentials(*, indices: Sequence[int], amounts: Sequence[int], chain_setting: BaseChainSetting,
+                        hex_eth1_withdrawal_address: Optional[HexAddress], keys: Sequence[str],
+                        sign_deposits: bool=False) -> List[Credential]:
+    """
+    Process-pool task: create the credentials at `indices` and derive their `keys`, and also sign (and verify)
+    their deposits with `sign_deposits`.
+    """
+    credentials = [Credential(derivation_context=get_worker_derivation_context(),
+                              index=index, amount=amount, chain_setting=chain_setting,
+                              hex_eth1_withdrawal_address=hex_eth1_withdrawal_address)
+                   for index, amount in zip(indices, amounts)]
+    for credential in credentials:
+        credential.derive_keys(keys)
+    if sign_deposits:
+        sign_and_verify_deposits(credentials)
+    return credentials
+
+
+def iter_credentials(*,
+                     derivation_context: DerivationContext,
+                     num_keys: int,
+                     amounts: Sequence[int],
+                     chain_setting: BaseChainSetting,
+                     start_index: int,
+                     hex_eth1_withdrawal_address: Optional[HexAddress],
+                     num_workers: int=1,
+                     pubkey_index: Optional[PubkeyIndex]=None,
+                     sign_deposits: bool=False) -> Iterator[Credential]:
+    """
+    Yield the `num_keys` credentials starting at `start_index` one at a time, so that each of them can be processed
+    and dropped before the next one is created. Their keys are derived from `derivation_context` on first use.
+    With `num_workers > 1` the keys are derived ahead by a process pool, in small chunks of which only a bounded
+    number are in flight; the credentials are still yielded in order. With `sign_deposits`, the deposits are signed
+    and verified ahead as well, a chunk at a time (see `sign_and_verify_deposits`), by the workers or by this process.
+    """
+    if num_workers < 1:
+        raise ValueError(f"`num_workers` should be greater than or equal to 1. Got {num_workers}.")
+    if len(amounts) != num_keys:
+        raise ValueError(
+            f"The number of keys ({num_keys}) doesn't equal to the corresponding deposit amounts ({len(amounts)})."
+        )
+    key_indices = range(start_index, start_index + num_keys)
+    if num_workers == 1:
+        chunk_size = MAX_STREAMING_CHUNK_SIZE if sign_deposits else 1
+        for chunk_start in range(0, num_keys, chunk_size):
+            credentials = [
+                Credential(derivation_context=derivation_context, index=index, amount=amount,
+                           chain_setting=chain_setting, hex_eth1_withdrawal_address=hex_eth1_withdrawal_address,
+                           pubkey_index=pubkey_index)
+                for index, amount in zip(key_indices[chunk_start:chunk_start + chunk_size],
+                                         amounts[chunk_start:chunk_start + chunk_size])
+            ]
+            if sign_deposits:
+                sign_and_verify_deposits(credentials)
+            yield from credentials
+        return
+
+    num_chunks = max(num_workers * CHUNKS_PER_WORKER, -(-num_keys // MAX_STREAMING_CHUNK_SIZE))
+    index_chunks = split_into_chunks(key_indices, num_chunks)
+    amount_chunks = split_into_chunks(amounts, num_chunks)
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=init_credential_worker,
+                             initargs=(derivation_context.master_SK,)) as executor:
+        pending: Deque['Future[List[Credential]]'] = deque()
+        for indices, chunk_amounts in zip(index_chunks, amount_chunks):
+            pending.append(executor.submit(
+                _derive_credentials, indices=indices, amounts=chunk_amounts, chain_setting=chain_setting,
+                hex_eth1_withdrawal_address=hex_eth1_withdrawal_address,
+                keys=_deposit_keys(hex_eth1_withdrawal_address), sign_deposits=sign_deposits,
+            ))
+            # Keep every worker busy, but don't run further ahead of the consumer than that
+            while len(pending) > 2 * num_workers:
+                yield from _attach_credentials(pending.popleft().result(), derivation_context, pubkey_index)
+        while pending:
+            yield from _attach_credentials(pending.popleft().result(), derivation_context, pubkey_index)
+
+
+def _attach_credentials(credentials: List[Credential], derivation_context: DerivationContext,
+                        pubkey_index: Optional[PubkeyIndex]) -> List[Credential]:
+    """
+    Reattach the process-local derivation context and pubkey index to credentials received from a worker,
+    and record the public keys that the worker computed (eg. to sign the deposits) to the index.
+    """
+    for credential in credentials:
+        credential._derivation_context = derivation_context
+        credential._pubkey_index = pubkey_index
+    if pubkey_index is not None:
+        pubkeys = {}
+        for credential in credentials:
+            if credential._signing_pk is not None:
+                pubkeys[credential.signing_key_path] = credential._signing_pk
+            if credential._withdrawal_pk is not None:
+                pubkeys[credential.withdrawal_key_path] = credential._withdrawal_pk
+        pubkey_index.put_many(pubkeys)
+    return credentials
+
+
+def _sign_messages(items: Sequence[Tuple[int, bytes]]) -> List[bytes]:
+    """
+    Process-pool task: sign each signing root with its SK.
+    """
+    return [bls.Sign(sk, signing_root) for sk, signing_root in items]
+
+
+def _sign_in_pool(items: Sequence[Tuple[int, bytes]], num_workers: int, label: str) -> List[bytes]:
+    """
+    Return the signature of each `(sk, signing_root)` pair of `items`, in order, computed by a process pool.
+    Only these pairs are sent to the workers, which use the BLS backend of this process.
+    """
+    signatures: List[bytes] = []
+    with ProcessPoolExecutor(max_workers=num_workers) as executor, \
+            click.progressbar(length=len(items), label=label, show_percent=False, show_pos=True) as bar:
+        for chunk_signatures in executor.map(_sign_messages, split_into_chunks(items, num_workers * CHUNKS_PER_WORKER)):
+            signatures.extend(chunk_signatures)
+            bar.update(len(chunk_signatures))
+    return signatures
+
+
+def deposit_datum_to_json(deposit_datum: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode a deposit datum as it is written to the deposit-data JSON file, ie. with its bytes as hex strings.
+    """
+    return {key: value.hex() if isinstance(value, bytes) else value for key, value in deposit_datum.items()}
+
+
+def save_deposit_data_json(deposit_data: Sequence[Dict[str, Any]], folder: str, insecure: bool=False) -> str:
+    # The deposit data of keys in insecure (devnet) keystores is marked as such in its file name
+    prefix = 'deposit_data-insecure' if insecure else 'deposit_data'
+    filefolder = os.path.join(folder, '%s-%i.json' % (prefix, time.time()))
+    with open(filefolder, 'w') as f:
+        json.dump(deposit_data, f, default=lambda x: x.hex())
+    if os.name == 'posix':
+        os.chmod(filefolder, int('440', 8))  # Read for owner & group
+    return filefolder
+
+
 class CredentialList:
     """
     A collection of multiple Credentials, one for each validator.
@@ -220,34 +540,111 @@ class CredentialList:
                       amounts: List[int],
                       chain_setting: BaseChainSetting,
                       start_index: int,
-                      hex_eth1_withdrawal_address: Optional[HexAddress]) -> 'CredentialList':
+                      hex_eth1_withdrawal_address: Optional[HexAddress],
+                      derivation_context: Optional[DerivationContext]=None,
+                      num_workers: int=1,
+                      pubkey_index: Optional[PubkeyIndex]=None,
+                      keys: Optional[Sequence[str]]=None) -> 'CredentialList':
+        """
+        Create `num_keys` credentials starting at `start_index`. Their keys are derived from `derivation_context`
+        on first use, so the context must outlive the credentials. If no context is supplied, a temporary one is
+        created from `mnemonic` and the keys are derived eagerly before it is wiped.
+        With `num_workers > 1` the `keys` (by default the signing and, for 0x00 credentials, withdrawal keys that
+        a deposit needs) are derived upfront by a process pool; the resulting credentials are identical, and in the
+        same order, as those of the serial path.
+        The public keys are read from, and recorded to, `pubkey_index` when one is supplied.
+        """
+        if num_workers < 1:
+            raise ValueError(f"`num_workers` should be greater than or equal to 1. Got {num_workers}.")
+        if keys is None:
+            keys = _deposit_keys(hex_eth1_withdrawal_address)
+        _check_keys(keys)
         if len(amounts) != num_keys:
             raise ValueError(
                 f"The number of keys ({num_keys}) doesn't equal to the corresponding deposit amounts ({len(amounts)})."
             )
+        owns_context = derivation_context is None
+        if derivation_context is None:
+            derivation_context = DerivationContext(mnemonic=mnemonic, password=mnemonic_password)
         key_indices = range(start_index, start_index + num_keys)
-        with click.progressbar(key_indices, label=load_text(['msg_key_creation']),
-                               show_percent=False, show_pos=True) as indices:
-            return cls([Credential(mnemonic=mnemonic, mnemonic_password=mnemonic_password,
-                                   index=index, amount=amounts[index - start_index], chain_setting=chain_setting,
-                                   hex_eth1_withdrawal_address=hex_eth1_withdrawal_address)
-                        for index in indices])
+        try:
+            if num_workers > 1:
+                credentials = cls._derive_in_pool(
+                    master_SK=derivation_context.master_SK, key_indices=key_indices, amounts=amounts,
+                    chain_setting=chain_setting, hex_eth1_withdrawal_address=hex_eth1_withdrawal_address,
+                    keys=keys, num_workers=num_workers,
+                )
+                _attach_credentials(credentials, derivation_context, pubkey_index)
+            else:
+                with click.progressbar(key_indices, label=load_text(['msg_key_creation']),
+                                       show_percent=False, show_pos=True) as indices:
+                    credentials = [Credential(derivation_context=derivation_context,
+                                              index=index, amount=amounts[index - start_index],
+                                              chain_setting=chain_setting,
+                                              hex_eth1_withdrawal_address=hex_eth1_withdrawal_address,
+                                              pubkey_index=pubkey_index)
+                                   for index in indices]
+            if owns_context:
+                for credential in credentials:
+                    credential.derive_keys((SIGNING_KEY, WITHDRAWAL_KEY))
+            return cls(credentials)
+        finally:
+            if owns_context:
+                derivation_context.wipe()
+
+    @staticmethod
+    def _derive_in_pool(*,
+                        master_SK: int,
+                        key_indices: range,
+                        amounts: List[int],
+                        chain_setting: BaseChainSetting,
+                        hex_eth1_withdrawal_address: Optional[HexAddress],
+                        keys: Sequence[str],
+                        num_workers: int) -> List[Credential]:
+        index_chunks = split_into_chunks(key_indices, num_workers * CHUNKS_PER_WORKER)
+        amount_chunks = split_into_chunks(amounts, num_workers * CHUNKS_PER_WORKER)
+        results: List[List[Credential]] = [[] for _ in index_chunks]
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=init_credential_worker,
+                                 initargs=(master_SK,)) as executor:
+            futures = {
+                executor.submit(
+                    _derive_credentials, indices=indices, amounts=chunk_amounts, chain_setting=chain_setting,
+                    hex_eth1_withdrawal_address=hex_eth1_withdrawal_address, keys=keys,
+                ): chunk_number
+                for chunk_number, (indices, chunk_amounts) in enumerate(zip(index_chunks, amount_chunks))
+            }
+            with click.progressbar(length=len(key_indices), label=load_text(['msg_key_creation'], func='from_mnemonic'),
+                                   show_percent=False, show_pos=True) as bar:
+                for future in as_completed(futures):
+                    chunk_number = futures[future]
+                    results[chunk_number] = future.result()
+                    bar.update(len(results[chunk_number]))
+        return [credential for chunk in results for credential in chunk]
 
     def export_keystores(self, password: str, folder: str) -> List[str]:
         with click.progressbar(self.credentials, label=load_text(['msg_keystore_creation']),
                                show_percent=False, show_pos=True) as credentials:
             return [credential.save_signing_keystore(password=password, folder=folder) for credential in credentials]
 
-    def export_deposit_data_json(self, folder: str) -> str:
-        with click.progressbar(self.credentials, label=load_text(['msg_depositdata_creation']),
-                               show_percent=False, show_pos=True) as credentials:
-            deposit_data = [cred.deposit_datum_dict for cred in credentials]
-        filefolder = os.path.join(folder, 'deposit_data-%i.json' % time.time())
-        with open(filefolder, 'w') as f:
-            json.dump(deposit_data, f, default=lambda x: x.hex())
-        if os.name == 'posix':
-            os.chmod(filefolder, int('440', 8))  # Read for owner & group
-        return filefolder
+    def export_deposit_data_json(self, folder: str, num_workers: int=1) -> str:
+        """
+        Write the deposit data JSON file of the credentials. With `num_workers > 1` the deposits that aren't signed
+        yet are signed by a process pool; the file is identical to that of the serial path.
+        """
+        if num_workers < 1:
+            raise ValueError(f"`num_workers` should be greater than or equal to 1. Got {num_workers}.")
+        label = load_text(['msg_depositdata_creation'])
+        if num_workers > 1:
+            unsigned = [cred for cred in self.credentials if cred._signed_deposit is None]
+            signatures = _sign_in_pool([(cred.signing_sk, cred.deposit_signing_root) for cred in unsigned],
+                                       num_workers, label)
+            for cred, signature in zip(unsigned, signatures):
+                cred._signed_deposit = cred._deposit_data(signature)
+            deposit_data = [cred.deposit_datum_dict for cred in self.credentials]
+        else:
+            with click.progressbar(self.credentials, label=label, show_percent=False, show_pos=True) as credentials:
+                deposit_data = [cred.deposit_datum_dict for cred in credentials]
+        return save_deposit_data_json(deposit_data, folder)
 
     def verify_keystores(self, keystore_filefolders: List[str], password: str) -> bool:
         with click.progressbar(zip(self.credentials, keystore_filefolders),
@@ -256,11 +653,27 @@ class CredentialList:
             return all(credential.verify_keystore(keystore_filefolder=filefolder, password=password)
                        for credential, filefolder in items)
 
-    def export_bls_to_execution_change_json(self, folder: str, validator_indices: Sequence[int]) -> str:
-        with click.progressbar(self.credentials, label=load_text(['msg_bls_to_execution_change_creation']),
-                               show_percent=False, show_pos=True) as credentials:
-            bls_to_execution_changes = [cred.get_bls_to_execution_change_dict(validator_indices[i])
-                                        for i, cred in enumerate(credentials)]
+    def export_bls_to_execution_change_json(self, folder: str, validator_indices: Sequence[int],
+                                            num_workers: int=1) -> str:
+        """
+        Write the BLSToExecutionChange JSON file of the credentials. With `num_workers > 1` the changes are signed
+        by a process pool; the file is identical to that of the serial path.
+        """
+        if num_workers < 1:
+            raise ValueError(f"`num_workers` should be greater than or equal to 1. Got {num_workers}.")
+        label = load_text(['msg_bls_to_execution_change_creation'])
+        if num_workers > 1:
+            signatures = _sign_in_pool(
+                [(cred.withdrawal_sk, cred.get_bls_to_execution_change_signing_root(validator_indices[i]))
+                 for i, cred in enumerate(self.credentials)],
+                num_workers, label,
+            )
+            bls_to_execution_changes = [cred.get_bls_to_execution_change_dict(validator_indices[i], signatures[i])
+                                        for i, cred in enumerate(self.credentials)]
+        else:
+            with click.progressbar(self.credentials, label=label, show_percent=False, show_pos=True) as credentials:
+                bls_to_execution_changes = [cred.get_bls_to_execution_change_dict(validator_indices[i])
+                                            for i, cred in enumerate(credentials)]
 
         filefolder = os.path.join(folder, 'bls_to_execution_change-%i.json' % time.time())
         with open(filefolder, 'w') as f:
@@ -268,3 +681,210 @@ class CredentialList:
         if os.name == 'posix':
             os.chmod(filefolder, int('440', 8))  # Read for owner & group
         return filefolder
+
+
+def _match_key_index(*, signing_pk: Optional[bytes], withdrawal_pk: Optional[bytes],
+                     pubkeys: AbstractSet[bytes], withdrawal_credentials: AbstractSet[bytes]) -> List[bytes]:
+    """
+    Return the targets among the signing pubkey and the 0x00 withdrawal credentials of a validator.
+    """
+    matches = []
+    if withdrawal_pk is not None and withdrawal_credentials:
+        credentials = BLS_WITHDRAWAL_PREFIX + SHA256(withdrawal_pk)[1:]
+        if credentials in withdrawal_credentials:
+            matches.append(credentials)
+    if signing_pk is not None and signing_pk in pubkeys:
+        matches.append(signing_pk)
+    return matches
+
+
+def _scan_key_indices(*, derivation_context: DerivationContext, indices: Iterable[int],
+                      pubkeys: AbstractSet[bytes], withdrawal_credentials: AbstractSet[bytes],
+                      record_pubkeys: bool=False,
+                      is_stopped: Callable[[], bool]=lambda: False) -> Tuple[Dict[bytes, int], Dict[str, bytes]]:
+    """
+    Derive the public keys at `indices` until every target is found. Only the keys that could match a target are
+    derived, unless `record_pubkeys` is set: then both public keys of every scanned index are derived and returned
+    as a `{path: pubkey}` dict along with the found targets.
+    """
+    found: Dict[bytes, int] = {}
+    derived_pubkeys: Dict[str, bytes] = {}
+    num_targets = len(pubkeys) + len(withdrawal_credentials)
+    for index in indices:
+        if is_stopped():
+            break
+        withdrawal_key_path = _withdrawal_key_path(index)
+        signing_key_path = f'{withdrawal_key_path}/0'
+        withdrawal_pk = signing_pk = None
+        if withdrawal_credentials or record_pubkeys:
+            withdrawal_pk = bls.SkToPk(derivation_context.derive_key(withdrawal_key_path))
+        if pubkeys or record_pubkeys:
+            signing_pk = bls.SkToPk(derivation_context.derive_key(signing_key_path))
+        if record_pubkeys:
+            assert withdrawal_pk is not None and signing_pk is not None
+            derived_pubkeys.update({withdrawal_key_path: withdrawal_pk, signing_key_path: signing_pk})
+        for match in _match_key_index(signing_pk=signing_pk, withdrawal_pk=withdrawal_pk,
+                                      pubkeys=pubkeys, withdrawal_credentials=withdrawal_credentials):
+            found.setdefault(match, index)
+        if len(found) == num_targets:
+            break
+    return found, derived_pubkeys
+
+
+def _find_key_indices(*, indices: Sequence[int], pubkeys: AbstractSet[bytes],
+                      withdrawal_credentials: AbstractSet[bytes],
+                      record_pubkeys: bool) -> Tuple[Dict[bytes, int], Dict[str, bytes]]:
+    return _scan_key_indices(derivation_context=get_worker_derivation_context(), indices=indices, pubkeys=pubkeys,
+                             withdrawal_credentials=withdrawal_credentials, record_pubkeys=record_pubkeys,
+                             is_stopped=search_stopped)
+
+
+def find_key_indices(*,
+                     derivation_context: DerivationContext,
+                     targets: Iterable[bytes],
+                     start_index: int,
+                     num_indices: int,
+                     num_workers: int=1,
+                     pubkey_index: Optional[PubkeyIndex]=None) -> Dict[bytes, int]:
+    """
+    Search the `num_indices` validator indices from `start_index` for the `targets`, which are signing pubkeys
+    (48 bytes) and/or 0x00 withdrawal credentials (32 bytes), and return the index of every target that was found.
+    The search stops as soon as all the targets are found. With `num_workers > 1` the index range is split into
+    chunks that are scanned by a process pool.
+    The indices whose public keys are in `pubkey_index` are matched without any derivation, and the public keys
+    derived for the other indices are recorded to it.
+    """
+    if num_workers < 1:
+        raise ValueError(f"`num_workers` should be greater than or equal to 1. Got {num_workers}.")
+    target_set = set(targets)
+    pubkeys = frozenset(target for target in target_set if len(target) == 48)
+    withdrawal_credentials = frozenset(target for target in target_set if len(target) == 32)
+    if len(pubkeys) + len(withdrawal_credentials) != len(target_set):
+        raise ValueError("The targets should be 48-byte pubkeys or 32-byte withdrawal credentials.")
+    key_indices: Sequence[int] = range(start_index, start_index + num_indices)
+
+    found: Dict[bytes, int] = {}
+    record_pubkeys = pubkey_index is not None
+    if pubkey_index is not None:
+        known_pubkeys = pubkey_index.pubkeys()
+        unknown_indices = []
+        for index in key_indices:
+            withdrawal_key_path = _withdrawal_key_path(index)
+            withdrawal_pk = known_pubkeys.get(withdrawal_key_path)
+            signing_pk = known_pubkeys.get(f'{withdrawal_key_path}/0')
+            if withdrawal_pk is None or signing_pk is None:
+                unknown_indices.append(index)
+                continue
+            for match in _match_key_index(signing_pk=signing_pk, withdrawal_pk=withdrawal_pk,
+                                          pubkeys=pubkeys, withdrawal_credentials=withdrawal_credentials):
+                found.setdefault(match, index)
+        if len(found) == len(target_set):
+            return found
+        key_indices = unknown_indices
+
+    if num_workers == 1:
+        with click.progressbar(key_indices, label=load_text(['msg_key_search']),
+                               show_percent=False, show_pos=True) as indices:
+            scan_found, derived_pubkeys = _scan_key_indices(
+                derivation_context=derivation_context, indices=indices, pubkeys=pubkeys,
+                withdrawal_credentials=withdrawal_credentials, record_pubkeys=record_pubkeys,
+            )
+        for target, index in scan_found.items():
+            found.setdefault(target, index)
+        if pubkey_index is not None:
+            pubkey_index.put_many(derived_pubkeys)
+        return found
+
+    chunks = split_into_chunks(key_indices, num_workers * CHUNKS_PER_WORKER)
+    tasks = [dict(indices=indices, pubkeys=pubkeys, withdrawal_credentials=withdrawal_credentials,
+                  record_pubkeys=record_pubkeys) for indices in chunks]
+    results = iter_search_results(_find_key_indices, tasks, num_workers=num_workers,
+                                  initializer=init_credential_worker, initargs=(derivation_context.master_SK,))
+    with click.progressbar(length=len(key_indices), label=load_text(['msg_key_search']),
+                           show_percent=False, show_pos=True) as bar, closing(results):
+        for chunk_number, (scan_found, derived_pubkeys) in results:
+            for target, index in scan_found.items():
+                found[target] = min(index, found.get(target, index))
+            if pubkey_index is not None:
+                pubkey_index.put_many(derived_pubkeys)
+            bar.update(len(chunks[chunk_number]))
+            if len(found) == len(target_set):
+                break
+    return found
+
+
+def _derive_signing_pubkeys(derivation_context: DerivationContext, indices: Sequence[int]) -> List[bytes]:
+    with derivation_context:
+        return [bls.SkToPk(derivation_context.derive_key(signing_key_path(index))) for index in indices]
+
+
+def _derive_mnemonic_signing_pubkeys(*, mnemonic: str, password: str, indices: Sequence[int]) -> List[bytes]:
+    return _derive_signing_pubkeys(DerivationContext(mnemonic=mnemonic, password=password), indices)
+
+
+def _derive_master_SK_signing_pubkeys(*, master_SK: int, indices: Sequence[int]) -> List[bytes]:
+    return _derive_signing_pubkeys(DerivationContext.from_master_SK(master_SK), indices)
+
+
+def _collect_signing_pubkeys(futures: Optional[List['Future[List[bytes]]']]) -> Optional[List[bytes]]:
+    if futures is None:
+        return None
+    return [pubkey for future in futures for pubkey in future.result()]
+
+
+def iter_mnemonic_signing_pubkeys(*,
+                                  mnemonics: Iterable[str],
+                                  password: str,
+                                  words_path: str,
+                                  start_index: int,
+                                  num_keys: int,
+                                  num_workers: int=1) -> Iterator[Optional[List[bytes]]]:
+    """
+    For each of the (possibly abbreviated) `mnemonics`, in order, yield the signing pubkeys of its `num_keys`
+    validators from `start_index`, or `None` if it isn't a valid mnemonic (unknown words or a wrong checksum).
+    With `num_workers > 1` the seeds and keys of several mnemonics are derived at once by a process pool, the
+    indices of each mnemonic being split into chunks; only a bounded number of chunks are in flight. The seed of a
+    mnemonic is only derived once: by its worker if it has a single chunk, or else upfront, and its master SK is
+    then handed to the chunks.
+    """
+    if num_workers < 1:
+        raise ValueError(f"`num_workers` should be greater than or equal to 1. Got {num_workers}.")
+    key_indices = range(start_index, start_index + num_keys)
+    if num_workers == 1:
+        for mnemonic in mnemonics:
+            full_mnemonic = reconstruct_mnemonic(mnemonic, words_path)
+            if full_mnemonic is None:
+                yield None
+            else:
+                yield _derive_mnemonic_signing_pubkeys(mnemonic=full_mnemonic, password=password, indices=key_indices)
+        return
+
+    index_chunks = split_into_chunks(key_indices, -(-num_keys // MAX_STREAMING_CHUNK_SIZE))
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        pending: Deque[Optional[List['Future[List[bytes]]']]] = deque()
+        num_pending_chunks = 0
+        for mnemonic in mnemonics:
+            # The checksum is cheap to check, only the seed and key derivations are handed to the pool
+            full_mnemonic = reconstruct_mnemonic(mnemonic, words_path)
+            if full_mnemonic is None:
+                pending.append(None)
+            elif len(index_chunks) == 1:
+                pending.append([executor.submit(
+                    _derive_mnemonic_signing_pubkeys, mnemonic=full_mnemonic, password=password, indices=key_indices,
+                )])
+                num_pending_chunks += 1
+            else:
+                with DerivationContext(mnemonic=full_mnemonic, password=password) as derivation_context:
+                    master_SK = derivation_context.master_SK
+                pending.append([
+                    executor.submit(_derive_master_SK_signing_pubkeys, master_SK=master_SK, indices=indices)
+                    for indices in index_chunks
+                ])
+                num_pending_chunks += len(index_chunks)
+            # Keep every worker busy, but don't run further ahead of the consumer than that
+            while pending and (pending[0] is None or num_pending_chunks > 2 * num_workers):
+                futures = pending.popleft()
+                num_pending_chunks -= 0 if futures is None else len(futures)
+                yield _collect_signing_pubkeys(futures)
+        while pending:
+            yield _collect_signing_pubkeys(pending.popleft())
@@ -1,9 +1,15 @@
 import click
+import multiprocessing
 import sys
 
+from staking_deposit.cli.audit_mnemonics import audit_mnemonics
 from staking_deposit.cli.existing_mnemonic import existing_mnemonic
+from staking_deposit.cli.find_index import find_index
 from staking_deposit.cli.generate_bls_to_execution_change import generate_bls_to_execution_change
+from staking_deposit.cli.generate_devnet_keys import generate_devnet_keys
 from staking_deposit.cli.new_mnemonic import new_mnemonic
+from staking_deposit.cli.recover_mnemonic import recover_mnemonic
+from staking_deposit.cli.recover_mnemonic_password import recover_mnemonic_password
 from staking_deposit.utils.click import (
     captive_prompt_callback,
     choice_prompt_func,
@@ -55,9 +61,15 @@ def cli(ctx: click.Context, language: str, non_interactive: bool) -> None:
 cli.add_command(existing_mnemonic)
 cli.add_command(new_mnemonic)
 cli.add_command(generate_bls_to_execution_change)
+cli.add_command(find_index)
+cli.add_command(audit_mnemonics)
+cli.add_command(recover_mnemonic)
+cli.add_command(recover_mnemonic_password)
+cli.add_command(generate_devnet_keys)
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # Required for process pools in PyInstaller binaries
     check_python_version()
     print('\n***Using the tool on an offline and secure device is highly recommended to keep your mnemonic safe.***\n')
     cli()
@@ -0,0 +1,107 @@
+import os
+import click
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from eth_typing import HexAddress
+
+from staking_deposit.credentials import (
+    Credential,
+    deposit_datum_to_json,
+    get_worker_derivation_context,
+    init_credential_worker,
+    sign_and_verify_deposits,
+)
+from staking_deposit.exceptions import ValidationError
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+from staking_deposit.key_handling.keystore import InsecurePbkdf2Keystore
+from staking_deposit.settings import (
+    BaseChainSetting,
+    is_public_chain_setting,
+)
+from staking_deposit.utils.constants import MAX_DEPOSIT_AMOUNT
+from staking_deposit.utils.intl import load_text
+from staking_deposit.utils.parallel import (
+    CHUNKS_PER_WORKER,
+    MAX_STREAMING_CHUNK_SIZE,
+    split_into_chunks,
+)
+from staking_deposit.utils.validation import validate_deposit
+
+# Each entry is the file name of a keystore and the (JSON encoded) deposit datum of its key
+DevnetKey = Tuple[str, Dict[str, Any]]
+
+
+def _generate_devnet_key(credential: Credential, *, password: str, folder: str) -> DevnetKey:
+    """
+    Write the insecure keystore of the (signed) credential and return it along with its deposit datum, once both
+    have been verified.
+    """
+    keystore_filefolder = credential.save_signing_keystore(
+        password=password, folder=folder, keystore_cls=InsecurePbkdf2Keystore)
+    if not credential.verify_keystore(keystore_filefolder=keystore_filefolder, password=password,
+                                      keystore_cls=InsecurePbkdf2Keystore):
+        raise ValidationError(load_text(['err_verify_keystores']))
+    deposit_datum = deposit_datum_to_json(credential.deposit_datum_dict)
+    if not validate_deposit(deposit_datum, credential, verify_signature=False):
+        raise ValidationError(load_text(['err_verify_deposit']))
+    return os.path.basename(keystore_filefolder), deposit_datum
+
+
+def _generate_devnet_keys(indices: Sequence[int], *, chain_setting: BaseChainSetting,
+                          hex_eth1_withdrawal_address: Optional[HexAddress], password: str, folder: str,
+                          derivation_context: Optional[DerivationContext]=None) -> List[DevnetKey]:
+    """
+    Generate the devnet keys at `indices`, whose deposit signatures are verified in a batch right after they are
+    signed. The keys are derived from `derivation_context`, or from that of the worker process by default.
+    """
+    if derivation_context is None:
+        derivation_context = get_worker_derivation_context()
+    credentials = [Credential(derivation_context=derivation_context, index=index, amount=MAX_DEPOSIT_AMOUNT,
+                              chain_setting=chain_setting, hex_eth1_withdrawal_address=hex_eth1_withdrawal_address)
+                   for index in indices]
+    sign_and_verify_deposits(credentials)
+    return [_generate_devnet_key(credential, password=password, folder=folder) for credential in credentials]
+
+
+def generate_devnet_keys(*,
+                         derivation_context: DerivationContext,
+                         num_keys: int,
+                         chain_setting: BaseChainSetting,
+                         start_index: int,
+                         hex_eth1_withdrawal_address: Optional[HexAddress],
+                         password: str,
+                         folder: str,
+                         num_workers: int=1) -> Iterator[DevnetKey]:
+    """
+    Write the insecure keystores of the `num_keys` keys starting at `start_index` to `folder` and yield them, in
+    order, along with their deposit data (for the genesis of a devnet). The keystores are encrypted with the cheap
+    `InsecurePbkdf2Keystore` KDF, so this is refused for the public chains.
+    With `num_workers > 1` the keys are derived, signed and written by a process pool.
+    """
+    if is_public_chain_setting(chain_setting):
+        raise ValidationError(load_text(['err_public_chain']) % chain_setting.NETWORK_NAME)
+    if num_workers < 1:
+        raise ValueError(f"`num_workers` should be greater than or equal to 1. Got {num_workers}.")
+    key_indices = range(start_index, start_index + num_keys)
+    kwargs: Dict[str, Any] = dict(chain_setting=chain_setting, hex_eth1_withdrawal_address=hex_eth1_withdrawal_address,
+                                  password=password, folder=folder)
+    with click.progressbar(length=num_keys, label=load_text(['msg_devnet_key_creation']),
+                           show_percent=False, show_pos=True) as bar:
+        if num_workers == 1:
+            for chunk_start in range(0, num_keys, MAX_STREAMING_CHUNK_SIZE):
+                devnet_keys = _generate_devnet_keys(key_indices[chunk_start:chunk_start + MAX_STREAMING_CHUNK_SIZE],
+                                                    derivation_context=derivation_context, **kwargs)
+                yield from devnet_keys
+                bar.update(len(devnet_keys))
+            return
+
+        num_chunks = max(num_workers * CHUNKS_PER_WORKER, -(-num_keys // MAX_STREAMING_CHUNK_SIZE))
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=init_credential_worker,
+                                 initargs=(derivation_context.master_SK,)) as executor:
+            # Only (public) file names and deposit data come back from the workers, so they can all be submitted
+            chunks = split_into_chunks(key_indices, num_chunks)
+            for devnet_keys in executor.map(partial(_generate_devnet_keys, **kwargs), chunks):
+                yield from devnet_keys
+                bar.update(len(devnet_keys))
@@ -0,0 +1,51 @@
+"""
+Pack the BIP39 word-lists into a Python module, so that binaries built with PyInstaller load them from their
+(compiled) archive instead of reading every list from the `_MEIPASS` folder at runtime.
+
+Usage: python -m staking_deposit.key_handling.key_derivation.bundle_word_lists
+"""
+import os
+from typing import (
+    Mapping,
+    Sequence,
+)
+
+WORD_LISTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'word_lists')
+BUNDLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_word_lists_bundle.py')
+
+
+def read_word_lists(words_dir: str=WORD_LISTS_DIR) -> Mapping[str, Sequence[str]]:
+    """
+    Return the BIP39 words of every `<language>.txt` word-list in `words_dir`, keyed by language.
+    """
+    word_lists = {}
+    for file_name in sorted(os.listdir(words_dir)):
+        language, extension = os.path.splitext(file_name)
+        if extension == '.txt':
+            with open(os.path.join(words_dir, file_name), encoding='utf-8') as f:
+                word_lists[language] = [word.replace('\n', '') for word in f.readlines()]
+    return word_lists
+
+
+def render_word_lists_bundle(word_lists: Mapping[str, Sequence[str]]) -> str:
+    lines = [
+        '# Generated by staking_deposit/key_handling/key_derivation/bundle_word_lists.py, do not edit.',
+        'from typing import Dict, Tuple',
+        '',
+        'WORD_LISTS: Dict[str, Tuple[str, ...]] = {',
+    ]
+    for language, words in word_lists.items():
+        lines.append(f'    {language!r}: (')
+        lines.extend(f'        {word!r},' for word in words)
+        lines.append('    ),')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_word_lists_bundle(words_dir: str=WORD_LISTS_DIR, bundle_file: str=BUNDLE_FILE) -> None:
+    with open(bundle_file, 'w', encoding='utf-8') as f:
+        f.write(render_word_lists_bundle(read_word_lists(words_dir)))
+
+
+if __name__ == '__main__':
+    write_word_lists_bundle()
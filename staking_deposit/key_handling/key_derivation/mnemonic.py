@@ -1,14 +1,23 @@
+from functools import lru_cache
+from itertools import product
 import os
 from unicodedata import normalize
 from secrets import randbits
 from typing import (
+    Dict,
+    FrozenSet,
+    Iterator,
     List,
+    Mapping,
+    NamedTuple,
     Optional,
     Sequence,
+    Set,
 )
 
 from staking_deposit.utils.constants import (
     MNEMONIC_LANG_OPTIONS,
+    WORD_LISTS_PATH,
 )
 from staking_deposit.utils.crypto import (
     SHA256,
@@ -18,16 +27,26 @@ from staking_deposit.utils.file_handling import (
     resource_path,
 )
 
+try:
+    # Only generated when building the binaries, see bundle_word_lists.py
+    from staking_deposit.key_handling.key_derivation._word_lists_bundle import WORD_LISTS as _BUNDLED_WORD_LISTS
+except ImportError:
+    _BUNDLED_WORD_LISTS = {}
 
+
+@lru_cache(maxsize=None)
 def _get_word_list(language: str, path: str) -> Sequence[str]:
     """
     Given the language and path to the wordlist, return the list of BIP39 words.
+    Each word-list is only loaded once, on first use, and from the bundled word-lists if they are available.
 
     Ref: https://github.com/bitcoin/bips/blob/master/bip-0039/bip-0039-wordlists.md
     """
+    if path == WORD_LISTS_PATH and language in _BUNDLED_WORD_LISTS:
+        return _BUNDLED_WORD_LISTS[language]
     path = resource_path(path)
-    dirty_list = open(os.path.join(path, '%s.txt' % language), encoding='utf-8').readlines()
-    return [word.replace('\n', '') for word in dirty_list]
+    with open(os.path.join(path, '%s.txt' % language), encoding='utf-8') as f:
+        return tuple(word.replace('\n', '') for word in f.readlines())
 
 
 def _index_to_word(word_list: Sequence[str], index: int) -> str:
@@ -39,13 +58,48 @@ def _index_to_word(word_list: Sequence[str], index: int) -> str:
     return word_list[index]
 
 
-def _word_to_index(word_list: Sequence[str], word: str) -> int:
+def _word_to_index(word_indices: Mapping[str, int], word: str) -> int:
     try:
-        return word_list.index(word)
-    except ValueError:
+        return word_indices[word]
+    except KeyError:
         raise ValueError('Word %s not in BIP39 word-list' % word)
 
 
+class _WordListIndex(NamedTuple):
+    words: Sequence[str]
+    word_indices: Mapping[str, int]
+    abbreviation_indices: Mapping[str, int]
+
+
+@lru_cache(maxsize=None)
+def _get_word_list_index(language: str, path: str) -> _WordListIndex:
+    """
+    Return the BIP39 words of `language` along with the index of each word, keyed by the word itself
+    and by its 4-letter abbreviation.
+    """
+    words = _get_word_list(language, path)
+    return _WordListIndex(
+        words=words,
+        word_indices={word: index for index, word in enumerate(words)},
+        abbreviation_indices={abbrev: index for index, abbrev in enumerate(abbreviate_words(words))},
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_abbreviation_languages(path: str) -> Mapping[str, FrozenSet[str]]:
+    """
+    Return the languages whose word-list has a word with the given 4-letter abbreviation, for every abbreviation.
+    """
+    # A word that is in several word-lists is attributed to the last of them only, so that mnemonics
+    # made of such words (e.g. in both Chinese word-lists) still reconstruct in a single language
+    word_languages = {word: language for language in MNEMONIC_LANG_OPTIONS.keys()
+                      for word in _get_word_list_index(language, path).words}
+    abbreviation_languages: Dict[str, Set[str]] = {}
+    for word, language in word_languages.items():
+        abbreviation_languages.setdefault(normalize('NFKC', word)[:4], set()).add(language)
+    return {abbrev: frozenset(languages) for abbrev, languages in abbreviation_languages.items()}
+
+
 def _uint11_array_to_uint(uint11_array: Sequence[int]) -> int:
     return sum(x << i * 11 for i, x in enumerate(reversed(uint11_array)))
 
@@ -66,15 +120,12 @@ def determine_mnemonic_language(mnemonic: str, words_path: str) -> Sequence[str]
     Given a `mnemonic` determine what language[s] it is written in.
     There are collisions between word-lists, so multiple candidate languages are returned.
     """
-    languages = MNEMONIC_LANG_OPTIONS.keys()
-    word_language_map = {word: lang for lang in languages for word in _get_word_list(lang, words_path)}
-    try:
-        mnemonic_list = [normalize('NFKC', word)[:4] for word in mnemonic.lower().split(' ')]
-        word_languages = [[lang for word, lang in word_language_map.items() if normalize('NFKC', word)[:4] == abbrev]
-                          for abbrev in mnemonic_list]
-        return list(set(sum(word_languages, [])))
-    except KeyError:
-        raise ValueError('Word not found in mnemonic word lists for any language.')
+    abbreviation_languages = _get_abbreviation_languages(words_path)
+    mnemonic_list = abbreviate_words(mnemonic.lower().split(' '))
+    languages: Set[str] = set()
+    for abbrev in mnemonic_list:
+        languages |= abbreviation_languages.get(abbrev, frozenset())
+    return list(languages)
 
 
 def _validate_entropy_length(entropy: bytes) -> None:
@@ -99,6 +150,18 @@ def abbreviate_words(words: Sequence[str]) -> List[str]:
     return [normalize('NFKC', word)[:4] for word in words]
 
 
+def _is_valid_checksum(word_indices: Sequence[int]) -> bool:
+    """
+    Check the checksum carried by the last word of a mnemonic, given the indices of its words.
+    """
+    mnemonic_int = _uint11_array_to_uint(word_indices)
+    checksum_length = len(word_indices) // 3
+    checksum = mnemonic_int & 2**checksum_length - 1
+    entropy = (mnemonic_int - checksum) >> checksum_length
+    entropy_bits = entropy.to_bytes(checksum_length * 4, 'big')
+    return _get_checksum(entropy_bits) == checksum
+
+
 def reconstruct_mnemonic(mnemonic: str, words_path: str) -> Optional[str]:
     """
     Given a mnemonic, a reconstructed the full version (incase the abbreviated words were used)
@@ -108,27 +171,23 @@ def reconstruct_mnemonic(mnemonic: str, words_path: str) -> Optional[str]:
         languages = determine_mnemonic_language(mnemonic, words_path)
     except ValueError:
         return None
+    abbrev_mnemonic_list = abbreviate_words(mnemonic.lower().split(' '))
+    if len(abbrev_mnemonic_list) not in range(12, 25, 3):
+        return None
     reconstructed_mnemonic = None
     for language in languages:
         try:
-            abbrev_word_list = abbreviate_words(_get_word_list(language, words_path))
-            abbrev_mnemonic_list = abbreviate_words(mnemonic.lower().split(' '))
-            if len(abbrev_mnemonic_list) not in range(12, 25, 3):
-                return None
-            word_indices = [_word_to_index(abbrev_word_list, word) for word in abbrev_mnemonic_list]
-            mnemonic_int = _uint11_array_to_uint(word_indices)
-            checksum_length = len(abbrev_mnemonic_list) // 3
-            checksum = mnemonic_int & 2**checksum_length - 1
-            entropy = (mnemonic_int - checksum) >> checksum_length
-            entropy_bits = entropy.to_bytes(checksum_length * 4, 'big')
-            full_word_list = _get_word_list(language, words_path)
-            if _get_checksum(entropy_bits) == checksum:
+            word_list_index = _get_word_list_index(language, words_path)
+            word_indices = [_word_to_index(word_list_index.abbreviation_indices, word)
+                            for word in abbrev_mnemonic_list]
+            if _is_valid_checksum(word_indices):
                 """
                 This check guarantees that only one language has a valid mnemonic.
                 It is needed to ensure abbrivated words aren't valid in multiple languages
                 """
                 assert reconstructed_mnemonic is None
-                reconstructed_mnemonic = ' '.join([_index_to_word(full_word_list, index) for index in word_indices])
+                reconstructed_mnemonic = ' '.join(
+                    [_index_to_word(word_list_index.words, index) for index in word_indices])
             else:
                 pass
         except ValueError:
@@ -136,6 +195,80 @@ def reconstruct_mnemonic(mnemonic: str, words_path: str) -> Optional[str]:
     return reconstructed_mnemonic
 
 
+UNKNOWN_WORD = '?'
+MAX_WORD_EDIT_DISTANCE = 2
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """
+    Return the Levenshtein distance between `a` and `b`.
+    """
+    previous_row = list(range(len(b) + 1))
+    for i, a_char in enumerate(a, start=1):
+        row = [i]
+        for j, b_char in enumerate(b, start=1):
+            row.append(min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + (a_char != b_char)))
+        previous_row = row
+    return previous_row[-1]
+
+
+def _is_uncertain_word(word: str, abbreviation_indices: Mapping[str, int]) -> bool:
+    """
+    A word is uncertain if it is `UNKNOWN_WORD`, if it is marked with a trailing `UNKNOWN_WORD` (eg. `wrold?`)
+    or if it isn't in the word-list.
+    """
+    return word.endswith(UNKNOWN_WORD) or normalize('NFKC', word)[:4] not in abbreviation_indices
+
+
+def _get_word_candidates(word: str, words: Sequence[str]) -> Sequence[int]:
+    """
+    Return the indices of the `words` that the uncertain `word` may stand for: those that are at most
+    `MAX_WORD_EDIT_DISTANCE` edits away from it, or all of them if there are none (eg. for `UNKNOWN_WORD`).
+    """
+    word = normalize('NFKC', word.rstrip(UNKNOWN_WORD))
+    candidates = [index for index, candidate in enumerate(words)
+                  if word != '' and _edit_distance(word, normalize('NFKC', candidate)) <= MAX_WORD_EDIT_DISTANCE]
+    return candidates if len(candidates) > 0 else range(len(words))
+
+
+def get_mnemonic_candidates(mnemonic: str, words_path: str,
+                            max_uncertain_words: int=2) -> Dict[str, List[Sequence[int]]]:
+    """
+    Given a `mnemonic` with up to `max_uncertain_words` unknown, marked or misspelled words, return the candidate
+    word indices of each of its words for every language it may be written in. The certain words have a single
+    candidate.
+    """
+    words = mnemonic.lower().split()
+    if len(words) not in range(12, 25, 3):
+        raise ValueError(f"A mnemonic should have 12, 15, 18, 21 or 24 words. Got {len(words)}.")
+    language_candidates = {}
+    for language in MNEMONIC_LANG_OPTIONS.keys():
+        word_list_index = _get_word_list_index(language, words_path)
+        abbreviation_indices = word_list_index.abbreviation_indices
+        uncertain = [_is_uncertain_word(word, abbreviation_indices) for word in words]
+        if sum(uncertain) > max_uncertain_words:
+            continue
+        language_candidates[language] = [
+            _get_word_candidates(word, word_list_index.words) if is_uncertain
+            else [abbreviation_indices[normalize('NFKC', word)[:4]]]
+            for word, is_uncertain in zip(words, uncertain)
+        ]
+    if len(language_candidates) == 0:
+        raise ValueError(f"The mnemonic has more than {max_uncertain_words} unknown or uncertain words.")
+    return language_candidates
+
+
+def iter_candidate_mnemonics(candidates: Sequence[Sequence[int]], language: str, words_path: str) -> Iterator[str]:
+    """
+    Yield every mnemonic in `language` made of one of the `candidates` (word indices) of each of its words whose
+    checksum is valid. The checksum is checked before the words are looked up.
+    """
+    words = _get_word_list_index(language, words_path).words
+    for word_indices in product(*candidates):
+        if _is_valid_checksum(word_indices):
+            yield ' '.join(words[index] for index in word_indices)
+
+
 def get_mnemonic(*, language: str, words_path: str, entropy: Optional[bytes]=None) -> str:
     """
     Return a mnemonic string in a given `language` based on `entropy` via the calculated checksum.
@@ -151,7 +284,7 @@ def get_mnemonic(*, language: str, words_path: str, entropy: Optional[bytes]=Non
     entropy_bits += checksum
     entropy_length += checksum_length
     mnemonic = []
-    word_list = _get_word_list(language, words_path)
+    word_list = _get_word_list_index(language, words_path).words
     for i in range(entropy_length // 11 - 1, -1, -1):
         index = (entropy_bits >> i * 11) & 2**11 - 1
         word = _index_to_word(word_list, index)
@@ -1,4 +1,6 @@
-from typing import List
+from collections import OrderedDict
+from types import TracebackType
+from typing import List, Optional, Sequence, Tuple, Type
 
 from .mnemonic import get_seed
 from .tree import (
@@ -24,13 +26,136 @@ def path_to_nodes(path: str) -> List[int]:
     return [int(index) for index in indices]
 
 
+DEFAULT_DERIVATION_CACHE_SIZE = 64
+
+
+class DerivationCache:
+    """
+    A bounded cache of intermediate SKs keyed by their path prefix (eg. `(12381, 3600, 7)`), which together
+    form a trie rooted at the master SK. Entries are evicted in least-recently-used order and the buffer
+    holding an evicted SK is overwritten with zeroes.
+
+    `hits` counts the child derivations that were skipped thanks to the cache, `misses` those that had to be run.
+    """
+    def __init__(self, max_size: int=DEFAULT_DERIVATION_CACHE_SIZE) -> None:
+        if max_size < 0:
+            raise ValueError(f"`max_size` should be greater than or equal to 0. Got {max_size}.")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._nodes: 'OrderedDict[Tuple[int, ...], bytearray]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def longest_prefix(self, nodes: Sequence[int]) -> Tuple[int, Optional[int]]:
+        """
+        Return the depth and SK of the deepest cached ancestor of (or exact match for) `nodes`.
+        A depth of 0 (with `None` as the SK) means nothing was found and derivation starts from the master SK.
+        """
+        for depth in range(len(nodes), 0, -1):
+            sk_bytes = self._nodes.get(tuple(nodes[:depth]))
+            if sk_bytes is not None:
+                self._nodes.move_to_end(tuple(nodes[:depth]))
+                return depth, int.from_bytes(sk_bytes, byteorder='big')
+        return 0, None
+
+    def put(self, nodes: Sequence[int], sk: int) -> None:
+        if self.max_size == 0:
+            return
+        key = tuple(nodes)
+        if key in self._nodes:
+            self._nodes.move_to_end(key)
+            return
+        self._nodes[key] = bytearray(sk.to_bytes(32, byteorder='big'))
+        while len(self._nodes) > self.max_size:
+            _, evicted = self._nodes.popitem(last=False)
+            evicted[:] = bytes(len(evicted))
+
+    def clear(self) -> None:
+        for sk_bytes in self._nodes.values():
+            sk_bytes[:] = bytes(len(sk_bytes))
+        self._nodes.clear()
+
+
+class DerivationContext:
+    """
+    Holds the BIP39 seed and the master SK derived from a (`mnemonic`, `password`) pair so that the
+    expensive seed (PBKDF2-SHA512) and master SK derivations happen once per run instead of once per key.
+    Intermediate SKs are kept in a `DerivationCache` so that paths sharing a prefix (eg. the withdrawal
+    key `m/12381/3600/i/0` and the signing key `m/12381/3600/i/0/0`) only derive the nodes they do not share.
+
+    The context should be `wipe`d (or used as a context manager) once the keys are no longer needed.
+    """
+    def __init__(self, *, mnemonic: str, password: str, cache_size: int=DEFAULT_DERIVATION_CACHE_SIZE) -> None:
+        self._seed: Optional[bytearray] = bytearray(get_seed(mnemonic=mnemonic, password=password))
+        self._master_SK: Optional[int] = derive_master_SK(bytes(self._seed))
+        self.cache = DerivationCache(max_size=cache_size)
+
+    @classmethod
+    def from_master_SK(cls, master_SK: int, cache_size: int=DEFAULT_DERIVATION_CACHE_SIZE) -> 'DerivationContext':
+        """
+        Build a context around an already derived master SK, eg. to hand the derivation over to a worker process.
+        The seed is not available from such a context.
+        """
+        context = cls.__new__(cls)
+        context._seed = None
+        context._master_SK = master_SK
+        context.cache = DerivationCache(max_size=cache_size)
+        return context
+
+    @property
+    def seed(self) -> bytes:
+        if self._seed is None:
+            raise ValueError("The seed is not available in this derivation context.")
+        return bytes(self._seed)
+
+    @property
+    def master_SK(self) -> int:
+        if self._master_SK is None:
+            raise ValueError("The derivation context has already been wiped.")
+        return self._master_SK
+
+    def derive_key(self, path: str) -> int:
+        """
+        Return the SK at position `path`, starting from the deepest cached ancestor of `path`.
+        """
+        master_SK = self.master_SK
+        nodes = path_to_nodes(path)
+        depth, sk = self.cache.longest_prefix(nodes)
+        if sk is None:
+            sk = master_SK
+        self.cache.hits += depth
+        for i in range(depth, len(nodes)):
+            sk = derive_child_SK(parent_SK=sk, index=nodes[i])
+            self.cache.misses += 1
+            self.cache.put(nodes[:i + 1], sk)
+        return sk
+
+    def wipe(self) -> None:
+        """
+        Overwrite the seed and cached SK buffers and drop every reference to the secrets held by this context.
+        """
+        self.cache.clear()
+        if self._seed is not None:
+            self._seed[:] = bytes(len(self._seed))
+        self._seed = None
+        self._master_SK = None
+
+    def __enter__(self) -> 'DerivationContext':
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.wipe()
+
+
 def mnemonic_and_path_to_key(*, mnemonic: str, path: str, password: str) -> int:
     """
     Return the SK at position `path`, derived from `mnemonic`. The password is to be
     compliant with BIP39 mnemonics that use passwords, but is not used by this CLI outside of tests.
     """
-    seed = get_seed(mnemonic=mnemonic, password=password)
-    sk = derive_master_SK(seed)
-    for node in path_to_nodes(path):
-        sk = derive_child_SK(parent_SK=sk, index=node)
-    return sk
+    with DerivationContext(mnemonic=mnemonic, password=password) as context:
+        return context.derive_key(path)
@@ -1,6 +1,9 @@
 from staking_deposit.utils.crypto import (
     HKDF,
+    HKDF_expand,
+    HKDF_extract,
     SHA256,
+    SHA256_chunks,
 )
 from py_ecc.optimized_bls12_381 import curve_order as bls_curve_order
 from typing import List
@@ -13,13 +16,21 @@ def _flip_bits_256(input: int) -> int:
     return input ^ (2**256 - 1)
 
 
-def _IKM_to_lamport_SK(*, IKM: bytes, salt: bytes) -> List[bytes]:
+def _IKM_to_lamport_OKM(*, IKM: bytes, salt: bytes) -> bytearray:
+    """
+    Returns the 8160-byte HKDF output whose 32-byte chunks form the lamport SK.
+    """
+    return HKDF_expand(PRK=HKDF_extract(salt=salt, IKM=IKM), L=8160)
+
+
+def _IKM_to_lamport_SK(*, IKM: bytes, salt: bytes) -> List[memoryview]:
     """
     Derives the lamport SK for a given `IKM` and `salt`.
+    The chunks are `memoryview`s into a single OKM buffer rather than copies of it.
 
     Ref: https://github.com/ethereum/EIPs/blob/master/EIPS/eip-2333.md#ikm_to_lamport_sk
     """
-    OKM = HKDF(salt=salt, IKM=IKM, L=8160)
+    OKM = memoryview(_IKM_to_lamport_OKM(IKM=IKM, salt=salt))
     lamport_SK = [OKM[i: i + 32] for i in range(0, 8160, 32)]
     return lamport_SK
 
@@ -32,12 +43,13 @@ def _parent_SK_to_lamport_PK(*, parent_SK: int, index: int) -> bytes:
     """
     salt = index.to_bytes(4, byteorder='big')
     IKM = parent_SK.to_bytes(32, byteorder='big')
-    lamport_0 = _IKM_to_lamport_SK(IKM=IKM, salt=salt)
     not_IKM = _flip_bits_256(parent_SK).to_bytes(32, byteorder='big')
-    lamport_1 = _IKM_to_lamport_SK(IKM=not_IKM, salt=salt)
-    lamport_SKs = lamport_0 + lamport_1
-    lamport_PKs = [SHA256(sk) for sk in lamport_SKs]
-    compressed_PK = SHA256(b''.join(lamport_PKs))
+    # The lamport SKs are the 32-byte chunks of the two OKMs, hashed in bulk rather than split into lists
+    lamport_PKs = (
+        SHA256_chunks(data=_IKM_to_lamport_OKM(IKM=IKM, salt=salt), chunk_size=32)
+        + SHA256_chunks(data=_IKM_to_lamport_OKM(IKM=not_IKM, salt=salt), chunk_size=32)
+    )
+    compressed_PK = SHA256(lamport_PKs)
     return compressed_PK
 
 
@@ -6,12 +6,12 @@ from dataclasses import (
 )
 import json
 import os
-from py_ecc.bls import G2ProofOfPossession as bls
 from secrets import randbits
-from typing import Any, Dict, Optional, Union
+from typing import Any, ClassVar, Dict, Optional, Union
 from unicodedata import normalize
 from uuid import uuid4
 
+from staking_deposit.utils import bls
 from staking_deposit.utils.crypto import (
     AES_128_CTR,
     PBKDF2,
@@ -87,9 +87,13 @@ class Keystore(BytesDataclass):
     path: str = ''
     uuid: str = ''
     version: int = 4
+    # Whether the KDF parameters may be below the secure minimums, which is only allowed for devnet keystores
+    insecure_kdf: ClassVar[bool] = False
 
     def kdf(self, **kwargs: Any) -> bytes:
-        return scrypt(**kwargs) if 'scrypt' in self.crypto.kdf.function else PBKDF2(**kwargs)
+        if 'scrypt' in self.crypto.kdf.function:
+            return scrypt(**kwargs, insecure=self.insecure_kdf)
+        return PBKDF2(**kwargs, insecure=self.insecure_kdf)
 
     def save(self, filefolder: str) -> None:
         """
@@ -128,9 +132,11 @@ class Keystore(BytesDataclass):
     @classmethod
     def encrypt(cls, *, secret: bytes, password: str, path: str='',
                 kdf_salt: Optional[bytes]=None,
-                aes_iv: Optional[bytes]=None) -> 'Keystore':
+                aes_iv: Optional[bytes]=None,
+                pubkey: Optional[bytes]=None) -> 'Keystore':
         """
         Encrypt a secret (BLS SK) as an EIP 2335 Keystore.
+        The `pubkey` of the secret is computed from it unless it is given.
         """
         keystore = cls()
         keystore.uuid = str(uuid4())
@@ -145,7 +151,7 @@ class Keystore(BytesDataclass):
         cipher = AES_128_CTR(key=decryption_key[:16], **keystore.crypto.cipher.params)
         keystore.crypto.cipher.message = cipher.encrypt(secret)
         keystore.crypto.checksum.message = SHA256(decryption_key[16:32] + keystore.crypto.cipher.message)
-        keystore.pubkey = bls.SkToPk(int.from_bytes(secret, 'big')).hex()
+        keystore.pubkey = (pubkey if pubkey is not None else bls.SkToPk(int.from_bytes(secret, 'big'))).hex()
         keystore.path = path
         return keystore
 
@@ -207,3 +213,34 @@ class ScryptKeystore(Keystore):
             )
         )
     )
+
+
+INSECURE_KEYSTORE_DESCRIPTION = 'INSECURE devnet keystore (cheap KDF): never use it on a public chain'
+
+
+@dataclass
+class InsecurePbkdf2Keystore(Keystore):
+    """
+    A keystore whose PBKDF2 costs a fraction of a millisecond instead of about a second, so that the keys of large
+    devnets can be generated quickly. Its password can be brute-forced just as quickly: it is for devnets only.
+    """
+    insecure_kdf: ClassVar[bool] = True
+    crypto: KeystoreCrypto = dataclass_field(
+        default_factory=lambda: KeystoreCrypto(
+            kdf=KeystoreModule(
+                function='pbkdf2',
+                params={
+                    'c': 2**10,
+                    'dklen': 32,
+                    "prf": 'hmac-sha256'
+                },
+            ),
+            checksum=KeystoreModule(
+                function='sha256',
+            ),
+            cipher=KeystoreModule(
+                function='aes-128-ctr',
+            )
+        )
+    )
+    description: str = INSECURE_KEYSTORE_DESCRIPTION
@@ -0,0 +1,153 @@
+from contextlib import contextmanager
+from hmac import compare_digest
+import sqlite3
+from types import TracebackType
+from typing import Dict, Iterable, Iterator, Optional, Type
+
+from staking_deposit.utils import bls
+from staking_deposit.utils.crypto import HMAC_SHA256, SHA256
+
+# Bump whenever the table layout or the entry tags change: indexes written by other versions are discarded
+PUBKEY_INDEX_VERSION = 1
+# Marks the SQLite files that are public key indexes (b'SDPK'), so that no other database is ever altered
+PUBKEY_INDEX_APPLICATION_ID = 0x5344504b
+
+
+def master_PK_fingerprint(master_SK: int) -> str:
+    """
+    Return a non-secret fingerprint of a seed: the SHA256 of the master public key derived from it.
+    """
+    return SHA256(bls.SkToPk(master_SK)).hex()
+
+
+class PubkeyIndex:
+    """
+    An opt-in, on-disk (SQLite) index of the public keys derived from a seed, keyed by the fingerprint of the
+    seed's master public key and by derivation path. Only public data is ever written to it.
+
+    Every entry is tagged with an HMAC whose key is derived from the master SK, so an entry that was corrupted,
+    or that was not written by a holder of the seed, is detected when it is read, discarded and derived again.
+
+    A new (empty) database is marked as an index when it is opened, and any other database that isn't marked
+    as such is refused rather than altered.
+    """
+    def __init__(self, path: str, *, master_SK: int) -> None:
+        self.fingerprint = master_PK_fingerprint(master_SK)
+        self._tag_key = SHA256(b'staking-deposit-cli-pubkey-index' + master_SK.to_bytes(32, byteorder='big'))
+        self._connection = sqlite3.connect(path)
+        try:
+            self._prepare(path)
+        except BaseException:
+            self._connection.close()
+            raise
+
+    def _prepare(self, path: str) -> None:
+        is_empty = self._connection.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()[0] == 0
+        application_id = self._connection.execute('PRAGMA application_id').fetchone()[0]
+        if is_empty:
+            self._connection.execute(f'PRAGMA application_id = {PUBKEY_INDEX_APPLICATION_ID}')
+        elif application_id != PUBKEY_INDEX_APPLICATION_ID:
+            raise ValueError(f"{path} is not a public key index, and is left untouched.")
+        version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+        if version != PUBKEY_INDEX_VERSION:
+            # An index written by another version of this tool
+            self._connection.execute('DROP TABLE IF EXISTS pubkeys')
+            self._connection.execute(f'PRAGMA user_version = {PUBKEY_INDEX_VERSION}')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS pubkeys ('
+            'fingerprint TEXT NOT NULL, path TEXT NOT NULL, pubkey BLOB NOT NULL, tag BLOB NOT NULL, '
+            'PRIMARY KEY (fingerprint, path))'
+        )
+        self._connection.commit()
+
+    def _tag(self, path: str, pubkey: bytes) -> bytes:
+        return HMAC_SHA256(key=self._tag_key, message=f'{self.fingerprint}:{path}:'.encode() + pubkey)
+
+    def get(self, path: str) -> Optional[bytes]:
+        """
+        Return the public key at `path`, or `None` if there is no valid entry for it.
+        """
+        row = self._connection.execute(
+            'SELECT pubkey, tag FROM pubkeys WHERE fingerprint = ? AND path = ?', (self.fingerprint, path)
+        ).fetchone()
+        if row is None:
+            return None
+        pubkey, tag = bytes(row[0]), bytes(row[1])
+        if not compare_digest(tag, self._tag(path, pubkey)):
+            self.invalidate([path])
+            return None
+        return pubkey
+
+    def pubkeys(self) -> Dict[str, bytes]:
+        """
+        Return every valid entry of this seed as a `{path: pubkey}` dict. Invalid entries are discarded.
+        """
+        rows = self._connection.execute(
+            'SELECT path, pubkey, tag FROM pubkeys WHERE fingerprint = ?', (self.fingerprint,)
+        ).fetchall()
+        pubkeys = {path: bytes(pubkey) for path, pubkey, tag in rows
+                   if compare_digest(bytes(tag), self._tag(path, bytes(pubkey)))}
+        if len(pubkeys) != len(rows):
+            self.invalidate(path for path, _, _ in rows if path not in pubkeys)
+        return pubkeys
+
+    def put(self, path: str, pubkey: bytes) -> None:
+        self.put_many({path: pubkey})
+
+    def put_many(self, pubkeys: Dict[str, bytes]) -> None:
+        self._connection.executemany(
+            'INSERT OR REPLACE INTO pubkeys (fingerprint, path, pubkey, tag) VALUES (?, ?, ?, ?)',
+            [(self.fingerprint, path, pubkey, self._tag(path, pubkey)) for path, pubkey in pubkeys.items()],
+        )
+
+    def invalidate(self, paths: Optional[Iterable[str]]=None) -> None:
+        """
+        Discard the entries of this seed at `paths`, or all of them if no `paths` are given.
+        """
+        if paths is None:
+            self._connection.execute('DELETE FROM pubkeys WHERE fingerprint = ?', (self.fingerprint,))
+        else:
+            self._connection.executemany(
+                'DELETE FROM pubkeys WHERE fingerprint = ? AND path = ?', [(self.fingerprint, path) for path in paths]
+            )
+
+    def check_integrity(self) -> int:
+        """
+        Check the database file and the tag of every entry of this seed, discard the invalid entries and return
+        how many were discarded. If the database file itself is damaged, all of this seed's entries are discarded.
+        """
+        num_entries = self._connection.execute(
+            'SELECT COUNT(*) FROM pubkeys WHERE fingerprint = ?', (self.fingerprint,)
+        ).fetchone()[0]
+        if self._connection.execute('PRAGMA quick_check').fetchone()[0] != 'ok':
+            self.invalidate()
+            return num_entries
+        return num_entries - len(self.pubkeys())
+
+    def close(self) -> None:
+        """
+        Commit the pending entries and close the database.
+        """
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self) -> 'PubkeyIndex':
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+
+@contextmanager
+def open_pubkey_index(path: Optional[str], *, master_SK: int) -> Iterator[Optional[PubkeyIndex]]:
+    """
+    Open the `PubkeyIndex` at `path` for the seed behind `master_SK`, or yield `None` if no `path` is given.
+    """
+    if path is None:
+        yield None
+        return
+    with PubkeyIndex(path, master_SK=master_SK) as pubkey_index:
+        yield pubkey_index
@@ -0,0 +1,164 @@
+import click
+from contextlib import closing
+from functools import partial
+import math
+from typing import AbstractSet, Iterable, List, Optional, Sequence, Tuple
+
+from staking_deposit.credentials import signing_key_path
+from staking_deposit.key_handling.key_derivation.mnemonic import (
+    get_mnemonic_candidates,
+    iter_candidate_mnemonics,
+)
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+from staking_deposit.utils import bls
+from staking_deposit.utils.intl import load_text
+from staking_deposit.utils.parallel import (
+    CHUNKS_PER_WORKER,
+    iter_search_results,
+    search_stopped,
+    split_into_chunks,
+)
+
+
+def _split_candidates(candidates: Sequence[Sequence[int]], num_chunks: int) -> List[List[Sequence[int]]]:
+    """
+    Split the search space of the word `candidates` into about `num_chunks` parts (at least as many, if there are
+    enough candidates), in order: the first uncertain words are fixed to each of their candidates until there are
+    enough parts, and the candidates of the next uncertain word are then split among them.
+    """
+    parts = [list(candidates)]
+    for position, word_candidates in enumerate(candidates):
+        if len(word_candidates) == 1:
+            continue
+        if len(parts) * len(word_candidates) >= num_chunks:
+            return [[*part[:position], chunk, *part[position + 1:]]
+                    for part in parts
+                    for chunk in split_into_chunks(word_candidates, -(-num_chunks // len(parts)))]
+        parts = [[*part[:position], [candidate], *part[position + 1:]]
+                 for part in parts
+                 for candidate in word_candidates]
+    return parts
+
+
+def _search_mnemonic_candidates(*, candidates: Sequence[Sequence[int]], language: str, words_path: str,
+                                password: str, indices: Sequence[int],
+                                pubkeys: AbstractSet[bytes]) -> Optional[Tuple[str, int]]:
+    """
+    Derive the signing pubkeys at `indices` of every candidate mnemonic with a valid checksum, until one of them
+    is in `pubkeys`. Return that mnemonic and the index of the matching key, if any.
+    """
+    for mnemonic in iter_candidate_mnemonics(candidates, language, words_path):
+        if search_stopped():
+            break
+        with DerivationContext(mnemonic=mnemonic, password=password) as derivation_context:
+            for index in indices:
+                if bls.SkToPk(derivation_context.derive_key(signing_key_path(index))) in pubkeys:
+                    return mnemonic, index
+    return None
+
+
+def recover_mnemonic_from_pubkeys(*,
+                                  mnemonic: str,
+                                  password: str,
+                                  words_path: str,
+                                  targets: Iterable[bytes],
+                                  start_index: int,
+                                  num_indices: int,
+                                  num_workers: int=1) -> Optional[Tuple[str, int]]:
+    """
+    Recover a `mnemonic` that has up to two unknown (`?`), marked (eg. `wrold?`) or misspelled words, from the
+    signing pubkeys (`targets`) of any of its validators among the `num_indices` indices from `start_index`.
+    Return the recovered mnemonic and the index of the matching key, or `None` if no candidate matches.
+
+    The candidates are pruned with the mnemonic checksum before any seed is derived. With `num_workers > 1`
+    the candidates are split into chunks (over as many uncertain words as needed) that are searched by a process
+    pool, and the search stops as soon as one candidate matches.
+    """
+    if num_workers < 1:
+        raise ValueError(f"`num_workers` should be greater than or equal to 1. Got {num_workers}.")
+    pubkeys = frozenset(targets)
+    indices = range(start_index, start_index + num_indices)
+    # Split the search space of every candidate language
+    searches: List[Tuple[str, List[Sequence[int]]]] = []
+    for language, candidates in get_mnemonic_candidates(mnemonic, words_path).items():
+        for part in _split_candidates(candidates, num_workers * CHUNKS_PER_WORKER):
+            searches.append((language, part))
+
+    search = partial(_search_mnemonic_candidates, words_path=words_path, password=password, indices=indices,
+                     pubkeys=pubkeys)
+    num_candidates = [math.prod(len(word_candidates) for word_candidates in candidates) for _, candidates in searches]
+    with click.progressbar(length=sum(num_candidates), label=load_text(['msg_mnemonic_search']),
+                           show_percent=False, show_pos=True) as bar:
+        if num_workers == 1:
+            for (language, candidates), num_chunk_candidates in zip(searches, num_candidates):
+                found = search(language=language, candidates=candidates)
+                bar.update(num_chunk_candidates)
+                if found is not None:
+                    return found
+            return None
+
+        tasks = [dict(language=language, candidates=candidates) for language, candidates in searches]
+        with closing(iter_search_results(search, tasks, num_workers=num_workers)) as results:
+            for search_number, found in results:
+                bar.update(num_candidates[search_number])
+                if found is not None:
+                    return found
+    return None
+
+
+# Number of candidate passwords handed to a worker at once: each one costs a PBKDF2-SHA512 and a key derivation
+PASSWORD_BATCH_SIZE = 16
+
+
+def _search_mnemonic_passwords(*, mnemonic: str, passwords: Sequence[str], path: str,
+                               pubkeys: AbstractSet[bytes]) -> Tuple[Optional[str], int]:
+    """
+    Derive the signing pubkey at `path` of `mnemonic` with each of the `passwords`, until one of them is in
+    `pubkeys`. Return that password, if any, along with the number of passwords that were tried.
+    """
+    for num_tried, password in enumerate(passwords):
+        if search_stopped():
+            return None, num_tried
+        with DerivationContext(mnemonic=mnemonic, password=password) as derivation_context:
+            if bls.SkToPk(derivation_context.derive_key(path)) in pubkeys:
+                return password, num_tried + 1
+    return None, len(passwords)
+
+
+def find_mnemonic_password(*,
+                           mnemonic: str,
+                           passwords: Sequence[str],
+                           targets: Iterable[bytes],
+                           index: int=0,
+                           num_workers: int=1) -> Tuple[Optional[str], int]:
+    """
+    Find which of the candidate `passwords` of `mnemonic` derives one of the signing pubkeys `targets` at the
+    validator `index`. Return that password (or `None`) and the number of candidates that were tried.
+    With `num_workers > 1` the candidates are tried in batches by a process pool, and the search stops as soon as
+    one of them matches.
+    """
+    if num_workers < 1:
+        raise ValueError(f"`num_workers` should be greater than or equal to 1. Got {num_workers}.")
+    search = partial(_search_mnemonic_passwords, mnemonic=mnemonic, path=signing_key_path(index),
+                     pubkeys=frozenset(targets))
+    batches = [passwords[i: i + PASSWORD_BATCH_SIZE] for i in range(0, len(passwords), PASSWORD_BATCH_SIZE)]
+    num_tried = 0
+    with click.progressbar(length=len(passwords), label=load_text(['msg_password_search']),
+                           show_percent=False, show_pos=True) as bar:
+        if num_workers == 1:
+            for batch in batches:
+                found, num_batch_tried = search(passwords=batch)
+                num_tried += num_batch_tried
+                bar.update(num_batch_tried)
+                if found is not None:
+                    return found, num_tried
+            return None, num_tried
+
+        tasks = [dict(passwords=batch) for batch in batches]
+        with closing(iter_search_results(search, tasks, num_workers=num_workers)) as results:
+            for _, (found, num_batch_tried) in results:
+                num_tried += num_batch_tried
+                bar.update(num_batch_tried)
+                if found is not None:
+                    return found, num_tried
+    return None, num_tried
@@ -45,6 +45,18 @@ def get_chain_setting(chain_name: str = MAINNET) -> BaseChainSetting:
     return ALL_CHAINS[chain_name]
 
 
+def is_public_chain_setting(chain_setting: BaseChainSetting) -> bool:
+    """
+    Whether `chain_setting` is (or shares the deposit signing domain of) one of the public chains in `ALL_CHAINS`:
+    deposits are signed with the genesis fork version only, so they would be valid on that chain as well.
+    """
+    return any(
+        chain_setting.NETWORK_NAME == public_setting.NETWORK_NAME
+        or chain_setting.GENESIS_FORK_VERSION == public_setting.GENESIS_FORK_VERSION
+        for public_setting in ALL_CHAINS.values()
+    )
+
+
 def get_devnet_chain_setting(network_name: str,
                              genesis_fork_version: str,
                              genesis_validator_root: str) -> BaseChainSetting:
@@ -0,0 +1,374 @@
+"""
+BLS signatures of the proof of possession ciphersuite used by Ethereum, through a pluggable backend.
+
+py_ecc (pure Python) is the reference backend. A native binding is used instead when it is installed
+(currently the `blst` Python wrapper), unless the backend is forced with the `STAKING_DEPOSIT_BLS_BACKEND`
+environment variable (`auto`, `py_ecc` or `blst`) or `set_backend()`.
+"""
+from abc import ABC, abstractmethod
+from functools import lru_cache
+import inspect
+from hashlib import sha256
+import os
+from secrets import randbits
+from types import ModuleType
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from eth_typing import BLSPubkey, BLSSignature
+from eth_utils import ValidationError
+from py_ecc.bls import G2ProofOfPossession as py_ecc_bls
+from py_ecc.bls.g2_primitives import (
+    G1_to_pubkey,
+    G2_to_signature,
+    pubkey_to_G1,
+    signature_to_G2,
+    subgroup_check,
+)
+from py_ecc.bls.hash_to_curve import hash_to_G2
+from py_ecc.fields import (
+    optimized_bls12_381_FQ2 as FQ2,
+    optimized_bls12_381_FQ12 as FQ12,
+)
+from py_ecc.optimized_bls12_381 import (
+    G1,
+    Z2,
+    add,
+    curve_order,
+    final_exponentiate,
+    multiply,
+    neg,
+    pairing,
+)
+from py_ecc.typing import Optimized_Point3D
+
+from staking_deposit.utils.fixed_base import get_g1_table
+from staking_deposit.utils.glv import (
+    multiply_G2,
+    use_glv_multiply,
+)
+
+BLS_BACKEND_ENV_VAR = 'STAKING_DEPOSIT_BLS_BACKEND'
+AUTO_BACKEND = 'auto'
+
+POP_DST = b'BLS_SIG_BLS12381G2_XMD:SHA-256_SSWU_RO_POP_'
+# The size of the random scalars that weigh each signature in a batch verification
+BATCH_SCALAR_BITS = 64
+# The number of messages whose hash to G2 (a few hundred bytes each) is kept by the py_ecc backend
+HASH_TO_G2_CACHE_SIZE = 2**14
+
+
+class BLSBackend(ABC):
+    """
+    The BLS operations this tool needs, as in the `G2ProofOfPossession` API of py_ecc. The backends are used as
+    classes (they are never instantiated), so `register_backend` rejects those that leave an operation abstract.
+    """
+    name = ''
+
+    @staticmethod
+    @abstractmethod
+    def is_available() -> bool:
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def SkToPk(SK: int) -> BLSPubkey:
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def Sign(SK: int, message: bytes) -> BLSSignature:
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def Verify(PK: BLSPubkey, message: bytes, signature: BLSSignature) -> bool:
+        ...
+
+    @classmethod
+    def BatchVerify(cls, PKs: Sequence[BLSPubkey], messages: Sequence[bytes],
+                    signatures: Sequence[BLSSignature]) -> bool:
+        """
+        Whether every signature is valid for its message and public key.
+        """
+        return all(cls.Verify(PK, message, signature) for PK, message, signature in zip(PKs, messages, signatures))
+
+
+@lru_cache(maxsize=HASH_TO_G2_CACHE_SIZE)
+def _hash_to_G2(message: bytes, DST: bytes) -> Optimized_Point3D[FQ2]:
+    """
+    Hash a message to G2, which is one of the costliest steps of a signature and of its verification. A message is
+    signed and then verified moments later (or verified several times), so the latest results are kept. The cache
+    belongs to the process: the signatures are verified by the process that made them, in batches smaller than the
+    cache (see `credentials.sign_and_verify_deposits`).
+    """
+    return hash_to_G2(message, DST, sha256)
+
+
+def hash_to_G2_cache_info() -> Any:
+    """
+    Return the hits, misses and size of the hash-to-G2 cache of the py_ecc backend (a `functools` `CacheInfo`).
+    """
+    return _hash_to_G2.cache_info()
+
+
+class PyEccBackend(BLSBackend):
+    name = 'py_ecc'
+
+    @staticmethod
+    def is_available() -> bool:
+        return True
+
+    @staticmethod
+    def _validate_SK(SK: int) -> None:
+        if not (isinstance(SK, int) and 0 < SK < curve_order):
+            raise ValidationError(f"Invalid BLS secret key {SK}.")
+
+    @classmethod
+    def SkToPk(cls, SK: int) -> BLSPubkey:
+        # The generator multiple is looked up in the fixed-base table instead of py_ecc's double-and-add
+        cls._validate_SK(SK)
+        return G1_to_pubkey(get_g1_table().multiply(SK))
+
+    @classmethod
+    def Sign(cls, SK: int, message: bytes) -> BLSSignature:
+        cls._validate_SK(SK)
+        message_point = _hash_to_G2(message, POP_DST)
+        if use_glv_multiply():
+            # With the GLS endomorphism (see `glv.py`) instead of py_ecc's double-and-add
+            return G2_to_signature(multiply_G2(message_point, SK))
+        return G2_to_signature(multiply(message_point, SK))
+
+    @staticmethod
+    def Verify(PK: BLSPubkey, message: bytes, signature: BLSSignature) -> bool:
+        try:
+            if not py_ecc_bls.KeyValidate(PK):
+                return False
+            signature_point = signature_to_G2(signature)
+            if not subgroup_check(signature_point):
+                return False
+            miller_loops = pairing(signature_point, G1, final_exponentiate=False) * pairing(
+                _hash_to_G2(message, POP_DST), neg(pubkey_to_G1(PK)), final_exponentiate=False)
+            return final_exponentiate(miller_loops) == FQ12.one()
+        except (ValidationError, ValueError, AssertionError):
+            return False
+
+    @classmethod
+    def BatchVerify(cls, PKs: Sequence[BLSPubkey], messages: Sequence[bytes],
+                    signatures: Sequence[BLSSignature]) -> bool:
+        """
+        Weigh each signature (and its public key) with a random `BATCH_SCALAR_BITS`-bit scalar r_i and check that
+        prod(e(r_i * PK_i, H(m_i))) * e(-G1, sum(r_i * sig_i)) == 1, ie. with n + 1 Miller loops and a single final
+        exponentiation instead of 2n Miller loops and n final exponentiations.
+        """
+        try:
+            aggregate_signature = Z2
+            miller_loops = FQ12.one()
+            for PK, message, signature in zip(PKs, messages, signatures):
+                if not py_ecc_bls.KeyValidate(PK):
+                    return False
+                signature_point = signature_to_G2(signature)
+                if not subgroup_check(signature_point):
+                    return False
+                scalar = randbits(BATCH_SCALAR_BITS) | 1  # Never zero
+                aggregate_signature = add(aggregate_signature, multiply(signature_point, scalar))
+                miller_loops *= pairing(
+                    _hash_to_G2(message, POP_DST),
+                    multiply(pubkey_to_G1(PK), scalar),
+                    final_exponentiate=False,
+                )
+            miller_loops *= pairing(aggregate_signature, neg(G1), final_exponentiate=False)
+            return final_exponentiate(miller_loops) == FQ12.one()
+        except (ValidationError, ValueError, AssertionError):
+            return False
+
+
+def _import_blst() -> Optional[ModuleType]:
+    try:
+        import blst
+    except ImportError:
+        return None
+    return blst
+
+
+class BlstBackend(BLSBackend):
+    """
+    The `blst` Python wrapper (https://github.com/supranational/blst/tree/master/bindings/python).
+    """
+    name = 'blst'
+
+    @staticmethod
+    def is_available() -> bool:
+        return _import_blst() is not None
+
+    @staticmethod
+    def _blst() -> ModuleType:
+        blst = _import_blst()
+        if blst is None:
+            raise ImportError("The `blst` BLS backend isn't installed.")
+        return blst
+
+    @classmethod
+    def SkToPk(cls, SK: int) -> BLSPubkey:
+        blst = cls._blst()
+        return BLSPubkey(blst.P1(blst.SecretKey().from_bendian(SK.to_bytes(32, 'big'))).compress())
+
+    @classmethod
+    def Sign(cls, SK: int, message: bytes) -> BLSSignature:
+        blst = cls._blst()
+        secret_key = blst.SecretKey().from_bendian(SK.to_bytes(32, 'big'))
+        return BLSSignature(blst.P2().hash_to(message, POP_DST).sign_with(secret_key).compress())
+
+    @classmethod
+    def _load_points(cls, PK: BLSPubkey, signature: BLSSignature) -> Optional[Tuple[Any, Any]]:
+        """
+        Decompress the public key and signature, or return None unless both are valid (ie. in their subgroup
+        and, for the public key, not the identity), as `Verify` requires.
+        """
+        blst = cls._blst()
+        try:
+            pk_affine = blst.P1_Affine(bytes(PK))
+            signature_affine = blst.P2_Affine(bytes(signature))
+        except RuntimeError:  # Invalid encoding
+            return None
+        if pk_affine.is_inf() or not pk_affine.in_group() or not signature_affine.in_group():
+            return None
+        return pk_affine, signature_affine
+
+    @classmethod
+    def Verify(cls, PK: BLSPubkey, message: bytes, signature: BLSSignature) -> bool:
+        blst = cls._blst()
+        points = cls._load_points(PK, signature)
+        if points is None:
+            return False
+        pk_affine, signature_affine = points
+        return bool(signature_affine.core_verify(pk_affine, True, message, POP_DST) == blst.BLST_SUCCESS)
+
+    @classmethod
+    def BatchVerify(cls, PKs: Sequence[BLSPubkey], messages: Sequence[bytes],
+                    signatures: Sequence[BLSSignature]) -> bool:
+        """
+        Weigh each signature with a random `BATCH_SCALAR_BITS`-bit scalar and check them all with a single
+        multi-pairing.
+        """
+        blst = cls._blst()
+        pairing = blst.Pairing(True, POP_DST)
+        for PK, message, signature in zip(PKs, messages, signatures):
+            points = cls._load_points(PK, signature)
+            if points is None:
+                return False
+            pk_affine, signature_affine = points
+            scalar = randbits(BATCH_SCALAR_BITS) | 1  # Never zero
+            pairing.mul_n_aggregate(pk_affine, signature_affine, scalar.to_bytes(BATCH_SCALAR_BITS // 8, 'little'),
+                                    BATCH_SCALAR_BITS, message)
+        pairing.commit()
+        return bool(pairing.finalverify())
+
+
+BACKENDS: Dict[str, Type[BLSBackend]] = {}
+
+
+def register_backend(backend: Type[BLSBackend]) -> Type[BLSBackend]:
+    """
+    Make `backend` selectable by its name. A backend that doesn't implement every operation is rejected right away,
+    rather than when that operation is first called.
+    """
+    if inspect.isabstract(backend):
+        missing = ', '.join(sorted(getattr(backend, '__abstractmethods__')))
+        raise TypeError(f"The {backend.__name__} BLS backend doesn't implement {missing}.")
+    if backend.name == '' or backend.name == AUTO_BACKEND:
+        raise ValueError(f"Invalid BLS backend name {backend.name!r}.")
+    BACKENDS[backend.name] = backend
+    return backend
+
+
+register_backend(PyEccBackend)
+register_backend(BlstBackend)
+# The native backends, in order of preference, that are used when they are installed
+_NATIVE_BACKENDS = (BlstBackend,)
+
+_backend: Optional[Type[BLSBackend]] = None
+
+
+def _select_backend(name: str) -> Type[BLSBackend]:
+    if name == AUTO_BACKEND:
+        for backend in _NATIVE_BACKENDS:
+            if backend.is_available():
+                return backend
+        return PyEccBackend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown BLS backend {name!r}. Expected one of {[AUTO_BACKEND, *BACKENDS.keys()]}.")
+    if not BACKENDS[name].is_available():
+        raise ValueError(f"The {name!r} BLS backend isn't installed.")
+    return BACKENDS[name]
+
+
+def get_backend() -> Type[BLSBackend]:
+    """
+    Return the backend in use, which is chosen on first use from the `STAKING_DEPOSIT_BLS_BACKEND` environment
+    variable (auto-detected by default).
+    """
+    global _backend
+    if _backend is None:
+        _backend = _select_backend(os.environ.get(BLS_BACKEND_ENV_VAR, AUTO_BACKEND))
+    return _backend
+
+
+def set_backend(name: str) -> None:
+    """
+    Force the backend in use. It is also recorded in the environment, so that worker processes use it as well.
+    """
+    global _backend
+    _backend = _select_backend(name)
+    os.environ[BLS_BACKEND_ENV_VAR] = name
+
+
+def SkToPk(SK: int) -> BLSPubkey:
+    return get_backend().SkToPk(SK)
+
+
+def Sign(SK: int, message: bytes) -> BLSSignature:
+    return get_backend().Sign(SK, message)
+
+
+def Verify(PK: BLSPubkey, message: bytes, signature: BLSSignature) -> bool:
+    return get_backend().Verify(PK, message, signature)
+
+
+def BatchVerify(PKs: Sequence[BLSPubkey], messages: Sequence[bytes], signatures: Sequence[BLSSignature]) -> bool:
+    if not len(PKs) == len(messages) == len(signatures):
+        raise ValueError(
+            f"Expected as many public keys ({len(PKs)}) as messages ({len(messages)}) and signatures "
+            f"({len(signatures)})."
+        )
+    return get_backend().BatchVerify(PKs, messages, signatures)
+
+
+def find_invalid_signatures(PKs: Sequence[BLSPubkey], messages: Sequence[bytes],
+                            signatures: Sequence[BLSSignature]) -> List[int]:
+    """
+    Return the positions of the invalid signatures. They are all checked with a single batch verification and, if it
+    fails, each half is checked in turn (and so on), down to single signatures that are verified on their own.
+    """
+    if not len(PKs) == len(messages) == len(signatures):
+        raise ValueError(
+            f"Expected as many public keys ({len(PKs)}) as messages ({len(messages)}) and signatures "
+            f"({len(signatures)})."
+        )
+
+    def bisect(start: int, stop: int) -> List[int]:
+        if stop - start == 1:
+            return [] if Verify(PKs[start], messages[start], signatures[start]) else [start]
+        if BatchVerify(PKs[start:stop], messages[start:stop], signatures[start:stop]):
+            return []
+        middle = (start + stop) // 2
+        return bisect(start, middle) + bisect(middle, stop)
+
+    return bisect(0, len(PKs)) if len(PKs) > 0 else []
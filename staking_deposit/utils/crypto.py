@@ -1,4 +1,6 @@
-from typing import Any
+import hashlib
+import hmac
+from typing import Any, Union
 
 from Crypto.Hash import (
     SHA256 as _sha256,
@@ -18,8 +20,24 @@ def SHA256(x: bytes) -> bytes:
     return _sha256.new(x).digest()
 
 
-def scrypt(*, password: str, salt: str, n: int, r: int, p: int, dklen: int) -> bytes:
-    if n * r * p < 2**20:  # 128 MB memory usage
+def SHA256_chunks(*, data: Union[bytes, bytearray, memoryview], chunk_size: int) -> bytes:
+    """
+    Hash every `chunk_size`-byte chunk of `data` and return the concatenated digests.
+    The chunks are hashed through `memoryview` slices, so `data` is never copied, and hashlib's
+    one-shot constructor is used as it is much cheaper per call than a new PyCryptodome hash object.
+    """
+    if chunk_size <= 0 or len(data) % chunk_size != 0:
+        raise ValueError(f"The length of `data` ({len(data)}) should be a multiple of `chunk_size` ({chunk_size}).")
+    view = memoryview(data)
+    sha256 = hashlib.sha256
+    return b''.join([sha256(view[i: i + chunk_size]).digest() for i in range(0, len(view), chunk_size)])
+
+
+def scrypt(*, password: str, salt: str, n: int, r: int, p: int, dklen: int, insecure: bool=False) -> bytes:
+    """
+    With `insecure`, the parameters aren't checked for security; it is only meant for devnet keystores.
+    """
+    if n * r * p < 2**20 and not insecure:  # 128 MB memory usage
         raise ValueError("The Scrypt parameters chosen are not secure.")
     if n >= 2**(128 * r / 8):
         raise ValueError("The given `n` should be less than `2**(128 * r / 8)`."
@@ -28,10 +46,13 @@ def scrypt(*, password: str, salt: str, n: int, r: int, p: int, dklen: int) -> b
     return res if isinstance(res, bytes) else res[0]  # PyCryptodome can return Tuple[bytes]
 
 
-def PBKDF2(*, password: bytes, salt: bytes, dklen: int, c: int, prf: str) -> bytes:
+def PBKDF2(*, password: bytes, salt: bytes, dklen: int, c: int, prf: str, insecure: bool=False) -> bytes:
+    """
+    With `insecure`, the number of rounds isn't checked for security; it is only meant for devnet keystores.
+    """
     if 'sha' not in prf:
         raise ValueError(f"String 'sha' is not in `prf`({prf})")
-    if 'sha256' in prf and c < 2**18:
+    if 'sha256' in prf and c < 2**18 and not insecure:
         '''
         Verify the number of rounds of SHA256-PBKDF2. SHA512 not checked as use in BIP39
         does not require, and therefore doesn't use, safe parameters (c=2048).
@@ -49,6 +70,46 @@ def HKDF(*, salt: bytes, IKM: bytes, L: int, info: bytes=b'') -> bytes:
     return res if isinstance(res, bytes) else res[0]  # PyCryptodome can return Tuple[bytes]
 
 
+def HMAC_SHA256(*, key: bytes, message: bytes) -> bytes:
+    return hmac.new(key, message, hashlib.sha256).digest()
+
+
+def HKDF_extract(*, salt: bytes, IKM: bytes) -> bytes:
+    """
+    HKDF-Extract with HMAC-SHA256.
+
+    Ref: https://tools.ietf.org/html/rfc5869#section-2.2
+    """
+    return HMAC_SHA256(key=salt, message=IKM)
+
+
+def HKDF_expand(*, PRK: bytes, L: int, info: bytes=b'') -> bytearray:
+    """
+    HKDF-Expand with HMAC-SHA256, writing the OKM into a single preallocated buffer.
+    The inner and outer HMAC pad states are hashed once and cloned for every 32-byte block.
+
+    Ref: https://tools.ietf.org/html/rfc5869#section-2.3
+    """
+    if not 0 < L <= 255 * 32:
+        raise ValueError(f"`L` should be greater than 0 and less than or equal to {255 * 32}. Got {L}.")
+    key = PRK if len(PRK) <= 64 else hashlib.sha256(PRK).digest()
+    key = key.ljust(64, b'\x00')
+    inner = hashlib.sha256(bytes(k ^ 0x36 for k in key))
+    outer = hashlib.sha256(bytes(k ^ 0x5c for k in key))
+    num_blocks = -(-L // 32)  # ceil division
+    OKM = bytearray(num_blocks * 32)
+    T = b''
+    for i in range(num_blocks):
+        inner_hash = inner.copy()
+        inner_hash.update(T + info + bytes((i + 1,)))
+        outer_hash = outer.copy()
+        outer_hash.update(inner_hash.digest())
+        T = outer_hash.digest()
+        OKM[i * 32: (i + 1) * 32] = T
+    del OKM[L:]
+    return OKM
+
+
 def AES_128_CTR(*, key: bytes, iv: bytes) -> Any:
     if len(key) != 16:
         raise ValueError(f"The key length should be 16. Got {len(key)}.")
@@ -0,0 +1,210 @@
+"""
+Fixed-base scalar multiplication of the G1 generator, for the public keys (SkToPk).
+
+A scalar is split into `G1_WINDOW_BITS`-bit windows and the generator multiple of each window is looked up in a
+precomputed table, so a multiplication costs one (mixed) point addition per window and no doubling at all.
+The table is built once per process or, if the `STAKING_DEPOSIT_G1_TABLE_CACHE` environment variable names a file,
+loaded from (or saved to) that file, which is mapped in memory.
+"""
+from hashlib import sha256
+import mmap
+import os
+import tempfile
+from typing import (
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from py_ecc.fields import optimized_bls12_381_FQ as FQ
+from py_ecc.optimized_bls12_381 import (
+    G1,
+    curve_order,
+    field_modulus,
+    normalize,
+)
+from py_ecc.typing import Optimized_Point3D
+
+G1_TABLE_CACHE_ENV_VAR = 'STAKING_DEPOSIT_G1_TABLE_CACHE'
+G1_WINDOW_BITS = 8
+G1_NUM_WINDOWS = -(-curve_order.bit_length() // G1_WINDOW_BITS)
+
+_MAGIC = b'G1FBT\x01'
+_HEADER = _MAGIC + bytes([G1_WINDOW_BITS])
+_COORDINATE_SIZE = 48
+_ENTRY_SIZE = 2 * _COORDINATE_SIZE
+# Each window has an entry for every non-zero digit
+_ENTRIES_PER_WINDOW = 2**G1_WINDOW_BITS - 1
+_TABLE_SIZE = len(_HEADER) + G1_NUM_WINDOWS * _ENTRIES_PER_WINDOW * _ENTRY_SIZE
+_CHECKSUM_SIZE = 32
+# G1 is on the curve y**2 = x**3 + 4
+_CURVE_B = 4
+
+# Points in homogeneous projective coordinates (x/z, y/z) and affine points, over plain integers modulo p: this is
+# several times faster than the field element objects of py_ecc
+_ProjectivePoint = Tuple[int, int, int]
+_AffinePoint = Tuple[int, int]
+_INFINITY: _ProjectivePoint = (1, 1, 0)
+
+
+def _double(point: _ProjectivePoint) -> _ProjectivePoint:
+    """
+    The doubling of py_ecc's `optimized_curve.double`, for a curve with a = 0.
+    """
+    x, y, z = point
+    p = field_modulus
+    W = 3 * x * x % p
+    S = y * z % p
+    B = x * y * S % p
+    H = (W * W - 8 * B) % p
+    S_squared = S * S % p
+    return 2 * H * S % p, (W * (4 * B - H) - 8 * y * y * S_squared) % p, 8 * S * S_squared % p
+
+
+def _add_affine(point: _ProjectivePoint, affine: _AffinePoint) -> _ProjectivePoint:
+    """
+    The addition of py_ecc's `optimized_curve.add`, where the second point is affine (z2 = 1).
+    """
+    x1, y1, z1 = point
+    if z1 == 0:
+        return affine[0], affine[1], 1
+    x2, y2 = affine
+    p = field_modulus
+    U = (y2 * z1 - y1) % p
+    V = (x2 * z1 - x1) % p
+    if V == 0:
+        return _double(point) if U == 0 else _INFINITY
+    V_squared = V * V % p
+    V_squared_times_V2 = V_squared * x1 % p
+    V_cubed = V * V_squared % p
+    A = (U * U * z1 - V_cubed - 2 * V_squared_times_V2) % p
+    return V * A % p, (U * (V_squared_times_V2 - A) - V_cubed * y1) % p, V_cubed * z1 % p
+
+
+def _batch_normalize(points: Sequence[_ProjectivePoint]) -> List[_AffinePoint]:
+    """
+    Return the affine coordinates of the (finite) points with a single field inversion (Montgomery's trick).
+    """
+    p = field_modulus
+    prefix_products = [1]
+    for _, _, z in points:
+        prefix_products.append(prefix_products[-1] * z % p)
+    inverse = pow(prefix_products[-1], -1, p)
+    affines: List[_AffinePoint] = []
+    for (x, y, z), prefix_product in zip(reversed(points), reversed(prefix_products[:-1])):
+        z_inverse = inverse * prefix_product % p
+        inverse = inverse * z % p
+        affines.append((x * z_inverse % p, y * z_inverse % p))
+    affines.reverse()
+    return affines
+
+
+class G1FixedBaseTable:
+    """
+    The affine points d * 2**(G1_WINDOW_BITS * i) * G1 for every window i and non-zero digit d, in the layout of the
+    cache file: a header, the points (as big-endian x and y coordinates) and the SHA256 checksum of what precedes it.
+    """
+    def __init__(self, buffer: Union[bytes, mmap.mmap]) -> None:
+        if len(buffer) != _TABLE_SIZE + _CHECKSUM_SIZE or buffer[:len(_HEADER)] != _HEADER:
+            raise ValueError("Invalid G1 fixed-base table.")
+        if sha256(buffer[:_TABLE_SIZE]).digest() != buffer[_TABLE_SIZE:]:
+            raise ValueError("Corrupted G1 fixed-base table.")
+        self._buffer = buffer
+
+    @classmethod
+    def build(cls) -> 'G1FixedBaseTable':
+        generator = normalize(G1)
+        base: _ProjectivePoint = (int(generator[0]), int(generator[1]), 1)
+        points: List[_ProjectivePoint] = []
+        for _ in range(G1_NUM_WINDOWS):
+            base_affine = _batch_normalize([base])[0]
+            multiple = base
+            points.append(multiple)
+            for _ in range(_ENTRIES_PER_WINDOW - 1):
+                multiple = _add_affine(multiple, base_affine)
+                points.append(multiple)
+            for _ in range(G1_WINDOW_BITS):
+                base = _double(base)
+        table = _HEADER + b''.join(
+            x.to_bytes(_COORDINATE_SIZE, 'big') + y.to_bytes(_COORDINATE_SIZE, 'big')
+            for x, y in _batch_normalize(points)
+        )
+        return cls(table + sha256(table).digest())
+
+    @classmethod
+    def from_file(cls, path: str) -> 'G1FixedBaseTable':
+        """
+        Load the table of a cache file. The checksum only catches an accidental corruption, so every point is also
+        checked to be on the curve.
+        """
+        with open(path, 'rb') as f:
+            # The mapping stays valid once the file is closed
+            table = cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        p = field_modulus
+        for window in range(G1_NUM_WINDOWS):
+            for digit in range(1, _ENTRIES_PER_WINDOW + 1):
+                x, y = table._entry(window, digit)
+                if x >= p or y >= p or (y * y - x * x * x - _CURVE_B) % p != 0:
+                    raise ValueError("Invalid point in the G1 fixed-base table.")
+        return table
+
+    def save(self, path: str) -> None:
+        """
+        Write the table to `path` atomically: it is written to a temporary file of its own (processes may save the
+        table at the same time) and then moved to `path`.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._buffer)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _entry(self, window: int, digit: int) -> _AffinePoint:
+        offset = len(_HEADER) + (window * _ENTRIES_PER_WINDOW + digit - 1) * _ENTRY_SIZE
+        return (int.from_bytes(self._buffer[offset:offset + _COORDINATE_SIZE], 'big'),
+                int.from_bytes(self._buffer[offset + _COORDINATE_SIZE:offset + _ENTRY_SIZE], 'big'))
+
+    def multiply(self, scalar: int) -> Optimized_Point3D[FQ]:
+        """
+        Return scalar * G1, as py_ecc's `multiply(G1, scalar)` does.
+        """
+        scalar %= curve_order
+        mask = 2**G1_WINDOW_BITS - 1
+        point = _INFINITY
+        for window in range(G1_NUM_WINDOWS):
+            digit = (scalar >> (window * G1_WINDOW_BITS)) & mask
+            if digit != 0:
+                point = _add_affine(point, self._entry(window, digit))
+        return FQ(point[0]), FQ(point[1]), FQ(point[2])
+
+
+_g1_table: Optional[G1FixedBaseTable] = None
+
+
+def get_g1_table() -> G1FixedBaseTable:
+    """
+    Return the table of this process: it is built on first use, or loaded from the cache file named by the
+    `STAKING_DEPOSIT_G1_TABLE_CACHE` environment variable (and saved there if that file is missing or invalid).
+    The cache is optional: if it can't be saved, the table is only kept in memory.
+    """
+    global _g1_table
+    if _g1_table is None:
+        cache_path = os.environ.get(G1_TABLE_CACHE_ENV_VAR)
+        if cache_path is None:
+            _g1_table = G1FixedBaseTable.build()
+        else:
+            try:
+                _g1_table = G1FixedBaseTable.from_file(cache_path)
+            except (OSError, ValueError):
+                _g1_table = G1FixedBaseTable.build()
+                try:
+                    _g1_table.save(cache_path)
+                except OSError:
+                    pass
+    return _g1_table
@@ -0,0 +1,258 @@
+"""
+Variable-base scalar multiplication in G2, for the signatures (Sign), with the GLS (GLV) endomorphism of BLS12-381.
+
+On G2, the untwist-Frobenius-twist endomorphism psi is the multiplication by the curve parameter x (a 64-bit
+integer), and it only costs a few field multiplications. A scalar k < r is written in base |x| as
+k = k0 + k1 * |x| + k2 * |x|**2 + k3 * |x|**3, so that k * P = sum(ki * (-psi)**i(P)): the four 64-bit scalars are
+recoded in wNAF and multiplied at once (interleaved), with about 64 doublings instead of 255.
+
+Like py_ecc's `multiply` (a double-and-add over the bits of the scalar), this is NOT constant-time: the wNAF digits,
+the table lookups and Python's integers all depend on the secret key. It doesn't leak more than py_ecc does, but
+only the `blst` backend protects the secret keys against timing side channels.
+Set the `STAKING_DEPOSIT_G2_MULTIPLY` environment variable to `py_ecc` to sign with py_ecc's `multiply` instead.
+"""
+import os
+from typing import (
+    List,
+    Sequence,
+    Tuple,
+)
+
+from py_ecc.fields import optimized_bls12_381_FQ2 as FQ2
+from py_ecc.optimized_bls12_381 import (
+    curve_order,
+    field_modulus,
+)
+from py_ecc.typing import Optimized_Point3D
+
+G2_MULTIPLY_ENV_VAR = 'STAKING_DEPOSIT_G2_MULTIPLY'
+GLV_MULTIPLY = 'glv'
+PY_ECC_MULTIPLY = 'py_ecc'
+
+# The BLS12-381 curve parameter x is negative
+X_ABS = 0xd201000000010000
+# The table of each of the four points holds its odd multiples up to 2**(G2_WNAF_WIDTH - 1) - 1
+G2_WNAF_WIDTH = 5
+
+# Elements a + b * i of FQ2 = FQ[i] / (i**2 + 1) as (a, b), and points in homogeneous projective coordinates
+# (x/z, y/z) or affine, over plain integers modulo p: this is several times faster than the FQ2 objects of py_ecc
+_FQ2 = Tuple[int, int]
+_ProjectivePoint = Tuple[_FQ2, _FQ2, _FQ2]
+_AffinePoint = Tuple[_FQ2, _FQ2]
+_ZERO: _FQ2 = (0, 0)
+_ONE: _FQ2 = (1, 0)
+_INFINITY: _ProjectivePoint = (_ONE, _ONE, _ZERO)
+
+# psi(x, y) = (conj(x) * _PSI_X, conj(y) * _PSI_Y), with _PSI_X = 1 / (1 + i)**((p - 1) / 3) and
+# _PSI_Y = 1 / (1 + i)**((p - 1) / 2), on the twist of py_ecc
+_PSI_X: _FQ2 = (
+    0,
+    0x1a0111ea397fe699ec02408663d4de85aa0d857d89759ad4897d29650fb85f9b409427eb4f49fffd8bfd00000000aaad,
+)
+_PSI_Y: _FQ2 = (
+    0x135203e60180a68ee2e9c448d77a2cd91c3dedd930b1cf60ef396489f61eb45e304466cf3e67fa0af1ee7b04121bdea2,
+    0x06af0e0437ff400b6831e36d6bd17ffe48395dabc2d3435e77f76e17009241c5ee67992f72ec05f4c81084fbede3cc09,
+)
+
+
+def _mul(a: _FQ2, b: _FQ2) -> _FQ2:
+    p = field_modulus
+    t0 = a[0] * b[0]
+    t1 = a[1] * b[1]
+    return (t0 - t1) % p, ((a[0] + a[1]) * (b[0] + b[1]) - t0 - t1) % p
+
+
+def _sqr(a: _FQ2) -> _FQ2:
+    p = field_modulus
+    return (a[0] + a[1]) * (a[0] - a[1]) % p, 2 * a[0] * a[1] % p
+
+
+def _sub(a: _FQ2, b: _FQ2) -> _FQ2:
+    p = field_modulus
+    return (a[0] - b[0]) % p, (a[1] - b[1]) % p
+
+
+def _scale(a: _FQ2, n: int) -> _FQ2:
+    p = field_modulus
+    return n * a[0] % p, n * a[1] % p
+
+
+def _inv(a: _FQ2) -> _FQ2:
+    p = field_modulus
+    norm_inverse = pow(a[0] * a[0] + a[1] * a[1], -1, p)
+    return a[0] * norm_inverse % p, -a[1] * norm_inverse % p
+
+
+def _double(point: _ProjectivePoint) -> _ProjectivePoint:
+    """
+    The doubling of py_ecc's `optimized_curve.double`, for a curve with a = 0.
+    """
+    x, y, z = point
+    W = _scale(_sqr(x), 3)
+    S = _mul(y, z)
+    B = _mul(_mul(x, y), S)
+    H = _sub(_sqr(W), _scale(B, 8))
+    S_squared = _sqr(S)
+    return (
+        _scale(_mul(H, S), 2),
+        _sub(_mul(W, _sub(_scale(B, 4), H)), _scale(_mul(_sqr(y), S_squared), 8)),
+        _scale(_mul(S, S_squared), 8),
+    )
+
+
+def _add(point1: _ProjectivePoint, point2: _ProjectivePoint) -> _ProjectivePoint:
+    """
+    The addition of py_ecc's `optimized_curve.add`.
+    """
+    x1, y1, z1 = point1
+    x2, y2, z2 = point2
+    if z1 == _ZERO:
+        return point2
+    if z2 == _ZERO:
+        return point1
+    U1 = _mul(y2, z1)
+    U2 = _mul(y1, z2)
+    V1 = _mul(x2, z1)
+    V2 = _mul(x1, z2)
+    if V1 == V2:
+        return _double(point1) if U1 == U2 else _INFINITY
+    U = _sub(U1, U2)
+    V = _sub(V1, V2)
+    V_squared = _sqr(V)
+    V_squared_times_V2 = _mul(V_squared, V2)
+    V_cubed = _mul(V, V_squared)
+    W = _mul(z1, z2)
+    A = _sub(_sub(_mul(_sqr(U), W), V_cubed), _scale(V_squared_times_V2, 2))
+    return (
+        _mul(V, A),
+        _sub(_mul(U, _sub(V_squared_times_V2, A)), _mul(V_cubed, U2)),
+        _mul(V_cubed, W),
+    )
+
+
+def _add_affine(point: _ProjectivePoint, affine: _AffinePoint) -> _ProjectivePoint:
+    """
+    The addition of py_ecc's `optimized_curve.add`, where the second point is affine (z2 = 1).
+    """
+    x1, y1, z1 = point
+    if z1 == _ZERO:
+        return affine[0], affine[1], _ONE
+    x2, y2 = affine
+    U = _sub(_mul(y2, z1), y1)
+    V = _sub(_mul(x2, z1), x1)
+    if V == _ZERO:
+        return _double(point) if U == _ZERO else _INFINITY
+    V_squared = _sqr(V)
+    V_squared_times_V2 = _mul(V_squared, x1)
+    V_cubed = _mul(V, V_squared)
+    A = _sub(_sub(_mul(_sqr(U), z1), V_cubed), _scale(V_squared_times_V2, 2))
+    return (
+        _mul(V, A),
+        _sub(_mul(U, _sub(V_squared_times_V2, A)), _mul(V_cubed, y1)),
+        _mul(V_cubed, z1),
+    )
+
+
+def _batch_normalize(points: Sequence[_ProjectivePoint]) -> List[_AffinePoint]:
+    """
+    Return the affine coordinates of the (finite) points with a single field inversion (Montgomery's trick).
+    """
+    prefix_products = [_ONE]
+    for _, _, z in points:
+        prefix_products.append(_mul(prefix_products[-1], z))
+    inverse = _inv(prefix_products[-1])
+    affines: List[_AffinePoint] = []
+    for (x, y, z), prefix_product in zip(reversed(points), reversed(prefix_products[:-1])):
+        z_inverse = _mul(inverse, prefix_product)
+        inverse = _mul(inverse, z)
+        affines.append((_mul(x, z_inverse), _mul(y, z_inverse)))
+    affines.reverse()
+    return affines
+
+
+def _psi(affine: _AffinePoint) -> _AffinePoint:
+    """
+    Return psi(P) = x * P, for a point P of G2.
+    """
+    p = field_modulus
+    x, y = affine
+    return _mul((x[0], -x[1] % p), _PSI_X), _mul((y[0], -y[1] % p), _PSI_Y)
+
+
+def _neg(affine: _AffinePoint) -> _AffinePoint:
+    return affine[0], _sub(_ZERO, affine[1])
+
+
+def _wnaf(scalar: int, width: int) -> List[int]:
+    """
+    Return the width-`width` NAF digits of the non-negative `scalar`, least significant first: every non-zero digit
+    is odd, smaller than 2**(width - 1) in absolute value, and followed by at least `width - 1` zeros.
+    """
+    digits = []
+    while scalar > 0:
+        if scalar & 1:
+            digit = scalar & (2**width - 1)
+            if digit >= 2**(width - 1):
+                digit -= 2**width
+            scalar -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        scalar >>= 1
+    return digits
+
+
+def decompose_scalar(scalar: int) -> Tuple[int, int, int, int]:
+    """
+    Return the base-|x| digits (k0, k1, k2, k3) of `scalar` modulo r, each smaller than 2**64.
+    """
+    scalar %= curve_order
+    digits = []
+    for _ in range(4):
+        scalar, digit = divmod(scalar, X_ABS)
+        digits.append(digit)
+    assert scalar == 0  # r < |x|**4
+    return digits[0], digits[1], digits[2], digits[3]
+
+
+def multiply_G2(point: Optimized_Point3D[FQ2], scalar: int) -> Optimized_Point3D[FQ2]:
+    """
+    Return scalar * point for a `point` of G2 (eg. a message hashed to G2), as py_ecc's `multiply(point, scalar)` does.
+    """
+    x, y, z = ((int(c.coeffs[0]), int(c.coeffs[1])) for c in point)
+    if z == _ZERO or scalar % curve_order == 0:
+        return FQ2.one(), FQ2.one(), FQ2.zero()
+
+    # The odd multiples P, 3P, 5P... of the point, then those of psi(P), psi**2(P) and psi**3(P)
+    base: _ProjectivePoint = (x, y, z)
+    twice_base = _double(base)
+    multiples = [base]
+    for _ in range(2**(G2_WNAF_WIDTH - 2) - 1):
+        multiples.append(_add(multiples[-1], twice_base))
+    tables = [_batch_normalize(multiples)]
+    for _ in range(3):
+        tables.append([_psi(affine) for affine in tables[-1]])
+
+    # |x|**i * P = (-1)**i * psi**i(P), so the digits of the odd powers are negated
+    wnafs = [[(-digit if i % 2 else digit) for digit in _wnaf(k, G2_WNAF_WIDTH)]
+             for i, k in enumerate(decompose_scalar(scalar))]
+    result = _INFINITY
+    for position in reversed(range(max(len(wnaf) for wnaf in wnafs))):
+        result = _double(result)
+        for wnaf, table in zip(wnafs, tables):
+            if position < len(wnaf) and wnaf[position] != 0:
+                digit = wnaf[position]
+                affine = table[abs(digit) // 2]
+                result = _add_affine(result, affine if digit > 0 else _neg(affine))
+    return FQ2(result[0]), FQ2(result[1]), FQ2(result[2])
+
+
+def use_glv_multiply() -> bool:
+    """
+    Whether the py_ecc backend signs with `multiply_G2`, unless the `STAKING_DEPOSIT_G2_MULTIPLY` environment
+    variable is `py_ecc`.
+    """
+    method = os.environ.get(G2_MULTIPLY_ENV_VAR, GLV_MULTIPLY)
+    if method not in (GLV_MULTIPLY, PY_ECC_MULTIPLY):
+        raise ValueError(f"Unknown G2 multiplication {method!r}. Expected one of {[GLV_MULTIPLY, PY_ECC_MULTIPLY]}.")
+    return method == GLV_MULTIPLY
@@ -0,0 +1,110 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from staking_deposit.exceptions import ValidationError
+from staking_deposit.key_handling.keystore import Keystore
+from staking_deposit.utils.intl import load_text
+
+JOURNAL_FILE_NAME = 'deposit_cli_journal.jsonl'
+JOURNAL_VERSION = 1
+
+
+class KeyGenerationJournal:
+    """
+    An append-only (JSON lines) journal of a key generation run, kept in its output folder.
+    The first line holds the parameters of the run and every following line records an index whose keystore
+    and deposit datum have been written and verified, along with that (public) deposit datum. The journal
+    never holds any secret, and is removed once the run has completed.
+    """
+    def __init__(self, filefolder: str, parameters: Dict[str, Any], completed: List[Dict[str, Any]],
+                 resumed: bool=False) -> None:
+        self.filefolder = filefolder
+        self.parameters = parameters
+        self.completed = completed
+        # Whether this journal is that of an interrupted run
+        self.resumed = resumed
+
+    @classmethod
+    def open(cls, folder: str, parameters: Dict[str, Any], *, resume: bool) -> 'KeyGenerationJournal':
+        """
+        Start a journal for a run with `parameters` in `folder`, or, with `resume`, pick up the journal of the
+        interrupted run with the same `parameters`.
+        """
+        filefolder = os.path.join(folder, JOURNAL_FILE_NAME)
+        parameters = {'version': JOURNAL_VERSION, **parameters}
+        if not os.path.exists(filefolder):
+            journal = cls(filefolder, parameters, [])
+        elif not resume:
+            raise ValidationError(load_text(['err_unfinished_run']) % filefolder)
+        else:
+            journal_parameters, completed = cls._read(filefolder)
+            if journal_parameters != parameters:
+                raise ValidationError(load_text(['err_parameters_mismatch']) % filefolder)
+            for entry in completed:
+                if not os.path.exists(os.path.join(folder, entry['keystore'])):
+                    raise ValidationError(load_text(['err_missing_keystore']) % entry['keystore'])
+            journal = cls(filefolder, parameters, completed, resumed=True)
+        # (Re)write the journal so that a line cut short by a crash doesn't precede the new entries
+        journal._rewrite()
+        return journal
+
+    def verify_keystore_password(self, password: str) -> None:
+        """
+        Check that the keystores recorded by the interrupted run open with `password`, so that a resumed run doesn't
+        encrypt its remaining keystores with another password. Only the last of them is decrypted.
+        """
+        if len(self.completed) == 0:
+            return
+        keystore_file = self.completed[-1]['keystore']
+        keystore = Keystore.from_file(os.path.join(os.path.dirname(self.filefolder), keystore_file))
+        try:
+            keystore.decrypt(password)
+        except ValueError:
+            raise ValidationError(load_text(['err_keystore_password']) % keystore_file)
+
+    @staticmethod
+    def _read(filefolder: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        lines = []
+        with open(filefolder, 'r') as f:
+            for line in f:
+                try:
+                    lines.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break  # The run was interrupted while this line was written
+        if len(lines) == 0:
+            return None, []
+        return lines[0], lines[1:]
+
+    def _rewrite(self) -> None:
+        tmp_filefolder = self.filefolder + '.tmp'
+        with open(tmp_filefolder, 'w') as f:
+            for line in [self.parameters, *self.completed]:
+                f.write(json.dumps(line) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filefolder, self.filefolder)
+
+    @property
+    def next_index(self) -> int:
+        return int(self.parameters['start_index']) + len(self.completed)
+
+    @property
+    def deposit_data(self) -> List[Dict[str, Any]]:
+        return [entry['deposit_datum'] for entry in self.completed]
+
+    def record(self, *, index: int, keystore: str, deposit_datum: Dict[str, Any]) -> None:
+        """
+        Record that the keystore (file name) and deposit datum of `index` have been written and verified.
+        """
+        if index != self.next_index:
+            raise ValueError(f"Expected index {self.next_index} to be recorded next. Got {index}.")
+        entry = {'index': index, 'keystore': keystore, 'deposit_datum': deposit_datum}
+        with open(self.filefolder, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.completed.append(entry)
+
+    def remove(self) -> None:
+        os.remove(self.filefolder)
@@ -0,0 +1,78 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+from multiprocessing.synchronize import Event
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Number of chunks handed to each worker so that the progress bar advances regularly
+# and slow chunks don't leave the other workers idle at the end of a run.
+CHUNKS_PER_WORKER = 4
+
+# Largest chunk handed to a worker when its results are streamed, which bounds the number of keys held in memory.
+MAX_STREAMING_CHUNK_SIZE = 32
+
+
+def split_into_chunks(items: Sequence[T], num_chunks: int) -> List[Sequence[T]]:
+    """
+    Splits `items` into at most `num_chunks` contiguous, non-empty chunks of (nearly) equal size.
+    The chunks preserve the order of `items`, so concatenating them yields `items` again.
+    """
+    if num_chunks < 1:
+        raise ValueError(f"`num_chunks` should be greater than or equal to 1. Got {num_chunks}.")
+    chunk_size = -(-len(items) // num_chunks)  # ceil division
+    if chunk_size == 0:
+        return []
+    return [items[i: i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+_worker_stop_event: Optional[Event] = None
+
+
+def _init_search_worker(stop_event: Event, initializer: Optional[Callable[..., None]],
+                        initargs: Tuple[Any, ...]) -> None:
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def search_stopped() -> bool:
+    """
+    In a task of `iter_search_results`: whether the search is over, so that the task can return early.
+    """
+    return _worker_stop_event is not None and _worker_stop_event.is_set()
+
+
+def iter_search_results(function: Callable[..., R], tasks: Sequence[Dict[str, Any]], *, num_workers: int,
+                        initializer: Optional[Callable[..., None]]=None,
+                        initargs: Tuple[Any, ...]=()) -> Generator[Tuple[int, R], None, None]:
+    """
+    Run `function(**task)` for each of the `tasks` in a process pool and yield the number of each task along with
+    its result, as they complete. Once the caller stops iterating (and closes the generator, eg. with
+    `contextlib.closing`), the running tasks are told to stop through `search_stopped` and the pending ones are
+    dropped. `initializer(*initargs)` is run in every worker.
+    """
+    stop_event = multiprocessing.Event()
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_search_worker,
+                             initargs=(stop_event, initializer, initargs)) as executor:
+        futures = {executor.submit(function, **task): task_number for task_number, task in enumerate(tasks)}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Stop the running tasks and drop the pending ones
+            stop_event.set()
+            for future in futures:
+                future.cancel()
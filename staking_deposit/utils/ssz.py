@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from ssz import (
     ByteVector,
     Serializable,
@@ -16,6 +18,9 @@ from staking_deposit.utils.constants import (
 bytes8 = ByteVector(8)
 bytes20 = ByteVector(20)
 
+# There is a single fork data root per chain (and one more for its deposits), so a few entries are enough
+FORK_DATA_ROOT_CACHE_SIZE = 64
+
 
 # Crypto Domain SSZ
 
@@ -39,6 +44,14 @@ def compute_fork_data_root(current_version: bytes, genesis_validators_root: byte
     """
     if len(current_version) != 4:
         raise ValueError(f"Fork version should be in 4 bytes. Got {len(current_version)}.")
+    return _compute_fork_data_root(bytes(current_version), bytes(genesis_validators_root))
+
+
+@lru_cache(maxsize=FORK_DATA_ROOT_CACHE_SIZE)
+def _compute_fork_data_root(current_version: bytes, genesis_validators_root: bytes) -> bytes:
+    """
+    The ForkData root is the same for every deposit or BLSToExecutionChange of a chain, so it is only hashed once.
+    """
     return ForkData(
         current_version=current_version,
         genesis_validators_root=genesis_validators_root,
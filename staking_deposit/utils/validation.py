@@ -1,7 +1,7 @@
 import click
 import json
 import re
-from typing import Any, Dict, Sequence
+from typing import Any, Dict, Sequence, Tuple
 
 from eth_typing import (
     BLSPubkey,
@@ -9,9 +9,9 @@ from eth_typing import (
     HexAddress,
 )
 from eth_utils import is_hex_address, is_checksum_address, to_normalized_address, decode_hex
-from py_ecc.bls import G2ProofOfPossession as bls
 
 from staking_deposit.exceptions import ValidationError
+from staking_deposit.utils import bls
 from staking_deposit.utils.intl import load_text
 from staking_deposit.utils.ssz import (
     BLSToExecutionChange,
@@ -41,26 +41,73 @@ from staking_deposit.settings import BaseChainSetting
 def verify_deposit_data_json(filefolder: str, credentials: Sequence[Credential]) -> bool:
     """
     Validate every deposit found in the deposit-data JSON file folder.
+    The deposit signatures are checked together, with a batch verification.
     """
     with open(filefolder, 'r') as f:
         deposit_json = json.load(f)
-        with click.progressbar(deposit_json, label=load_text(['msg_deposit_verification']),
-                               show_percent=False, show_pos=True) as deposits:
-            return all([validate_deposit(deposit, credential) for deposit, credential in zip(deposits, credentials)])
-    return False
+    deposits_credentials = list(zip(deposit_json, credentials))
+    with click.progressbar(deposits_credentials, label=load_text(['msg_deposit_verification']),
+                           show_percent=False, show_pos=True) as bar:
+        if not all([validate_deposit(deposit, credential, verify_signature=False) for deposit, credential in bar]):
+            return False
+    return verify_deposit_signatures(deposit_json)
+
+
+def _verify_signatures(signature_inputs: Sequence[Tuple[BLSPubkey, bytes, BLSSignature]]) -> bool:
+    """
+    Batch verify the (pubkey, signing root, signature) triples, and report the pubkeys of the invalid signatures.
+    """
+    if len(signature_inputs) == 0:
+        return True
+    pubkeys, signing_roots, signatures = zip(*signature_inputs)
+    invalid_signatures = bls.find_invalid_signatures(pubkeys, signing_roots, signatures)
+    for position in invalid_signatures:
+        click.echo(load_text(['msg_invalid_signature']) % pubkeys[position].hex())
+    return len(invalid_signatures) == 0
+
 
+def verify_deposit_signatures(deposit_data: Sequence[Dict[str, Any]]) -> bool:
+    """
+    Batch verify the signatures of the (JSON encoded) `deposit_data`, whose other fields were validated
+    with `validate_deposit(..., verify_signature=False)`.
+    """
+    return _verify_signatures([_deposit_signature_inputs(deposit) for deposit in deposit_data])
 
-def validate_deposit(deposit_data_dict: Dict[str, Any], credential: Credential) -> bool:
+
+def verify_saved_deposit_data_json(filefolder: str, deposit_data: Sequence[Dict[str, Any]]) -> bool:
+    """
+    Check that the deposit-data JSON file holds exactly the (already validated) `deposit_data`.
+    """
+    with open(filefolder, 'r') as f:
+        return json.load(f) == list(deposit_data)
+
+
+def _deposit_signature_inputs(deposit_data_dict: Dict[str, Any]) -> Tuple[BLSPubkey, bytes, BLSSignature]:
+    """
+    Return the pubkey, signing root and signature that the signature of a deposit is verified with.
+    """
+    pubkey = BLSPubkey(bytes.fromhex(deposit_data_dict['pubkey']))
+    withdrawal_credentials = bytes.fromhex(deposit_data_dict['withdrawal_credentials'])
+    amount = deposit_data_dict['amount']
+    signature = BLSSignature(bytes.fromhex(deposit_data_dict['signature']))
+    fork_version = bytes.fromhex(deposit_data_dict['fork_version'])
+    deposit_message = DepositMessage(pubkey=pubkey, withdrawal_credentials=withdrawal_credentials, amount=amount)
+    domain = compute_deposit_domain(fork_version)
+    return pubkey, compute_signing_root(deposit_message, domain), signature
+
+
+def validate_deposit(deposit_data_dict: Dict[str, Any], credential: Credential, *,
+                     verify_signature: bool=True) -> bool:
     '''
     Checks whether a deposit is valid based on the staking deposit rules.
     https://github.com/ethereum/consensus-specs/blob/dev/specs/phase0/beacon-chain.md#deposits
+    Without `verify_signature`, the caller is left to verify the deposit signature (eg. in a batch).
     '''
     pubkey = BLSPubkey(bytes.fromhex(deposit_data_dict['pubkey']))
     withdrawal_credentials = bytes.fromhex(deposit_data_dict['withdrawal_credentials'])
     amount = deposit_data_dict['amount']
     signature = BLSSignature(bytes.fromhex(deposit_data_dict['signature']))
     deposit_message_root = bytes.fromhex(deposit_data_dict['deposit_data_root'])
-    fork_version = bytes.fromhex(deposit_data_dict['fork_version'])
 
     # Verify pubkey
     if len(pubkey) != 48:
@@ -89,10 +136,7 @@ def validate_deposit(deposit_data_dict: Dict[str, Any], credential: Credential)
         return False
 
     # Verify deposit signature && pubkey
-    deposit_message = DepositMessage(pubkey=pubkey, withdrawal_credentials=withdrawal_credentials, amount=amount)
-    domain = compute_deposit_domain(fork_version)
-    signing_root = compute_signing_root(deposit_message, domain)
-    if not bls.Verify(pubkey, signing_root, signature):
+    if verify_signature and not bls.Verify(*_deposit_signature_inputs(deposit_data_dict)):
         return False
 
     # Verify Deposit Root
@@ -149,20 +193,45 @@ def verify_bls_to_execution_change_json(filefolder: str,
                                         chain_setting: BaseChainSetting) -> bool:
     """
     Validate every BLSToExecutionChange found in the bls_to_execution_change JSON file folder.
+    The signatures are checked together, with a batch verification.
     """
     with open(filefolder, 'r') as f:
         btec_json = json.load(f)
-        with click.progressbar(btec_json, label=load_text(['msg_bls_to_execution_change_verification']),
-                               show_percent=False, show_pos=True) as btecs:
-            return all([
-                validate_bls_to_execution_change(
-                    btec, credential,
-                    input_validator_index=input_validator_index,
-                    input_execution_address=input_execution_address,
-                    chain_setting=chain_setting)
-                for btec, credential, input_validator_index in zip(btecs, credentials, input_validator_indices)
-            ])
-    return False
+    btecs_credentials = list(zip(btec_json, credentials, input_validator_indices))
+    with click.progressbar(btecs_credentials, label=load_text(['msg_bls_to_execution_change_verification']),
+                           show_percent=False, show_pos=True) as bar:
+        if not all([
+            validate_bls_to_execution_change(
+                btec, credential,
+                input_validator_index=input_validator_index,
+                input_execution_address=input_execution_address,
+                chain_setting=chain_setting,
+                verify_signature=False)
+            for btec, credential, input_validator_index in bar
+        ]):
+            return False
+    signature_inputs = [_bls_to_execution_change_signature_inputs(btec, chain_setting)
+                        for btec, _, _ in btecs_credentials]
+    return _verify_signatures(signature_inputs)
+
+
+def _bls_to_execution_change_signature_inputs(
+        btec_dict: Dict[str, Any], chain_setting: BaseChainSetting) -> Tuple[BLSPubkey, bytes, BLSSignature]:
+    """
+    Return the pubkey, signing root and signature that the signature of a BLSToExecutionChange is verified with.
+    """
+    from_bls_pubkey = BLSPubkey(decode_hex(btec_dict['message']['from_bls_pubkey']))
+    message = BLSToExecutionChange(
+        validator_index=int(btec_dict['message']['validator_index']),
+        from_bls_pubkey=from_bls_pubkey,
+        to_execution_address=decode_hex(btec_dict['message']['to_execution_address']),
+    )
+    domain = compute_bls_to_execution_change_domain(
+        fork_version=chain_setting.GENESIS_FORK_VERSION,
+        genesis_validators_root=decode_hex(btec_dict['metadata']['genesis_validators_root']),
+    )
+    signature = BLSSignature(decode_hex(btec_dict['signature']))
+    return from_bls_pubkey, compute_signing_root(message, domain), signature
 
 
 def validate_bls_to_execution_change(btec_dict: Dict[str, Any],
@@ -170,11 +239,11 @@ def validate_bls_to_execution_change(btec_dict: Dict[str, Any],
                                      *,
                                      input_validator_index: int,
                                      input_execution_address: str,
-                                     chain_setting: BaseChainSetting) -> bool:
+                                     chain_setting: BaseChainSetting,
+                                     verify_signature: bool=True) -> bool:
     validator_index = int(btec_dict['message']['validator_index'])
     from_bls_pubkey = BLSPubkey(decode_hex(btec_dict['message']['from_bls_pubkey']))
     to_execution_address = decode_hex(btec_dict['message']['to_execution_address'])
-    signature = BLSSignature(decode_hex(btec_dict['signature']))
     genesis_validators_root = decode_hex(btec_dict['metadata']['genesis_validators_root'])
 
     if validator_index != input_validator_index:
@@ -189,18 +258,8 @@ def validate_bls_to_execution_change(btec_dict: Dict[str, Any],
     if genesis_validators_root != chain_setting.GENESIS_VALIDATORS_ROOT:
         return False
 
-    message = BLSToExecutionChange(
-        validator_index=validator_index,
-        from_bls_pubkey=from_bls_pubkey,
-        to_execution_address=to_execution_address,
-    )
-    domain = compute_bls_to_execution_change_domain(
-        fork_version=chain_setting.GENESIS_FORK_VERSION,
-        genesis_validators_root=genesis_validators_root,
-    )
-    signing_root = compute_signing_root(message, domain)
-
-    if not bls.Verify(BLSPubkey(credential.withdrawal_pk), signing_root, signature):
+    # The pubkey the signature is verified with has been checked to be the credential's withdrawal pubkey
+    if verify_signature and not bls.Verify(*_bls_to_execution_change_signature_inputs(btec_dict, chain_setting)):
         return False
 
     return True
@@ -255,6 +314,32 @@ def validate_bls_withdrawal_credentials_list(input_bls_withdrawal_credentials_li
     return [validate_bls_withdrawal_credentials(cred) for cred in bls_withdrawal_credentials_list]
 
 
+def validate_pubkey_or_bls_withdrawal_credentials(pubkey_or_bls_withdrawal_credentials: str) -> bytes:
+    target = normalize_bls_withdrawal_credentials_to_bytes(pubkey_or_bls_withdrawal_credentials)
+    if len(target) == 48:
+        return target
+    if len(target) != 32:
+        raise ValidationError(load_text(['err_not_pubkey_or_bls_form']) + '\n')
+    return validate_bls_withdrawal_credentials(pubkey_or_bls_withdrawal_credentials)
+
+
+def validate_pubkeys_or_bls_withdrawal_credentials_list(input_list: str) -> Sequence[bytes]:
+    normalized_list = normalize_input_list(input_list)
+    return [validate_pubkey_or_bls_withdrawal_credentials(item) for item in normalized_list]
+
+
+def validate_pubkey(pubkey: str) -> bytes:
+    pubkey_bytes = normalize_bls_withdrawal_credentials_to_bytes(pubkey)
+    if len(pubkey_bytes) != 48:
+        raise ValidationError(load_text(['err_not_pubkey']) + '\n')
+    return pubkey_bytes
+
+
+def validate_pubkeys_list(input_list: str) -> Sequence[bytes]:
+    normalized_list = normalize_input_list(' '.join(input_list.split()))
+    return [validate_pubkey(item) for item in normalized_list if item != '']
+
+
 def validate_validator_indices(input_validator_indices: str) -> Sequence[int]:
 
     normalized_list = normalize_input_list(input_validator_indices)
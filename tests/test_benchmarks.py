@@ -0,0 +1,45 @@
+from functools import partial
+
+from benchmarks.bench_key_derivation import (
+    LAMPORT_CHUNK_SIZE,
+    LAMPORT_DATA,
+    VALIDATOR_PATHS,
+    SHA256_each_chunk,
+    run_benchmarks,
+    summarize,
+    time_function,
+)
+from staking_deposit.utils.crypto import SHA256_chunks
+
+
+def test_summarize() -> None:
+    summary = summarize([0.004, 0.001, 0.002, 0.003])
+    assert summary['iterations'] == 4
+    assert summary['ops_per_sec'] == 4 / 0.01
+    assert summary['min_ms'] == 1
+    assert summary['p50_ms'] == 2
+    assert summary['p99_ms'] == summary['max_ms'] == 4
+
+
+def test_run_benchmarks() -> None:
+    results = run_benchmarks(iterations=1, warmup=0)['results']
+    assert set(results) == {
+        'get_seed',
+        'derive_master_SK',
+        'derive_child_SK',
+        '_parent_SK_to_lamport_PK',
+        'SHA256_chunks',
+        'SHA256_each_chunk',
+        *(f'mnemonic_and_path_to_key[{path}]' for path in VALIDATOR_PATHS),
+    }
+
+
+def test_SHA256_chunks_speedup() -> None:
+    assert SHA256_chunks(data=LAMPORT_DATA, chunk_size=LAMPORT_CHUNK_SIZE) \
+        == SHA256_each_chunk(data=LAMPORT_DATA, chunk_size=LAMPORT_CHUNK_SIZE)
+    bulk, each = (
+        time_function(partial(function, data=LAMPORT_DATA, chunk_size=LAMPORT_CHUNK_SIZE), iterations=20, warmup=2)
+        for function in (SHA256_chunks, SHA256_each_chunk)
+    )
+    # The bulk hashing is about 10x faster, only a speedup is asserted to keep the test stable
+    assert bulk['p50_ms'] < each['p50_ms']
@@ -0,0 +1,107 @@
+import os
+
+from click.testing import CliRunner
+from py_ecc.bls import G2ProofOfPossession as bls
+
+from staking_deposit.deposit import cli
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+
+MNEMONIC = 'sister protect peanut hill ready work profit fit wish want small inflict flip member tail between sick setup bright duck morning sell paper worry'  # noqa: E501
+ABBREVIATED_MNEMONIC = ' '.join(word[:4] for word in MNEMONIC.split(' '))
+OTHER_MNEMONIC = 'legal winner thank year wave sausage worth useful legal winner thank yellow'
+INVALID_MNEMONIC = 'legal winner thank year wave sausage worth useful legal winner thank thank'
+
+
+def signing_pubkey(mnemonic: str, index: int) -> str:
+    with DerivationContext(mnemonic=mnemonic, password='') as derivation_context:
+        return '0x' + bls.SkToPk(derivation_context.derive_key(f'm/12381/3600/{index}/0/0')).hex()
+
+
+def write_audit_files(tmp_path: str) -> None:
+    with open(os.path.join(tmp_path, 'mnemonics.txt'), 'w') as f:
+        f.write('\n'.join(['# escrowed mnemonics', MNEMONIC, '', ABBREVIATED_MNEMONIC, OTHER_MNEMONIC,
+                           INVALID_MNEMONIC]) + '\n')
+    with open(os.path.join(tmp_path, 'pubkeys.txt'), 'w') as f:
+        f.write('\n'.join([signing_pubkey(MNEMONIC, 0), signing_pubkey(MNEMONIC, 1) + ',',
+                           signing_pubkey(OTHER_MNEMONIC, 0)]) + '\n')
+
+
+def run_audit(tmp_path: str, *extra_arguments: str, input: str=None) -> str:
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'audit-mnemonics',
+        '--expected_pubkeys', os.path.join(tmp_path, 'pubkeys.txt'),
+        '--num_keys', '2',
+        *extra_arguments,
+    ]
+    result = runner.invoke(cli, arguments, input=input)
+    assert result.exit_code == 1
+    return result.output
+
+
+def test_audit_mnemonics(tmp_path: str) -> None:
+    write_audit_files(tmp_path)
+    output = run_audit(tmp_path, '--mnemonics_file', os.path.join(tmp_path, 'mnemonics.txt'))
+    assert 'Line 2: OK - all 2 public keys are expected' in output
+    assert 'Line 4: OK - all 2 public keys are expected' in output
+    assert 'Line 5: MISMATCH - 1 of 2 public keys are expected, unexpected indices: 1' in output
+    assert 'Line 6: INVALID' in output
+    assert 'Audited 4 mnemonic(s): 2 OK, 1 mismatched, 1 invalid.' in output
+    # The mnemonics themselves are never echoed
+    assert 'sister' not in output
+
+
+def test_audit_mnemonics_stdin_num_workers(tmp_path: str) -> None:
+    write_audit_files(tmp_path)
+    with open(os.path.join(tmp_path, 'mnemonics.txt')) as f:
+        mnemonics = f.read()
+    sequential_output = run_audit(tmp_path, '--mnemonics_file', '-', input=mnemonics)
+    parallel_output = run_audit(tmp_path, '--mnemonics_file', '-', '--num_workers', '2', input=mnemonics)
+    assert parallel_output == sequential_output
+    assert 'Audited 4 mnemonic(s): 2 OK, 1 mismatched, 1 invalid.' in parallel_output
+
+
+def test_audit_mnemonics_all_ok(tmp_path: str) -> None:
+    write_audit_files(tmp_path)
+    with open(os.path.join(tmp_path, 'mnemonics.txt'), 'w') as f:
+        f.write(MNEMONIC + '\n')
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'audit-mnemonics',
+        '--mnemonics_file', os.path.join(tmp_path, 'mnemonics.txt'),
+        '--expected_pubkeys', os.path.join(tmp_path, 'pubkeys.txt'),
+        '--num_keys', '2',
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    assert 'Audited 1 mnemonic(s): 1 OK, 0 mismatched, 0 invalid.' in result.output
+
+
+def test_audit_mnemonics_invalid_expected_pubkeys(tmp_path: str) -> None:
+    write_audit_files(tmp_path)
+    with open(os.path.join(tmp_path, 'pubkeys.txt'), 'w') as f:
+        f.write('0x1234\n')
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'audit-mnemonics',
+        '--mnemonics_file', os.path.join(tmp_path, 'mnemonics.txt'),
+        '--expected_pubkeys', os.path.join(tmp_path, 'pubkeys.txt'),
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 2
+    assert 'not a 48-byte validator public key' in result.output
+
+
+def test_audit_mnemonics_mnemonic_password(tmp_path: str) -> None:
+    write_audit_files(tmp_path)
+    # The expected public keys were derived without a mnemonic password
+    output = run_audit(tmp_path, '--mnemonics_file', os.path.join(tmp_path, 'mnemonics.txt'),
+                       '--mnemonic-password', 'TREZOR')
+    assert 'Line 2: MISMATCH' in output
+    assert 'Audited 4 mnemonic(s): 0 OK, 3 mismatched, 1 invalid.' in output
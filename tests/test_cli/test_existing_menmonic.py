@@ -6,9 +6,13 @@ import pytest
 from click.testing import CliRunner
 
 from eth_utils import decode_hex
+from py_ecc.bls.hash_to_curve import hash_to_G2
 
+from staking_deposit.credentials import Credential
 from staking_deposit.deposit import cli
+from staking_deposit.utils import bls
 from staking_deposit.utils.constants import DEFAULT_VALIDATOR_KEYS_FOLDER_NAME, ETH1_ADDRESS_WITHDRAWAL_PREFIX
+from staking_deposit.utils.journal import JOURNAL_FILE_NAME
 from .helpers import clean_key_folder, get_permissions, get_uuid
 
 
@@ -167,6 +171,215 @@ def test_existing_mnemonic_eth1_address_withdrawal_bad_checksum() -> None:
     clean_key_folder(my_folder_path)
 
 
+def test_existing_mnemonic_num_workers() -> None:
+    # Prepare folder
+    my_folder_path = os.path.join(os.getcwd(), 'TESTING_TEMP_FOLDER')
+    clean_key_folder(my_folder_path)
+    if not os.path.exists(my_folder_path):
+        os.mkdir(my_folder_path)
+
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'existing-mnemonic',
+        '--num_validators', '2',
+        '--mnemonic', 'abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about',
+        '--validator_start_index', '1',
+        '--chain', 'mainnet',
+        '--keystore_password', 'MyPassword',
+        '--folder', my_folder_path,
+        '--num_workers', '2',
+    ]
+    result = runner.invoke(cli, arguments)
+
+    assert result.exit_code == 0
+
+    # Check files
+    validator_keys_folder_path = os.path.join(my_folder_path, DEFAULT_VALIDATOR_KEYS_FOLDER_NAME)
+    _, _, key_files = next(os.walk(validator_keys_folder_path))
+    keystore_files = [key_file for key_file in key_files if key_file.startswith('keystore')]
+    assert len(keystore_files) == 2
+    assert any('m_12381_3600_1_0_0' in key_file for key_file in keystore_files)
+    assert any('m_12381_3600_2_0_0' in key_file for key_file in keystore_files)
+
+    # Clean up
+    clean_key_folder(my_folder_path)
+
+
+def test_existing_mnemonic_hashes_each_deposit_once(tmp_path, monkeypatch) -> None:
+    # The py_ecc backend, whose hashes to G2 are counted in every process (the workers are forked)
+    monkeypatch.setenv(bls.BLS_BACKEND_ENV_VAR, 'py_ecc')
+    monkeypatch.setattr(bls, '_backend', None)
+    bls._hash_to_G2.cache_clear()
+    hash_log_path = os.path.join(tmp_path, 'hash_to_G2.log')
+
+    def logged_hash_to_G2(*args):
+        with open(hash_log_path, 'a') as f:
+            f.write('hash\n')
+        return hash_to_G2(*args)
+
+    monkeypatch.setattr(bls, 'hash_to_G2', logged_hash_to_G2)
+
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'existing-mnemonic',
+        '--num_validators', '3',
+        '--mnemonic', 'abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about',
+        '--validator_start_index', '0',
+        '--chain', 'mainnet',
+        '--keystore_password', 'MyPassword',
+        '--folder', str(tmp_path),
+        '--num_workers', '2',
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    # Each deposit was hashed once to be both signed and verified
+    with open(hash_log_path) as f:
+        assert len(f.readlines()) == 3
+    bls._hash_to_G2.cache_clear()
+
+
+def test_existing_mnemonic_resume(monkeypatch) -> None:
+    # Prepare folders
+    my_folder_path = os.path.join(os.getcwd(), 'TESTING_TEMP_FOLDER')
+    reference_folder_path = os.path.join(os.getcwd(), 'TESTING_TEMP_FOLDER_REFERENCE')
+    for folder_path in (my_folder_path, reference_folder_path):
+        clean_key_folder(folder_path)
+        if not os.path.exists(folder_path):
+            os.mkdir(folder_path)
+
+    def arguments(folder_path, *extra_arguments):
+        return [
+            '--language', 'english',
+            '--non_interactive',
+            'existing-mnemonic',
+            '--num_validators', '3',
+            '--mnemonic', 'abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about',  # noqa: E501
+            '--validator_start_index', '1',
+            '--chain', 'mainnet',
+            '--keystore_password', 'MyPassword',
+            '--folder', folder_path,
+            *extra_arguments,
+        ]
+
+    runner = CliRunner()
+    result = runner.invoke(cli, arguments(reference_folder_path))
+    assert result.exit_code == 0
+
+    # Interrupt a run while the keystore of its third key is being written
+    save_signing_keystore = Credential.save_signing_keystore
+    num_saved = 0
+
+    def interrupted_save_signing_keystore(self, password, folder):
+        nonlocal num_saved
+        num_saved += 1
+        filefolder = save_signing_keystore(self, password=password, folder=folder)
+        if num_saved == 3:
+            raise KeyboardInterrupt
+        return filefolder
+
+    monkeypatch.setattr(Credential, 'save_signing_keystore', interrupted_save_signing_keystore)
+    result = runner.invoke(cli, arguments(my_folder_path))
+    assert result.exit_code != 0
+    monkeypatch.undo()
+
+    validator_keys_folder_path = os.path.join(my_folder_path, DEFAULT_VALIDATOR_KEYS_FOLDER_NAME)
+    _, _, key_files = next(os.walk(validator_keys_folder_path))
+    assert JOURNAL_FILE_NAME in key_files
+    assert not any(key_file.startswith('deposit_data') for key_file in key_files)
+
+    # The run can't be restarted over its journal, and can only be resumed with the same arguments
+    result = runner.invoke(cli, arguments(my_folder_path))
+    assert result.exit_code != 0
+    result = runner.invoke(cli, arguments(my_folder_path, '--resume', '--chain', 'goerli'))
+    assert result.exit_code != 0
+
+    # The remaining keystores must be encrypted with the password of the interrupted run
+    wrong_password_arguments = arguments(my_folder_path, '--resume')
+    wrong_password_arguments[wrong_password_arguments.index('MyPassword')] = 'AnotherPassword'
+    result = runner.invoke(cli, wrong_password_arguments)
+    assert result.exit_code != 0
+    assert JOURNAL_FILE_NAME in os.listdir(validator_keys_folder_path)
+
+    # The journaled deposits must be those of the derived keys, even if they are validly signed
+    def load_deposit_data(folder_path):
+        keys_folder_path = os.path.join(folder_path, DEFAULT_VALIDATOR_KEYS_FOLDER_NAME)
+        deposit_files = [f for f in os.listdir(keys_folder_path) if f.startswith('deposit_data')]
+        assert len(deposit_files) == 1
+        with open(os.path.join(keys_folder_path, deposit_files[0])) as f:
+            return f.read()
+
+    journal_file_path = os.path.join(validator_keys_folder_path, JOURNAL_FILE_NAME)
+    with open(journal_file_path) as f:
+        journal_lines = f.readlines()
+    tampered_entry = json.loads(journal_lines[1])
+    tampered_entry['deposit_datum'] = json.loads(load_deposit_data(reference_folder_path))[2]
+    with open(journal_file_path, 'w') as f:
+        f.writelines([journal_lines[0], json.dumps(tampered_entry) + '\n', *journal_lines[2:]])
+    result = runner.invoke(cli, arguments(my_folder_path, '--resume'))
+    assert result.exit_code != 0
+    with open(journal_file_path, 'w') as f:
+        f.writelines(journal_lines)
+
+    result = runner.invoke(cli, arguments(my_folder_path, '--resume'))
+    assert result.exit_code == 0
+
+    _, _, key_files = next(os.walk(validator_keys_folder_path))
+    assert JOURNAL_FILE_NAME not in key_files
+    keystore_files = [key_file for key_file in key_files if key_file.startswith('keystore')]
+    assert sorted(key_file.rsplit('-', 1)[0] for key_file in keystore_files) == [
+        'keystore-m_12381_3600_%d_0_0' % index for index in (1, 2, 3)
+    ]
+
+    # The deposit data is identical to that of an uninterrupted run
+    assert load_deposit_data(my_folder_path) == load_deposit_data(reference_folder_path)
+
+    # Clean up
+    clean_key_folder(my_folder_path)
+    clean_key_folder(reference_folder_path)
+
+
+def test_existing_mnemonic_same_folder() -> None:
+    # Prepare folder
+    my_folder_path = os.path.join(os.getcwd(), 'TESTING_TEMP_FOLDER')
+    clean_key_folder(my_folder_path)
+    if not os.path.exists(my_folder_path):
+        os.mkdir(my_folder_path)
+
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'existing-mnemonic',
+        '--num_validators', '1',
+        '--mnemonic', 'abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about',
+        '--validator_start_index', '0',
+        '--chain', 'mainnet',
+        '--keystore_password', 'MyPassword',
+        '--folder', my_folder_path,
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    validator_keys_folder_path = os.path.join(my_folder_path, DEFAULT_VALIDATOR_KEYS_FOLDER_NAME)
+    (first_keystore,) = [f for f in os.listdir(validator_keys_folder_path) if f.startswith('keystore')]
+    # Another name than that of the next run's keystore, which may be written within the same second
+    os.rename(os.path.join(validator_keys_folder_path, first_keystore),
+              os.path.join(validator_keys_folder_path, first_keystore.replace('.json', '-first.json')))
+
+    # A new run in the same folder keeps the keystores of the previous one
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    key_files = os.listdir(validator_keys_folder_path)
+    assert first_keystore.replace('.json', '-first.json') in key_files
+    assert len([f for f in key_files if f.startswith('keystore')]) == 2
+
+    # Clean up
+    clean_key_folder(my_folder_path)
+
+
 @pytest.mark.asyncio
 async def test_script() -> None:
     my_folder_path = os.path.join(os.getcwd(), 'TESTING_TEMP_FOLDER')
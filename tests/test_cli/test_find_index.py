@@ -0,0 +1,99 @@
+import sqlite3
+
+from click.testing import CliRunner
+
+from staking_deposit.deposit import cli
+
+
+def test_find_index() -> None:
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'find-index',
+        '--mnemonic', 'sister protect peanut hill ready work profit fit wish want small inflict flip member tail between sick setup bright duck morning sell paper worry',  # noqa: E501
+        '--targets', '0x00a75d83f169fa6923f3dd78386d9608fab710d8f7fcf71ba9985893675d5382, 0x00bd0b5a34de5fb17df08410b5e615dda87caf4fb72d0aac91ce5e52fc6aa8de',  # noqa: E501
+        '--num_indices', '5',
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    assert '0x00a75d83f169fa6923f3dd78386d9608fab710d8f7fcf71ba9985893675d5382: index 1' in result.output
+    assert '0x00bd0b5a34de5fb17df08410b5e615dda87caf4fb72d0aac91ce5e52fc6aa8de: index 0' in result.output
+
+
+def test_find_index_not_found_num_workers() -> None:
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'find-index',
+        '--mnemonic', 'sister protect peanut hill ready work profit fit wish want small inflict flip member tail between sick setup bright duck morning sell paper worry',  # noqa: E501
+        '--targets', '0x00a75d83f169fa6923f3dd78386d9608fab710d8f7fcf71ba9985893675d5382',
+        '--validator_start_index', '2',
+        '--num_indices', '4',
+        '--num_workers', '2',
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    assert '0x00a75d83f169fa6923f3dd78386d9608fab710d8f7fcf71ba9985893675d5382: not found between indices 2 and 5' in result.output  # noqa: E501
+
+
+def test_find_index_invalid_target() -> None:
+    runner = CliRunner()
+    inputs = ['0x00bd0b5a34de5fb17df08410b5e615dda87caf4fb72d0aac91ce5e52fc6aa8de']
+    data = '\n'.join(inputs)
+    arguments = [
+        '--language', 'english',
+        'find-index',
+        '--mnemonic', 'sister protect peanut hill ready work profit fit wish want small inflict flip member tail between sick setup bright duck morning sell paper worry',  # noqa: E501
+        '--targets', '0x1234',
+        '--num_indices', '1',
+    ]
+    result = runner.invoke(cli, arguments, input=data)
+    assert result.exit_code == 0
+    assert 'neither a 48-byte validator public key' in result.output
+    assert 'index 0' in result.output
+
+
+def test_find_index_pubkey_index(tmp_path) -> None:
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'find-index',
+        '--mnemonic', 'sister protect peanut hill ready work profit fit wish want small inflict flip member tail between sick setup bright duck morning sell paper worry',  # noqa: E501
+        '--targets', '0x00a75d83f169fa6923f3dd78386d9608fab710d8f7fcf71ba9985893675d5382',
+        '--num_indices', '3',
+        '--pubkey_index', str(tmp_path / 'pubkeys.sqlite'),
+    ]
+    for _ in range(2):
+        result = runner.invoke(cli, arguments)
+        assert result.exit_code == 0
+        assert '0x00a75d83f169fa6923f3dd78386d9608fab710d8f7fcf71ba9985893675d5382: index 1' in result.output
+
+
+def test_find_index_check_pubkey_index(tmp_path) -> None:
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'find-index',
+        '--mnemonic', 'sister protect peanut hill ready work profit fit wish want small inflict flip member tail between sick setup bright duck morning sell paper worry',  # noqa: E501
+        '--targets', '0x00a75d83f169fa6923f3dd78386d9608fab710d8f7fcf71ba9985893675d5382',
+        '--num_indices', '3',
+        '--pubkey_index', str(tmp_path / 'pubkeys.sqlite'),
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    with sqlite3.connect(tmp_path / 'pubkeys.sqlite') as connection:
+        connection.execute("UPDATE pubkeys SET pubkey = ? WHERE path = 'm/12381/3600/1/0'", (b'\x22' * 48,))
+    connection.close()
+
+    result = runner.invoke(cli, [*arguments, '--check_pubkey_index'])
+    assert result.exit_code == 0
+    assert '1 invalid entries were discarded from the public key index.' in result.output
+    assert '0x00a75d83f169fa6923f3dd78386d9608fab710d8f7fcf71ba9985893675d5382: index 1' in result.output
+
+    result = runner.invoke(cli, [*arguments, '--rebuild_pubkey_index'])
+    assert result.exit_code == 0
+    assert '0x00a75d83f169fa6923f3dd78386d9608fab710d8f7fcf71ba9985893675d5382: index 1' in result.output
@@ -1,4 +1,5 @@
 import os
+import pytest
 
 from click.testing import CliRunner
 
@@ -85,7 +86,8 @@ def test_existing_mnemonic_bls_withdrawal_interactive() -> None:
     clean_btec_folder(my_folder_path)
 
 
-def test_existing_mnemonic_bls_withdrawal_multiple() -> None:
+@pytest.mark.parametrize('num_workers', ['1', '2'])
+def test_existing_mnemonic_bls_withdrawal_multiple(num_workers: str) -> None:
     # Prepare folder
     my_folder_path = prepare_testing_folder(os)
 
@@ -103,6 +105,7 @@ def test_existing_mnemonic_bls_withdrawal_multiple() -> None:
         '--validator_start_index', '0',
         '--validator_indices', '1,2',
         '--execution_address', '0x3434343434343434343434343434343434343434',
+        '--num_workers', num_workers,
     ]
     result = runner.invoke(cli, arguments, input=data)
     assert result.exit_code == 0
@@ -0,0 +1,64 @@
+import json
+import os
+
+from click.testing import CliRunner
+
+from staking_deposit.deposit import cli
+from staking_deposit.utils.constants import DEFAULT_VALIDATOR_KEYS_FOLDER_NAME
+
+MNEMONIC = 'legal winner thank year wave sausage worth useful legal winner thank yellow'
+DEVNET_CHAIN_SETTING = json.dumps({
+    'network_name': 'devnet',
+    'genesis_fork_version': '10000038',
+    'genesis_validator_root': '0000000000000000000000000000000000000000000000000000000000000000',
+})
+
+
+def test_generate_devnet_keys(tmp_path) -> None:
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'generate-devnet-keys',
+        '--mnemonic', MNEMONIC,
+        '--devnet_chain_setting', DEVNET_CHAIN_SETTING,
+        '--num_validators', '4',
+        '--folder', str(tmp_path),
+        '--keystore_password', 'MyPassword',
+        '--execution_address', '0x00000000219ab540356cBB839Cbe05303d7705Fa',
+        '--num_workers', '2',
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    assert 'INSECURE' in result.output
+
+    validator_keys_folder_path = os.path.join(tmp_path, DEFAULT_VALIDATOR_KEYS_FOLDER_NAME)
+    key_files = os.listdir(validator_keys_folder_path)
+    assert len([key_file for key_file in key_files if key_file.startswith('keystore-insecure-')]) == 4
+    deposit_files = [key_file for key_file in key_files if key_file.startswith('deposit_data-insecure-')]
+    assert len(deposit_files) == 1
+    with open(os.path.join(validator_keys_folder_path, deposit_files[0])) as f:
+        deposit_data = json.load(f)
+    assert len(deposit_data) == 4
+    assert all(deposit_datum['network_name'] == 'devnet' for deposit_datum in deposit_data)
+
+
+def test_generate_devnet_keys_public_chain(tmp_path) -> None:
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'generate-devnet-keys',
+        '--mnemonic', MNEMONIC,
+        '--devnet_chain_setting', json.dumps({
+            'network_name': 'mainnet',
+            'genesis_fork_version': '00000000',
+            'genesis_validator_root': '4b363db94e286120d76eb905340fdd4e54bfe9f06bf33ff6cf5ad27f511bfe95',
+        }),
+        '--num_validators', '1',
+        '--folder', str(tmp_path),
+        '--keystore_password', 'MyPassword',
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 1
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,81 @@
+from click.testing import CliRunner
+from py_ecc.bls import G2ProofOfPossession as bls
+
+from staking_deposit.deposit import cli
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+
+MNEMONIC = 'legal winner thank year wave sausage worth useful legal winner thank yellow'
+
+
+def signing_pubkey(index: int) -> str:
+    with DerivationContext(mnemonic=MNEMONIC, password='') as derivation_context:
+        return '0x' + bls.SkToPk(derivation_context.derive_key(f'm/12381/3600/{index}/0/0')).hex()
+
+
+def test_recover_mnemonic() -> None:
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'recover-mnemonic',
+        '--mnemonic', 'legal winner thank year wave sausage? worth useful legal wnner thank yellow',
+        '--targets', signing_pubkey(0),
+        '--num_workers', '1',
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    assert 'derives the public key at index 0' in result.output
+    assert MNEMONIC in result.output
+
+
+def test_recover_mnemonic_not_found() -> None:
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'recover-mnemonic',
+        '--mnemonic', 'legal winner thank year wave sausage worth useful legal wnner thank yellow',
+        '--targets', signing_pubkey(1),
+        '--num_workers', '2',
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    assert 'None of the candidate mnemonics derives the given public keys' in result.output
+
+
+def test_recover_mnemonic_too_many_unknown_words() -> None:
+    runner = CliRunner()
+    inputs = ['legal winner thank year wave sausage worth useful legal wnner thank yellow']
+    data = '\n'.join(inputs)
+    arguments = [
+        '--language', 'english',
+        'recover-mnemonic',
+        '--mnemonic', 'legal ? thank ? wave sausage worth ? legal winner thank yellow',
+        '--targets', signing_pubkey(0),
+        '--num_workers', '1',
+    ]
+    result = runner.invoke(cli, arguments, input=data)
+    assert result.exit_code == 0
+    assert 'at most 2 are unknown or misspelled' in result.output
+    assert MNEMONIC in result.output
+
+
+def test_recover_mnemonic_password() -> None:
+    with DerivationContext(mnemonic=MNEMONIC, password='TREZOR') as derivation_context:
+        target = '0x' + bls.SkToPk(derivation_context.derive_key('m/12381/3600/0/0/0')).hex()
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        'recover-mnemonic',
+        '--mnemonic', 'legal winner thank year wave sausage worth useful legal winner thnak yellow',
+        '--mnemonic-password', 'TREZOR',
+        '--targets', target,
+        '--validator_start_index', '0',
+        '--num_indices', '1',
+        '--num_workers', '1',
+    ]
+    # The mnemonic password is confirmed, after a mismatch
+    result = runner.invoke(cli, arguments, input='TREZRO\nTREZOR\nTREZOR\n')
+    assert result.exit_code == 0
+    assert "doesn't match" in result.output
+    assert MNEMONIC in result.output
@@ -0,0 +1,62 @@
+import os
+
+from click.testing import CliRunner
+from py_ecc.bls import G2ProofOfPossession as bls
+
+from staking_deposit.cli.recover_mnemonic_password import expand_password_candidates
+from staking_deposit.deposit import cli
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+
+MNEMONIC = 'legal winner thank year wave sausage worth useful legal winner thank yellow'
+
+
+def signing_pubkey(password: str, index: int=0) -> str:
+    with DerivationContext(mnemonic=MNEMONIC, password=password) as derivation_context:
+        return '0x' + bls.SkToPk(derivation_context.derive_key(f'm/12381/3600/{index}/0/0')).hex()
+
+
+def test_expand_password_candidates() -> None:
+    assert expand_password_candidates(['abc', 'abc'], []) == ['abc']
+    assert expand_password_candidates(['abc'], ['case']) == ['abc', 'ABC', 'Abc']
+    assert expand_password_candidates(['Tests'], ['leet', 'digit'])[:3] == ['Tests', 'Tests0', 'Tests1']
+    assert 'T3575!' in expand_password_candidates(['Tests'], ['leet', 'symbol'])
+    assert len(expand_password_candidates(['a', 'b'], ['digit', 'symbol'])) == 2 * 11 * 10
+
+
+def test_recover_mnemonic_password(tmp_path) -> None:
+    with open(os.path.join(tmp_path, 'passwords.txt'), 'w') as f:
+        f.write('password\nhunter2\n TREZOR \nletmein\n')
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'recover-mnemonic-password',
+        '--mnemonic', MNEMONIC,
+        '--passwords_file', os.path.join(tmp_path, 'passwords.txt'),
+        '--mutation', 'whitespace',
+        '--mutation', 'case',
+        '--targets', signing_pubkey('trezor', index=2),
+        '--validator_index', '2',
+        '--num_workers', '2',
+    ]
+    result = runner.invoke(cli, arguments)
+    assert result.exit_code == 0
+    assert "'trezor'" in result.output
+    assert 'candidates/sec' in result.output
+
+
+def test_recover_mnemonic_password_not_found() -> None:
+    runner = CliRunner()
+    arguments = [
+        '--language', 'english',
+        '--non_interactive',
+        'recover-mnemonic-password',
+        '--mnemonic', MNEMONIC,
+        '--passwords_file', '-',
+        '--targets', signing_pubkey('TREZOR'),
+        '--num_workers', '1',
+    ]
+    result = runner.invoke(cli, arguments, input='trezor\nTrezor\n')
+    assert result.exit_code == 0
+    assert 'Tried 2 candidate password(s)' in result.output
+    assert 'None of the candidate passwords derives the given public keys.' in result.output
@@ -1,7 +1,58 @@
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
 import pytest
+from py_ecc.bls import G2ProofOfPossession as bls
 
-from staking_deposit.credentials import CredentialList
+from staking_deposit.credentials import (
+    SIGNING_KEY,
+    WITHDRAWAL_KEY,
+    Credential,
+    CredentialList,
+    deposit_datum_to_json,
+    find_key_indices,
+    iter_credentials,
+    iter_mnemonic_signing_pubkeys,
+    sign_and_verify_deposits,
+)
+from staking_deposit.exceptions import ValidationError
+from staking_deposit.key_handling.key_derivation import path
+from staking_deposit.key_handling.key_derivation.mnemonic import get_seed
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+from staking_deposit.key_handling.keystore import Pbkdf2Keystore
+from staking_deposit.key_handling.pubkey_index import PubkeyIndex
 from staking_deposit.settings import MainnetSetting
+from staking_deposit.utils import bls as bls_backend
+from staking_deposit.utils.validation import (
+    validate_bls_withdrawal_credentials_matching,
+    validate_deposit,
+)
+from staking_deposit.utils.constants import MAX_DEPOSIT_AMOUNT, WORD_LISTS_PATH
+
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+EXECUTION_ADDRESS = '0x00000000219ab540356cBB839Cbe05303d7705Fa'
+
+
+def _credential_kwargs(*, num_keys: int, start_index: int=0,
+                       hex_eth1_withdrawal_address: Optional[str]=None) -> Dict[str, Any]:
+    return dict(
+        num_keys=num_keys,
+        amounts=[MAX_DEPOSIT_AMOUNT] * num_keys,
+        chain_setting=MainnetSetting,
+        start_index=start_index,
+        hex_eth1_withdrawal_address=hex_eth1_withdrawal_address,
+    )
+
+
+def _from_mnemonic(**kwargs: Any) -> List[Credential]:
+    return CredentialList.from_mnemonic(mnemonic=MNEMONIC, mnemonic_password="", **kwargs).credentials
+
+
+@pytest.fixture
+def derivation_context() -> Iterator[DerivationContext]:
+    with DerivationContext(mnemonic=MNEMONIC, password="") as derivation_context:
+        yield derivation_context
 
 
 def test_from_mnemonic() -> None:
@@ -15,3 +66,295 @@ def test_from_mnemonic() -> None:
             start_index=1,
             hex_eth1_withdrawal_address=None,
         )
+
+
+def test_from_mnemonic_num_workers() -> None:
+    kwargs = _credential_kwargs(num_keys=3, start_index=4)
+    serial_credentials = _from_mnemonic(**kwargs)
+    parallel_credentials = _from_mnemonic(**kwargs, num_workers=2)
+
+    assert len(parallel_credentials) == len(serial_credentials)
+    for serial, parallel in zip(serial_credentials, parallel_credentials):
+        assert parallel.signing_key_path == serial.signing_key_path
+        assert parallel.signing_sk == serial.signing_sk
+        assert parallel.withdrawal_sk == serial.withdrawal_sk
+        assert parallel.deposit_message.hash_tree_root == serial.deposit_message.hash_tree_root
+
+
+@pytest.mark.parametrize('hex_eth1_withdrawal_address, num_pubkeys', [
+    (None, 2),
+    (EXECUTION_ADDRESS, 1),
+])
+def test_credential_computes_pubkeys_once(monkeypatch, tmp_path, derivation_context,
+                                          hex_eth1_withdrawal_address, num_pubkeys) -> None:
+    sk_to_pk = bls_backend.SkToPk
+    sk_to_pk_calls = []
+
+    def counting_sk_to_pk(sk: int) -> bytes:
+        sk_to_pk_calls.append(sk)
+        return sk_to_pk(sk)
+
+    credential = Credential(derivation_context=derivation_context, index=0, amount=MAX_DEPOSIT_AMOUNT,
+                            chain_setting=MainnetSetting, hex_eth1_withdrawal_address=hex_eth1_withdrawal_address)
+    monkeypatch.setattr(bls_backend, 'SkToPk', counting_sk_to_pk)
+    # Everything a validator goes through when its keys are generated
+    deposit_datum = deposit_datum_to_json(credential.deposit_datum_dict)
+    keystore_filefolder = credential.save_signing_keystore(password='MyPassword', folder=str(tmp_path),
+                                                           keystore_cls=Pbkdf2Keystore)
+    assert credential.verify_keystore(keystore_filefolder, 'MyPassword')
+    assert validate_deposit(deposit_datum, credential)
+    if hex_eth1_withdrawal_address is None:
+        validate_bls_withdrawal_credentials_matching(credential.withdrawal_credentials, credential)
+    assert deposit_datum_to_json(credential.deposit_datum_dict) == deposit_datum
+    assert len(sk_to_pk_calls) == num_pubkeys
+
+
+def test_from_mnemonic_invalid_num_workers() -> None:
+    with pytest.raises(ValueError):
+        CredentialList.from_mnemonic(
+            mnemonic="",
+            mnemonic_password="",
+            num_keys=1,
+            amounts=[MAX_DEPOSIT_AMOUNT],
+            chain_setting=MainnetSetting,
+            start_index=1,
+            hex_eth1_withdrawal_address=None,
+            num_workers=0,
+        )
+
+
+def _export_credential_list() -> CredentialList:
+    kwargs = _credential_kwargs(num_keys=5, hex_eth1_withdrawal_address=EXECUTION_ADDRESS)
+    return CredentialList(_from_mnemonic(**kwargs))
+
+
+def test_export_deposit_data_json_num_workers(tmp_path) -> None:
+    (tmp_path / 'serial').mkdir()
+    (tmp_path / 'parallel').mkdir()
+    serial_file = _export_credential_list().export_deposit_data_json(str(tmp_path / 'serial'))
+    parallel_credentials = _export_credential_list()
+    # A deposit that is already signed isn't signed again by the workers
+    parallel_credentials.credentials[1].signed_deposit
+    parallel_file = parallel_credentials.export_deposit_data_json(str(tmp_path / 'parallel'), num_workers=2)
+
+    with open(serial_file) as f, open(parallel_file) as g:
+        assert f.read() == g.read()
+    with pytest.raises(ValueError):
+        parallel_credentials.export_deposit_data_json(str(tmp_path), num_workers=0)
+
+
+def test_export_bls_to_execution_change_json_num_workers(tmp_path) -> None:
+    (tmp_path / 'serial').mkdir()
+    (tmp_path / 'parallel').mkdir()
+    validator_indices = [10, 11, 12, 13, 14]
+    serial_file = _export_credential_list().export_bls_to_execution_change_json(
+        str(tmp_path / 'serial'), validator_indices)
+    parallel_file = _export_credential_list().export_bls_to_execution_change_json(
+        str(tmp_path / 'parallel'), validator_indices, num_workers=2)
+
+    with open(serial_file) as f, open(parallel_file) as g:
+        assert f.read() == g.read()
+
+
+def test_credential_lazy_key_derivation(derivation_context) -> None:
+    credential = _from_mnemonic(**_credential_kwargs(num_keys=1), derivation_context=derivation_context)[0]
+    assert derivation_context.cache.misses == 0
+
+    # Only the withdrawal key is derived when only the withdrawal key is used
+    withdrawal_sk = credential.withdrawal_sk
+    assert derivation_context.cache.misses == 4
+    assert credential._signing_sk is None
+    assert withdrawal_sk == derivation_context.derive_key('m/12381/3600/0/0')
+
+    # The signing key then only costs one more child derivation, and both keys are cached afterwards
+    signing_sk = credential.signing_sk
+    assert derivation_context.cache.misses == 5
+    assert credential.signing_sk == signing_sk
+    assert credential.withdrawal_sk == withdrawal_sk
+    assert derivation_context.cache.misses == 5
+
+
+def test_credential_derive_keys(derivation_context) -> None:
+    credential = Credential(derivation_context=derivation_context, index=0, amount=MAX_DEPOSIT_AMOUNT,
+                            chain_setting=MainnetSetting, hex_eth1_withdrawal_address=None)
+    credential.derive_keys((WITHDRAWAL_KEY,))
+    assert credential._withdrawal_sk == derivation_context.derive_key('m/12381/3600/0/0')
+    assert credential._signing_sk is None
+    credential.derive_keys((SIGNING_KEY, WITHDRAWAL_KEY))
+    signing_sk = derivation_context.derive_key('m/12381/3600/0/0/0')
+    # The derived keys outlive the derivation context
+    derivation_context.wipe()
+    assert credential.signing_sk == signing_sk
+
+
+@pytest.mark.parametrize('num_workers', [1, 2])
+def test_find_key_indices(derivation_context, num_workers) -> None:
+    credentials = _from_mnemonic(**_credential_kwargs(num_keys=2, start_index=3))
+    missing_pubkey = b'\x11' * 48
+    targets = [credentials[0].signing_pk, credentials[1].withdrawal_credentials, missing_pubkey]
+    found = find_key_indices(derivation_context=derivation_context, targets=targets,
+                             start_index=2, num_indices=4, num_workers=num_workers)
+    assert found == {
+        credentials[0].signing_pk: 3,
+        credentials[1].withdrawal_credentials: 4,
+    }
+
+
+def test_find_key_indices_stops_once_all_found(derivation_context) -> None:
+    target = bls.SkToPk(derivation_context.derive_key('m/12381/3600/1/0/0'))
+    misses = derivation_context.cache.misses
+    found = find_key_indices(derivation_context=derivation_context, targets=[target],
+                             start_index=0, num_indices=100)
+    assert found == {target: 1}
+    # Only index 0 had to be derived, index 1 was still cached, and the scan stopped there
+    assert derivation_context.cache.misses == misses + 3
+
+
+def test_find_key_indices_invalid_target(derivation_context) -> None:
+    with pytest.raises(ValueError):
+        find_key_indices(derivation_context=derivation_context, targets=[b'\x00' * 20],
+                         start_index=0, num_indices=1)
+
+
+@pytest.mark.parametrize('num_workers', [1, 2])
+def test_find_key_indices_pubkey_index(tmp_path, derivation_context, num_workers) -> None:
+    path = str(tmp_path / 'pubkeys.sqlite')
+    target = bls.SkToPk(derivation_context.derive_key('m/12381/3600/2/0/0'))
+    with PubkeyIndex(path, master_SK=derivation_context.master_SK) as pubkey_index:
+        found = find_key_indices(derivation_context=derivation_context, targets=[b'\x11' * 48],
+                                 start_index=0, num_indices=3, num_workers=num_workers,
+                                 pubkey_index=pubkey_index)
+        assert found == {}
+        assert len(pubkey_index.pubkeys()) == 6
+
+    # The indices are then matched from the index alone
+    misses = derivation_context.cache.misses
+    with PubkeyIndex(path, master_SK=derivation_context.master_SK) as pubkey_index:
+        found = find_key_indices(derivation_context=derivation_context, targets=[target],
+                                 start_index=0, num_indices=3, num_workers=num_workers,
+                                 pubkey_index=pubkey_index)
+    assert found == {target: 2}
+    assert derivation_context.cache.misses == misses
+
+
+def test_from_mnemonic_keys(derivation_context) -> None:
+    kwargs = dict(_credential_kwargs(num_keys=3, hex_eth1_withdrawal_address=EXECUTION_ADDRESS),
+                  derivation_context=derivation_context, num_workers=2)
+    credentials = _from_mnemonic(keys=(WITHDRAWAL_KEY,), **kwargs)
+    # Only the withdrawal keys were derived by the workers
+    assert all(credential._withdrawal_sk is not None for credential in credentials)
+    assert all(credential._signing_sk is None for credential in credentials)
+    assert derivation_context.cache.misses == 0
+
+    with pytest.raises(ValueError):
+        _from_mnemonic(keys=('unknown',), **kwargs)
+
+
+def test_credential_pubkey_index(tmp_path) -> None:
+    path = str(tmp_path / 'pubkeys.sqlite')
+    kwargs = _credential_kwargs(num_keys=1)
+    with DerivationContext(mnemonic=MNEMONIC, password="") as derivation_context:
+        with PubkeyIndex(path, master_SK=derivation_context.master_SK) as pubkey_index:
+            credential = _from_mnemonic(**kwargs, derivation_context=derivation_context, pubkey_index=pubkey_index)[0]
+            signing_pk = credential.signing_pk
+            withdrawal_credentials = credential.withdrawal_credentials
+
+    with DerivationContext(mnemonic=MNEMONIC, password="") as derivation_context:
+        with PubkeyIndex(path, master_SK=derivation_context.master_SK) as pubkey_index:
+            credential = _from_mnemonic(**kwargs, derivation_context=derivation_context, pubkey_index=pubkey_index)[0]
+            assert credential.signing_pk == signing_pk
+            assert credential.withdrawal_credentials == withdrawal_credentials
+            # No key had to be derived to get the public values
+            assert derivation_context.cache.misses == 0
+
+
+@pytest.mark.parametrize('num_workers', [1, 2])
+def test_iter_credentials(derivation_context, num_workers) -> None:
+    kwargs = _credential_kwargs(num_keys=3, start_index=4)
+    expected_credentials = _from_mnemonic(**kwargs)
+    credentials = list(iter_credentials(derivation_context=derivation_context, num_workers=num_workers, **kwargs))
+    assert len(credentials) == len(expected_credentials)
+    for credential, expected in zip(credentials, expected_credentials):
+        assert credential.signing_key_path == expected.signing_key_path
+        assert credential.signing_sk == expected.signing_sk
+        assert credential.deposit_message.hash_tree_root == expected.deposit_message.hash_tree_root
+
+
+@pytest.mark.parametrize('hex_eth1_withdrawal_address', [None, EXECUTION_ADDRESS])
+def test_iter_credentials_sign_deposits(tmp_path, derivation_context, hex_eth1_withdrawal_address) -> None:
+    kwargs = _credential_kwargs(num_keys=3, start_index=4, hex_eth1_withdrawal_address=hex_eth1_withdrawal_address)
+    expected_credentials = _from_mnemonic(**kwargs)
+    with PubkeyIndex(str(tmp_path / 'pubkeys.sqlite'), master_SK=derivation_context.master_SK) as pubkey_index:
+        credentials = list(iter_credentials(derivation_context=derivation_context, num_workers=2,
+                                            pubkey_index=pubkey_index, sign_deposits=True, **kwargs))
+        for credential, expected in zip(credentials, expected_credentials):
+            # The deposits were signed by the workers, and are identical to those of the serial path
+            assert credential._signed_deposit is not None
+            assert credential.deposit_datum_dict == expected.deposit_datum_dict
+        # The public keys that the workers computed were recorded to the index
+        assert pubkey_index.pubkeys() == {
+            path: pubkey
+            for credential in credentials
+            for path, pubkey in [(credential.signing_key_path, credential.signing_pk),
+                                 (credential.withdrawal_key_path, credential._withdrawal_pk)]
+            if pubkey is not None
+        }
+
+
+def test_sign_and_verify_deposits(monkeypatch, derivation_context) -> None:
+    credentials = [Credential(derivation_context=derivation_context, index=index, amount=MAX_DEPOSIT_AMOUNT,
+                              chain_setting=MainnetSetting, hex_eth1_withdrawal_address=None)
+                   for index in range(2)]
+    # Every deposit is signed with the key of the first one
+    signing_sk = credentials[0].signing_sk
+    monkeypatch.setattr(bls_backend, 'Sign', lambda sk, message: bls.Sign(signing_sk, message))
+    with pytest.raises(ValidationError, match=credentials[1].signing_pk.hex()):
+        sign_and_verify_deposits(credentials)
+
+
+def test_iter_credentials_is_lazy(derivation_context) -> None:
+    credentials = iter_credentials(derivation_context=derivation_context, **_credential_kwargs(num_keys=1000))
+    credential = next(credentials)
+    assert credential.signing_key_path == 'm/12381/3600/0/0/0'
+    credential.derive_keys((SIGNING_KEY,))
+    # Only the first credential's keys have been derived
+    assert derivation_context.cache.misses == 5
+
+
+def test_iter_credentials_invalid_amounts(derivation_context) -> None:
+    kwargs = dict(_credential_kwargs(num_keys=2), amounts=[MAX_DEPOSIT_AMOUNT])
+    with pytest.raises(ValueError):
+        next(iter_credentials(derivation_context=derivation_context, **kwargs))
+
+
+@pytest.mark.parametrize('num_workers', [1, 2])
+def test_iter_mnemonic_signing_pubkeys(derivation_context, num_workers) -> None:
+    invalid_mnemonic = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon"
+    # More keys than fit in one chunk, so that the indices of a mnemonic are split across the workers
+    num_keys = 34
+    expected = [bls.SkToPk(derivation_context.derive_key(f'm/12381/3600/{index}/0/0'))
+                for index in range(5, 5 + num_keys)]
+    results = list(iter_mnemonic_signing_pubkeys(
+        mnemonics=[MNEMONIC, invalid_mnemonic, ' '.join(word[:4] for word in MNEMONIC.split(' '))],
+        password="", words_path=WORD_LISTS_PATH, start_index=5, num_keys=num_keys, num_workers=num_workers,
+    ))
+    assert results == [expected, None, expected]
+
+
+@pytest.mark.parametrize('num_keys', [2, 34])
+def test_iter_mnemonic_signing_pubkeys_derives_seed_once(tmp_path, monkeypatch, num_keys) -> None:
+    # The seed derivations are counted in every process (the workers are forked)
+    seed_log_path = os.path.join(tmp_path, 'seed.log')
+
+    def logged_get_seed(**kwargs):
+        with open(seed_log_path, 'a') as f:
+            f.write('seed\n')
+        return get_seed(**kwargs)
+
+    monkeypatch.setattr(path, 'get_seed', logged_get_seed)
+    mnemonics = [MNEMONIC, "legal winner thank year wave sausage worth useful legal winner thank yellow"]
+    results = list(iter_mnemonic_signing_pubkeys(mnemonics=mnemonics, password="", words_path=WORD_LISTS_PATH,
+                                                 start_index=0, num_keys=num_keys, num_workers=2))
+    assert [len(pubkeys) for pubkeys in results] == [num_keys, num_keys]
+    with open(seed_log_path) as f:
+        assert len(f.readlines()) == len(mnemonics)
@@ -0,0 +1,67 @@
+import json
+import os
+
+import pytest
+
+from staking_deposit.credentials import Credential
+from staking_deposit.devnet import generate_devnet_keys
+from staking_deposit.exceptions import ValidationError
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+from staking_deposit.key_handling.keystore import INSECURE_KEYSTORE_DESCRIPTION, InsecurePbkdf2Keystore
+from staking_deposit.settings import (
+    ALL_CHAINS,
+    get_devnet_chain_setting,
+    is_public_chain_setting,
+)
+from staking_deposit.utils.constants import MAX_DEPOSIT_AMOUNT
+from staking_deposit.utils.validation import verify_deposit_signatures
+
+MNEMONIC = 'legal winner thank year wave sausage worth useful legal winner thank yellow'
+DEVNET_SETTING = get_devnet_chain_setting(
+    network_name='devnet',
+    genesis_fork_version='10000038',
+    genesis_validator_root='0000000000000000000000000000000000000000000000000000000000000000',
+)
+
+
+def test_is_public_chain_setting() -> None:
+    assert all(is_public_chain_setting(chain_setting) for chain_setting in ALL_CHAINS.values())
+    assert not is_public_chain_setting(DEVNET_SETTING)
+    # The deposits of a "devnet" sharing the fork version of a public chain would be valid on it
+    assert is_public_chain_setting(get_devnet_chain_setting(
+        network_name='devnet',
+        genesis_fork_version='00000000',
+        genesis_validator_root='0000000000000000000000000000000000000000000000000000000000000000',
+    ))
+
+
+@pytest.mark.parametrize('num_workers', [1, 2])
+def test_generate_devnet_keys(tmp_path, num_workers: int) -> None:
+    with DerivationContext(mnemonic=MNEMONIC, password='') as derivation_context:
+        devnet_keys = list(generate_devnet_keys(
+            derivation_context=derivation_context, num_keys=3, chain_setting=DEVNET_SETTING, start_index=2,
+            hex_eth1_withdrawal_address=None, password='MyPassword', folder=str(tmp_path), num_workers=num_workers,
+        ))
+        credentials = [Credential(derivation_context=derivation_context, index=index, amount=MAX_DEPOSIT_AMOUNT,
+                                  chain_setting=DEVNET_SETTING, hex_eth1_withdrawal_address=None)
+                       for index in range(2, 5)]
+        assert [deposit_datum['pubkey'] for _, deposit_datum in devnet_keys] == [
+            credential.signing_pk.hex() for credential in credentials]
+        assert verify_deposit_signatures([deposit_datum for _, deposit_datum in devnet_keys])
+        for (keystore_file, _), credential in zip(devnet_keys, credentials):
+            assert keystore_file.startswith('keystore-insecure-%s-' % credential.signing_key_path.replace('/', '_'))
+            assert credential.verify_keystore(os.path.join(tmp_path, keystore_file), 'MyPassword',
+                                              keystore_cls=InsecurePbkdf2Keystore)
+            with open(os.path.join(tmp_path, keystore_file)) as f:
+                assert json.load(f)['description'] == INSECURE_KEYSTORE_DESCRIPTION
+
+
+@pytest.mark.parametrize('chain', ALL_CHAINS.keys())
+def test_generate_devnet_keys_public_chain(tmp_path, chain: str) -> None:
+    with DerivationContext(mnemonic=MNEMONIC, password='') as derivation_context:
+        with pytest.raises(ValidationError):
+            next(generate_devnet_keys(
+                derivation_context=derivation_context, num_keys=1, chain_setting=ALL_CHAINS[chain], start_index=0,
+                hex_eth1_withdrawal_address=None, password='MyPassword', folder=str(tmp_path),
+            ))
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,39 @@
+import importlib.util
+import os
+
+from staking_deposit.key_handling.key_derivation import mnemonic
+from staking_deposit.key_handling.key_derivation.bundle_word_lists import (
+    read_word_lists,
+    write_word_lists_bundle,
+)
+from staking_deposit.utils.constants import (
+    MNEMONIC_LANG_OPTIONS,
+    WORD_LISTS_PATH,
+)
+
+
+def test_write_word_lists_bundle(tmp_path: str) -> None:
+    bundle_file = os.path.join(tmp_path, '_word_lists_bundle.py')
+    write_word_lists_bundle(bundle_file=bundle_file)
+
+    spec = importlib.util.spec_from_file_location('_word_lists_bundle', bundle_file)
+    bundle = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bundle)  # type: ignore
+
+    assert set(bundle.WORD_LISTS.keys()) == set(MNEMONIC_LANG_OPTIONS.keys())
+    for language, words in read_word_lists().items():
+        assert bundle.WORD_LISTS[language] == tuple(words)
+        assert bundle.WORD_LISTS[language] == tuple(mnemonic._get_word_list(language, os.path.abspath(WORD_LISTS_PATH)))
+
+
+def test_get_word_list_from_bundle(monkeypatch) -> None:
+    bundled_words = tuple('word%d' % i for i in range(2048))
+    monkeypatch.setattr(mnemonic, '_BUNDLED_WORD_LISTS', {'english': bundled_words})
+    mnemonic._get_word_list.cache_clear()
+    try:
+        assert mnemonic._get_word_list('english', WORD_LISTS_PATH) is bundled_words
+        # Other word-lists, and other paths, are still read from the word-list files
+        assert mnemonic._get_word_list('italian', WORD_LISTS_PATH)[0] == 'abaco'
+        assert mnemonic._get_word_list('english', os.path.abspath(WORD_LISTS_PATH))[0] == 'abandon'
+    finally:
+        mnemonic._get_word_list.cache_clear()
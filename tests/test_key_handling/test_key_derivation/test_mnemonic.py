@@ -11,7 +11,12 @@ from staking_deposit.utils.constants import (
 from staking_deposit.key_handling.key_derivation.mnemonic import (
     _index_to_word,
     _get_word_list,
+    _get_word_list_index,
+    _word_to_index,
     abbreviate_words,
+    determine_mnemonic_language,
+    get_mnemonic_candidates,
+    iter_candidate_mnemonics,
     get_seed,
     get_mnemonic,
     reconstruct_mnemonic,
@@ -85,3 +90,77 @@ def test_get_word(language: str, index: int, valid: bool) -> None:
     else:
         with pytest.raises(IndexError):
             _index_to_word(word_list=word_list, index=index)
+
+
+@pytest.mark.parametrize(
+    'test_mnemonic',
+    [(test_mnemonic[1])
+     for _, language_test_vectors in test_vectors.items()
+     for test_mnemonic in language_test_vectors]
+)
+def test_determine_mnemonic_language(test_mnemonic: str) -> None:
+    languages = determine_mnemonic_language(test_mnemonic, WORD_LISTS_PATH)
+    assert len(languages) > 0
+    assert set(languages) == set(determine_mnemonic_language(abbreviate_mnemonic(test_mnemonic), WORD_LISTS_PATH))
+
+
+def test_determine_mnemonic_language_unknown_words() -> None:
+    assert determine_mnemonic_language(' '.join(['qqqq'] * 12), WORD_LISTS_PATH) == []
+    assert reconstruct_mnemonic(' '.join(['qqqq'] * 12), WORD_LISTS_PATH) is None
+
+
+@pytest.mark.parametrize('language', all_languages)
+def test_word_list_index(language: str) -> None:
+    word_list = _get_word_list(language, WORD_LISTS_PATH)
+    word_list_index = _get_word_list_index(language, WORD_LISTS_PATH)
+    for index, (word, abbrev) in enumerate(zip(word_list, abbreviate_words(word_list))):
+        assert _word_to_index(word_list_index.word_indices, word) == index
+        assert _word_to_index(word_list_index.abbreviation_indices, abbrev) == index
+    with pytest.raises(ValueError):
+        _word_to_index(word_list_index.word_indices, 'notaword')
+
+
+@pytest.mark.parametrize(
+    'words, num_candidates',
+    [
+        ({}, [1] * 12),
+        ({2: '?'}, [1, 1, 2048] + [1] * 9),
+        ({2: 'thnak', 11: 'yellow?'}, [1, 1, 'thank', *[1] * 8, 'yellow']),
+    ]
+)
+def test_get_mnemonic_candidates(words, num_candidates) -> None:
+    mnemonic = 'legal winner thank year wave sausage worth useful legal winner thank yellow'.split(' ')
+    for position, word in words.items():
+        mnemonic[position] = word
+    candidates = get_mnemonic_candidates(' '.join(mnemonic), WORD_LISTS_PATH)['english']
+    word_list = _get_word_list('english', WORD_LISTS_PATH)
+    for word_candidates, expected in zip(candidates, num_candidates):
+        if isinstance(expected, str):
+            # A misspelled or marked word stands for the words close to it
+            assert 1 < len(word_candidates) < 2048
+            assert word_list.index(expected) in word_candidates
+        else:
+            assert len(word_candidates) == expected
+    assert 'legal winner thank year wave sausage worth useful legal winner thank yellow' in list(
+        iter_candidate_mnemonics(candidates, 'english', WORD_LISTS_PATH))
+
+
+@pytest.mark.parametrize(
+    'mnemonic',
+    [
+        'legal winner thank year wave sausage worth useful legal winner thank',
+        'legal winner ? year ? sausage worth useful ? winner thank yellow',
+    ]
+)
+def test_get_mnemonic_candidates_invalid(mnemonic) -> None:
+    with pytest.raises(ValueError):
+        get_mnemonic_candidates(mnemonic, WORD_LISTS_PATH)
+
+
+def test_iter_candidate_mnemonics_checksum() -> None:
+    mnemonic = 'legal winner thank year wave sausage worth useful legal winner thank ?'
+    candidates = get_mnemonic_candidates(mnemonic, WORD_LISTS_PATH)['english']
+    candidate_mnemonics = list(iter_candidate_mnemonics(candidates, 'english', WORD_LISTS_PATH))
+    # The last word of a 12-word mnemonic carries a 4-bit checksum
+    assert len(candidate_mnemonics) == 2048 // 16
+    assert all(reconstruct_mnemonic(candidate, WORD_LISTS_PATH) == candidate for candidate in candidate_mnemonics)
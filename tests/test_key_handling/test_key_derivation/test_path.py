@@ -10,6 +10,8 @@ from staking_deposit.key_handling.key_derivation.tree import (
 )
 
 from staking_deposit.key_handling.key_derivation.path import (
+    DerivationCache,
+    DerivationContext,
     mnemonic_and_path_to_key,
     path_to_nodes,
 )
@@ -79,6 +81,56 @@ def test_mnemonic_and_path_to_key(test_vector) -> None:
     assert mnemonic_and_path_to_key(mnemonic=mnemonic, path=path, password=password) == key
 
 
+@pytest.mark.parametrize(
+    'test_vector',
+    [test_vector_dict]
+)
+def test_derivation_context(test_vector) -> None:
+    context = DerivationContext(mnemonic=test_vector['mnemonic'], password=test_vector['password'])
+    assert context.seed == bytes.fromhex(test_vector['seed'])
+    assert context.master_SK == test_vector['master_SK']
+    assert context.derive_key(test_vector['path']) == test_vector['child_SK']
+
+    context.wipe()
+    with pytest.raises(ValueError):
+        context.derive_key(test_vector['path'])
+    with pytest.raises(ValueError):
+        context.seed
+
+
+@pytest.mark.parametrize(
+    'test_vector',
+    [test_vector_dict]
+)
+def test_derivation_context_cache(test_vector) -> None:
+    mnemonic = test_vector['mnemonic']
+    password = test_vector['password']
+    with DerivationContext(mnemonic=mnemonic, password=password) as context:
+        for index in range(2):
+            withdrawal_key_path = f'm/12381/3600/{index}/0'
+            signing_key_path = f'{withdrawal_key_path}/0'
+            assert context.derive_key(withdrawal_key_path) == mnemonic_and_path_to_key(
+                mnemonic=mnemonic, path=withdrawal_key_path, password=password)
+            assert context.derive_key(signing_key_path) == mnemonic_and_path_to_key(
+                mnemonic=mnemonic, path=signing_key_path, password=password)
+        # 1st credential: 4 + 1 derivations, 2nd credential: 2 + 1 derivations
+        assert context.cache.misses == 8
+        assert context.cache.hits == 4 + 2 + 4
+    assert len(context.cache) == 0
+
+
+def test_derivation_cache_eviction() -> None:
+    cache = DerivationCache(max_size=2)
+    cache.put([1], 1)
+    cache.put([1, 2], 2)
+    evicted = cache._nodes[(1,)]
+    assert cache.longest_prefix([1, 2, 3]) == (2, 2)
+    cache.put([1, 2, 3], 3)
+    assert len(cache) == 2
+    assert evicted == bytearray(32)
+    assert cache.longest_prefix([1, 5]) == (0, None)
+
+
 @pytest.mark.parametrize(
     'path, valid',
     [
@@ -1,8 +1,11 @@
 import os
 import json
 import pytest
+from py_ecc.bls import G2ProofOfPossession as bls
 
 from staking_deposit.key_handling.keystore import (
+    INSECURE_KEYSTORE_DESCRIPTION,
+    InsecurePbkdf2Keystore,
     Keystore,
     ScryptKeystore,
     Pbkdf2Keystore,
@@ -59,6 +62,26 @@ def test_encrypt_decrypt_scrypt_random_iv() -> None:
     assert generated_keystore.decrypt(test_vector_password) == test_vector_secret
 
 
+def test_encrypt_precomputed_pubkey() -> None:
+    pubkey = bls.SkToPk(int.from_bytes(test_vector_secret, 'big'))
+    generated_keystore = Pbkdf2Keystore.encrypt(secret=test_vector_secret, password=test_vector_password,
+                                                pubkey=pubkey)
+    assert generated_keystore.pubkey == pubkey.hex()
+    assert generated_keystore.pubkey == Pbkdf2Keystore.encrypt(
+        secret=test_vector_secret, password=test_vector_password).pubkey
+
+
+def test_encrypt_decrypt_insecure_pbkdf2(tmp_path) -> None:
+    generated_keystore = InsecurePbkdf2Keystore.encrypt(secret=test_vector_secret, password=test_vector_password)
+    assert generated_keystore.description == INSECURE_KEYSTORE_DESCRIPTION
+    filefolder = os.path.join(tmp_path, 'keystore.json')
+    generated_keystore.save(filefolder)
+    # The cheap KDF is only accepted when the keystore is explicitly loaded as an insecure one
+    assert InsecurePbkdf2Keystore.from_file(filefolder).decrypt(test_vector_password) == test_vector_secret
+    with pytest.raises(ValueError):
+        Keystore.from_file(filefolder).decrypt(test_vector_password)
+
+
 def test_encrypt_decrypt_incorrect_password() -> None:
     generated_keystore = ScryptKeystore.encrypt(secret=test_vector_secret, password=test_vector_password)
     incorrect_password = test_vector_password + 'incorrect'
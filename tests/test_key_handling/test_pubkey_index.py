@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+from staking_deposit.key_handling.pubkey_index import (
+    PUBKEY_INDEX_VERSION,
+    PubkeyIndex,
+    master_PK_fingerprint,
+    open_pubkey_index,
+)
+
+MASTER_SK = 12513733877922233913083619867448865075222526338446857121953625441395088009793
+OTHER_MASTER_SK = 7532473784672925434562828575463627468286653264577465766546452562747278926392
+PUBKEY = b'\x11' * 48
+
+
+def test_master_PK_fingerprint() -> None:
+    assert master_PK_fingerprint(MASTER_SK) == master_PK_fingerprint(MASTER_SK)
+    assert master_PK_fingerprint(MASTER_SK) != master_PK_fingerprint(OTHER_MASTER_SK)
+    assert MASTER_SK.to_bytes(32, 'big').hex() not in master_PK_fingerprint(MASTER_SK)
+
+
+def test_put_and_get(tmp_path) -> None:
+    path = str(tmp_path / 'pubkeys.sqlite')
+    with PubkeyIndex(path, master_SK=MASTER_SK) as pubkey_index:
+        assert pubkey_index.get('m/12381/3600/0/0') is None
+        pubkey_index.put('m/12381/3600/0/0', PUBKEY)
+        assert pubkey_index.get('m/12381/3600/0/0') == PUBKEY
+
+    # The entries persist, but only for the seed that wrote them
+    with PubkeyIndex(path, master_SK=MASTER_SK) as pubkey_index:
+        assert pubkey_index.pubkeys() == {'m/12381/3600/0/0': PUBKEY}
+    with PubkeyIndex(path, master_SK=OTHER_MASTER_SK) as pubkey_index:
+        assert pubkey_index.get('m/12381/3600/0/0') is None
+
+
+def test_tampered_entry(tmp_path) -> None:
+    path = str(tmp_path / 'pubkeys.sqlite')
+    with PubkeyIndex(path, master_SK=MASTER_SK) as pubkey_index:
+        pubkey_index.put_many({'m/12381/3600/0/0': PUBKEY, 'm/12381/3600/0/0/0': PUBKEY})
+    with sqlite3.connect(path) as connection:
+        connection.execute("UPDATE pubkeys SET pubkey = ? WHERE path = 'm/12381/3600/0/0'", (b'\x22' * 48,))
+
+    with PubkeyIndex(path, master_SK=MASTER_SK) as pubkey_index:
+        assert pubkey_index.check_integrity() == 1
+        assert pubkey_index.check_integrity() == 0
+        assert pubkey_index.get('m/12381/3600/0/0') is None
+        assert pubkey_index.get('m/12381/3600/0/0/0') == PUBKEY
+
+
+def test_invalidate(tmp_path) -> None:
+    path = str(tmp_path / 'pubkeys.sqlite')
+    with PubkeyIndex(path, master_SK=OTHER_MASTER_SK) as pubkey_index:
+        pubkey_index.put('m/12381/3600/0/0', PUBKEY)
+    with PubkeyIndex(path, master_SK=MASTER_SK) as pubkey_index:
+        pubkey_index.put_many({'m/12381/3600/0/0': PUBKEY, 'm/12381/3600/1/0': PUBKEY})
+        pubkey_index.invalidate(['m/12381/3600/0/0'])
+        assert pubkey_index.pubkeys() == {'m/12381/3600/1/0': PUBKEY}
+        pubkey_index.invalidate()
+        assert pubkey_index.pubkeys() == {}
+    with PubkeyIndex(path, master_SK=OTHER_MASTER_SK) as pubkey_index:
+        assert pubkey_index.get('m/12381/3600/0/0') == PUBKEY
+
+
+def test_version_mismatch(tmp_path) -> None:
+    path = str(tmp_path / 'pubkeys.sqlite')
+    with PubkeyIndex(path, master_SK=MASTER_SK) as pubkey_index:
+        pubkey_index.put('m/12381/3600/0/0', PUBKEY)
+    with sqlite3.connect(path) as connection:
+        connection.execute(f'PRAGMA user_version = {PUBKEY_INDEX_VERSION + 1}')
+    with PubkeyIndex(path, master_SK=MASTER_SK) as pubkey_index:
+        assert pubkey_index.pubkeys() == {}
+
+
+def test_other_database(tmp_path) -> None:
+    path = str(tmp_path / 'other.sqlite')
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE pubkeys (name TEXT)')
+        connection.execute("INSERT INTO pubkeys VALUES ('kept')")
+        connection.execute(f'PRAGMA user_version = {PUBKEY_INDEX_VERSION + 1}')
+    connection.close()
+    with pytest.raises(ValueError):
+        PubkeyIndex(path, master_SK=MASTER_SK)
+    # The database is left untouched
+    with sqlite3.connect(path) as connection:
+        assert connection.execute('SELECT name FROM pubkeys').fetchall() == [('kept',)]
+        assert connection.execute('PRAGMA user_version').fetchone()[0] == PUBKEY_INDEX_VERSION + 1
+    connection.close()
+
+
+def test_open_pubkey_index(tmp_path) -> None:
+    with open_pubkey_index(None, master_SK=MASTER_SK) as pubkey_index:
+        assert pubkey_index is None
+    with open_pubkey_index(str(tmp_path / 'pubkeys.sqlite'), master_SK=MASTER_SK) as pubkey_index:
+        assert isinstance(pubkey_index, PubkeyIndex)
@@ -0,0 +1,68 @@
+from itertools import product
+
+import pytest
+from py_ecc.bls import G2ProofOfPossession as bls
+
+from staking_deposit.key_handling.key_derivation.path import DerivationContext
+from staking_deposit.mnemonic_recovery import (
+    _split_candidates,
+    find_mnemonic_password,
+    recover_mnemonic_from_pubkeys,
+)
+from staking_deposit.utils.constants import WORD_LISTS_PATH
+
+
+@pytest.mark.parametrize(
+    'partial_mnemonic, num_workers',
+    [
+        ('legal winner thank year wave sausage worth useful legal winner thnak yellow', 1),
+        ('legal winner thank year wave sausage worth useful legal winner thank ?', 2),
+        ('legal winner thank year wave sausage? worth useful legal wnner thank yellow', 2),
+        # The first uncertain word has a single candidate
+        ('legal winner thank year wave sausagee worth useful legal winner thank ?', 2),
+    ]
+)
+def test_recover_mnemonic_from_pubkeys(partial_mnemonic, num_workers) -> None:
+    mnemonic = 'legal winner thank year wave sausage worth useful legal winner thank yellow'
+    with DerivationContext(mnemonic=mnemonic, password="") as derivation_context:
+        target = bls.SkToPk(derivation_context.derive_key('m/12381/3600/1/0/0'))
+    found = recover_mnemonic_from_pubkeys(mnemonic=partial_mnemonic, password="", words_path=WORD_LISTS_PATH,
+                                          targets=[target], start_index=0, num_indices=2, num_workers=num_workers)
+    assert found == (mnemonic, 1)
+
+
+@pytest.mark.parametrize('candidates', [
+    [[1], [2, 3], [4], list(range(2048))],
+    [[1], [2], [3, 4, 5], [6], list(range(10)), list(range(20))],
+    [[5], [6], [7]],
+])
+def test_split_candidates(candidates) -> None:
+    num_chunks = 8
+    parts = _split_candidates(candidates, num_chunks)
+    # The parts cover the search space, in order
+    assert [words for part in parts for words in product(*part)] == list(product(*candidates))
+    assert len(parts) >= min(num_chunks, len(list(product(*candidates))))
+
+
+def test_recover_mnemonic_from_pubkeys_not_found() -> None:
+    found = recover_mnemonic_from_pubkeys(
+        mnemonic='legal winner thank year wave sausage worth useful legal winner thnak yellow', password="",
+        words_path=WORD_LISTS_PATH, targets=[b'\x11' * 48], start_index=0, num_indices=1,
+    )
+    assert found is None
+
+
+@pytest.mark.parametrize('num_workers', [1, 2])
+def test_find_mnemonic_password(num_workers) -> None:
+    mnemonic = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+    with DerivationContext(mnemonic=mnemonic, password="TREZOR") as derivation_context:
+        target = bls.SkToPk(derivation_context.derive_key('m/12381/3600/0/0/0'))
+    passwords = ['', 'trezor', 'Trezor'] * 8 + ['TREZOR'] + ['TREZOR!'] * 20
+    found, num_tried = find_mnemonic_password(mnemonic=mnemonic, passwords=passwords, targets=[target],
+                                              num_workers=num_workers)
+    assert found == 'TREZOR'
+    if num_workers == 1:
+        assert num_tried == 25
+    found, num_tried = find_mnemonic_password(mnemonic=mnemonic, passwords=passwords[:24], targets=[target],
+                                              num_workers=num_workers)
+    assert (found, num_tried) == (None, 24)
@@ -0,0 +1,122 @@
+import pytest
+from py_ecc.bls import G2ProofOfPossession as py_ecc_bls
+
+from staking_deposit.utils import bls
+from staking_deposit.utils.bls import (
+    BACKENDS,
+    BLS_BACKEND_ENV_VAR,
+    BLSBackend,
+    BlstBackend,
+    PyEccBackend,
+    register_backend,
+)
+
+SKS = [1, 42, 2**254 - 1, 0x263dbd792f5b1be47ed85f8938c0f29586af0d3ac7b977f21c278fe1462040e3]
+MESSAGES = [b'', b'\x00' * 32, bytes(range(32)), b'abc' * 100]
+
+
+@pytest.fixture(params=BACKENDS.values(), ids=BACKENDS.keys())
+def backend(request):
+    if not request.param.is_available():
+        pytest.skip(f'The {request.param.name} backend is not installed')
+    return request.param
+
+
+@pytest.fixture
+def reset_backend(monkeypatch):
+    monkeypatch.setattr(bls, '_backend', None)
+    monkeypatch.delenv(BLS_BACKEND_ENV_VAR, raising=False)
+
+
+@pytest.mark.parametrize('sk', SKS)
+def test_backend_conformance(backend, sk) -> None:
+    # Every backend gives the same results as the py_ecc reference
+    pubkey = backend.SkToPk(sk)
+    assert pubkey == py_ecc_bls.SkToPk(sk)
+    for message in MESSAGES:
+        signature = backend.Sign(sk, message)
+        assert signature == py_ecc_bls.Sign(sk, message)
+        assert backend.Verify(pubkey, message, signature)
+    assert not backend.Verify(pubkey, MESSAGES[0] + b'\x01', signature)
+    assert not backend.Verify(py_ecc_bls.SkToPk(sk + 1), MESSAGES[-1], signature)
+
+
+def test_backend_invalid_inputs(backend) -> None:
+    signature = py_ecc_bls.Sign(1, b'')
+    assert not backend.Verify(b'\x00' * 48, b'', signature)
+    assert not backend.Verify(b'\xc0' + b'\x00' * 47, b'', signature)  # The identity
+    assert not backend.Verify(py_ecc_bls.SkToPk(1), b'', b'\x00' * 96)
+
+
+def test_backend_batch_verify(backend) -> None:
+    pubkeys = [py_ecc_bls.SkToPk(sk) for sk in SKS]
+    signatures = [py_ecc_bls.Sign(sk, message) for sk, message in zip(SKS, MESSAGES)]
+    assert backend.BatchVerify(pubkeys, MESSAGES, signatures)
+    assert backend.BatchVerify([], [], [])
+    # Swapped signatures
+    assert not backend.BatchVerify(pubkeys, MESSAGES, [signatures[1], signatures[0], *signatures[2:]])
+    assert not backend.BatchVerify(pubkeys, MESSAGES, [*signatures[:-1], b'\x00' * 96])
+
+
+def test_batch_verify_lengths() -> None:
+    with pytest.raises(ValueError):
+        bls.BatchVerify([py_ecc_bls.SkToPk(1)], [b'', b''], [py_ecc_bls.Sign(1, b'')])
+
+
+def test_get_backend_auto(reset_backend) -> None:
+    expected = BlstBackend if BlstBackend.is_available() else PyEccBackend
+    assert bls.get_backend() is expected
+
+
+def test_get_backend_environment(reset_backend, monkeypatch) -> None:
+    monkeypatch.setenv(BLS_BACKEND_ENV_VAR, 'py_ecc')
+    assert bls.get_backend() is PyEccBackend
+    assert bls.SkToPk(42) == py_ecc_bls.SkToPk(42)
+
+
+def test_set_backend(reset_backend) -> None:
+    bls.set_backend('py_ecc')
+    assert bls.get_backend() is PyEccBackend
+    with pytest.raises(ValueError):
+        bls.set_backend('unknown')
+    if not BlstBackend.is_available():
+        with pytest.raises(ValueError):
+            bls.set_backend('blst')
+
+
+def test_register_backend_incomplete() -> None:
+    class IncompleteBackend(BLSBackend):
+        name = 'incomplete'
+
+        @staticmethod
+        def is_available() -> bool:
+            return True
+
+        @staticmethod
+        def SkToPk(SK: int) -> bytes:
+            return b''
+
+    with pytest.raises(TypeError, match='Sign, Verify'):
+        register_backend(IncompleteBackend)
+    assert 'incomplete' not in BACKENDS
+
+
+def test_find_invalid_signatures() -> None:
+    pubkeys = [py_ecc_bls.SkToPk(sk) for sk in SKS]
+    signatures = [py_ecc_bls.Sign(sk, message) for sk, message in zip(SKS, MESSAGES)]
+    assert bls.find_invalid_signatures(pubkeys, MESSAGES, signatures) == []
+    assert bls.find_invalid_signatures([], [], []) == []
+    signatures[1], signatures[3] = signatures[3], signatures[1]
+    assert bls.find_invalid_signatures(pubkeys, MESSAGES, signatures) == [1, 3]
+
+
+def test_hash_to_G2_cache() -> None:
+    bls._hash_to_G2.cache_clear()
+    message = b'\x42' * 32
+    signature = PyEccBackend.Sign(42, message)
+    assert bls.hash_to_G2_cache_info().misses == 1
+    # The verification reuses the message point of the signature
+    assert PyEccBackend.Verify(py_ecc_bls.SkToPk(42), message, signature)
+    assert PyEccBackend.BatchVerify([py_ecc_bls.SkToPk(42)], [message], [signature])
+    cache_info = bls.hash_to_G2_cache_info()
+    assert (cache_info.hits, cache_info.misses, cache_info.currsize) == (2, 1, 1)
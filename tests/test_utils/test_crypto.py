@@ -4,6 +4,12 @@ from staking_deposit.utils.crypto import (
     scrypt,
     PBKDF2,
     AES_128_CTR,
+    HKDF,
+    HKDF_expand,
+    HKDF_extract,
+    HMAC_SHA256,
+    SHA256,
+    SHA256_chunks,
 )
 
 
@@ -37,6 +43,19 @@ def test_scrypt_invalid_params(n, r, valid):
             )
 
 
+def test_scrypt_insecure():
+    # Devnet keystores may use unsafe parameters, but not invalid ones
+    scrypt(password="mypassword", salt="mysalt", n=2**4, r=8, p=1, dklen=32, insecure=True)
+    with pytest.raises(ValueError):
+        scrypt(password="mypassword", salt="mysalt", n=2**16, r=1, p=1, dklen=32, insecure=True)
+
+
+def test_PBKDF2_insecure():
+    assert PBKDF2(password=b"mypassword", salt=b"mysalt", dklen=32, c=2**10, prf='sha256', insecure=True)
+    with pytest.raises(ValueError):
+        PBKDF2(password=b"mypassword", salt=b"mysalt", dklen=32, c=2**10, prf='sha256')
+
+
 @pytest.mark.parametrize(
     'prf, valid',
     [
@@ -105,3 +124,51 @@ def test_AES_128_CTR(key, iv, valid):
     else:
         with pytest.raises(ValueError):
             AES_128_CTR(key=key, iv=iv)
+
+
+@pytest.mark.parametrize(
+    'data, chunk_size, valid',
+    [
+        (bytes(range(256)) * 4, 32, True),
+        (bytearray(b'\x12' * 96), 48, True),
+        (b'', 32, True),
+        (b'\x12' * 33, 32, False),
+        (b'\x12' * 32, 0, False),
+    ]
+)
+def test_SHA256_chunks(data, chunk_size, valid):
+    if valid:
+        expected = b''.join(SHA256(bytes(data[i: i + chunk_size])) for i in range(0, len(data), chunk_size))
+        assert SHA256_chunks(data=data, chunk_size=chunk_size) == expected
+    else:
+        with pytest.raises(ValueError):
+            SHA256_chunks(data=data, chunk_size=chunk_size)
+
+
+@pytest.mark.parametrize(
+    'salt, IKM, L, info',
+    [
+        (b'\x00\x00\x00\x01', b'\x12' * 32, 8160, b''),
+        (b'BLS-SIG-KEYGEN-SALT-', b'\x34' * 64, 48, b'\x00\x30'),
+        (b'salt', b'IKM', 1, b'info'),
+    ]
+)
+def test_HKDF_expand(salt, IKM, L, info):
+    OKM = HKDF_expand(PRK=HKDF_extract(salt=salt, IKM=IKM), L=L, info=info)
+    assert OKM == HKDF(salt=salt, IKM=IKM, L=L, info=info)
+
+
+@pytest.mark.parametrize(
+    'L',
+    [0, 255 * 32 + 1]
+)
+def test_HKDF_expand_invalid_length(L):
+    with pytest.raises(ValueError):
+        HKDF_expand(PRK=b'\x12' * 32, L=L)
+
+
+def test_HMAC_SHA256():
+    # RFC 4231 test case 2
+    assert HMAC_SHA256(key=b'Jefe', message=b'what do ya want for nothing?') == bytes.fromhex(
+        '5bdcc146bf60754e6a042426089575c75a003f089d2739839dec58b964ec3843'
+    )
@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import random
+
+import pytest
+from py_ecc.optimized_bls12_381 import G1, curve_order, multiply, normalize
+
+from staking_deposit.utils import fixed_base
+from staking_deposit.utils.fixed_base import (
+    G1_TABLE_CACHE_ENV_VAR,
+    G1_WINDOW_BITS,
+    G1FixedBaseTable,
+    get_g1_table,
+)
+
+
+@pytest.fixture(scope='module')
+def table() -> G1FixedBaseTable:
+    return G1FixedBaseTable.build()
+
+
+@pytest.fixture
+def reset_table(monkeypatch):
+    monkeypatch.setattr(fixed_base, '_g1_table', None)
+
+
+@pytest.mark.parametrize('scalar', [
+    1, 2, 3, 2**G1_WINDOW_BITS - 1, 2**G1_WINDOW_BITS, 2**(2 * G1_WINDOW_BITS) + 1, 2**254 - 1, curve_order - 1,
+    *(random.Random(2333).randrange(curve_order) for _ in range(8)),
+])
+def test_multiply(table: G1FixedBaseTable, scalar: int) -> None:
+    assert normalize(table.multiply(scalar)) == normalize(multiply(G1, scalar))
+
+
+def test_multiply_reduces_scalar(table: G1FixedBaseTable) -> None:
+    assert normalize(table.multiply(curve_order + 5)) == normalize(multiply(G1, 5))
+    assert table.multiply(0)[2] == 0  # The point at infinity
+    assert table.multiply(curve_order)[2] == 0
+
+
+def test_save_from_file(tmp_path, table: G1FixedBaseTable) -> None:
+    path = os.path.join(tmp_path, 'g1_table')
+    table.save(path)
+    loaded_table = G1FixedBaseTable.from_file(path)
+    assert normalize(loaded_table.multiply(123456789)) == normalize(table.multiply(123456789))
+
+
+def test_from_file_corrupted(tmp_path, table: G1FixedBaseTable) -> None:
+    path = os.path.join(tmp_path, 'g1_table')
+    table.save(path)
+    with open(path, 'r+b') as f:
+        f.seek(1000)
+        f.write(b'\x00' * 8)
+    with pytest.raises(ValueError):
+        G1FixedBaseTable.from_file(path)
+    with open(path, 'wb') as f:
+        f.write(b'')
+    with pytest.raises(ValueError):
+        G1FixedBaseTable.from_file(path)
+
+
+def test_from_file_not_on_curve(tmp_path, table: G1FixedBaseTable) -> None:
+    # A tampered entry, with a valid checksum
+    buffer = bytearray(table._buffer)
+    buffer[1000] ^= 1
+    table_size = len(buffer) - 32
+    buffer[table_size:] = hashlib.sha256(buffer[:table_size]).digest()
+    path = os.path.join(tmp_path, 'g1_table')
+    with open(path, 'wb') as f:
+        f.write(buffer)
+    with pytest.raises(ValueError):
+        G1FixedBaseTable.from_file(path)
+
+
+def test_save_concurrently(tmp_path, table: G1FixedBaseTable) -> None:
+    path = os.path.join(tmp_path, 'g1_table')
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: table.save(path), range(8)))
+    # No temporary file is left behind
+    assert os.listdir(tmp_path) == ['g1_table']
+    G1FixedBaseTable.from_file(path)
+
+
+def test_get_g1_table_cache(tmp_path, monkeypatch, reset_table) -> None:
+    path = os.path.join(tmp_path, 'g1_table')
+    monkeypatch.setenv(G1_TABLE_CACHE_ENV_VAR, path)
+    # The table is saved to the missing cache file ...
+    get_g1_table()
+    assert os.path.exists(path)
+    # ... and then loaded from it
+    monkeypatch.setattr(fixed_base, '_g1_table', None)
+    monkeypatch.setattr(G1FixedBaseTable, 'build', lambda: pytest.fail('The table should be loaded'))
+    assert normalize(get_g1_table().multiply(42)) == normalize(multiply(G1, 42))
+
+
+def test_get_g1_table_cache_unwritable(tmp_path, monkeypatch, reset_table) -> None:
+    # The cache is optional: the table is kept in memory if it can't be saved
+    monkeypatch.setenv(G1_TABLE_CACHE_ENV_VAR, os.path.join(tmp_path, 'missing', 'g1_table'))
+    assert normalize(get_g1_table().multiply(42)) == normalize(multiply(G1, 42))
+    assert os.listdir(tmp_path) == []
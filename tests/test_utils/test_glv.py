@@ -0,0 +1,60 @@
+from hashlib import sha256
+import random
+
+import pytest
+from py_ecc.bls import G2ProofOfPossession as py_ecc_bls
+from py_ecc.bls.hash_to_curve import hash_to_G2
+from py_ecc.optimized_bls12_381 import G2, curve_order, is_inf, multiply, normalize
+
+from staking_deposit.utils.bls import POP_DST, PyEccBackend
+from staking_deposit.utils.glv import (
+    G2_MULTIPLY_ENV_VAR,
+    X_ABS,
+    decompose_scalar,
+    multiply_G2,
+    use_glv_multiply,
+)
+
+_random = random.Random(2333)
+
+
+@pytest.mark.parametrize('scalar', [
+    1, 2, 3, X_ABS - 1, X_ABS, X_ABS + 1, X_ABS**2, X_ABS**3, curve_order - X_ABS, 2**254 - 1, curve_order - 1,
+    *(_random.randrange(1, curve_order) for _ in range(8)),
+])
+def test_multiply_G2(scalar: int) -> None:
+    point = hash_to_G2(scalar.to_bytes(32, 'big'), POP_DST, sha256)
+    assert normalize(multiply_G2(point, scalar)) == normalize(multiply(point, scalar))
+
+
+def test_multiply_G2_generator() -> None:
+    scalar = _random.randrange(1, curve_order)
+    assert normalize(multiply_G2(G2, scalar)) == normalize(multiply(G2, scalar))
+    assert normalize(multiply_G2(G2, curve_order + 5)) == normalize(multiply(G2, 5))
+    assert is_inf(multiply_G2(G2, 0))
+    assert is_inf(multiply_G2(G2, curve_order))
+    assert is_inf(multiply_G2(multiply(G2, curve_order), 5))
+
+
+@pytest.mark.parametrize('scalar', [0, 1, X_ABS, curve_order - 1, _random.randrange(curve_order)])
+def test_decompose_scalar(scalar: int) -> None:
+    digits = decompose_scalar(scalar)
+    assert all(0 <= digit < 2**64 for digit in digits)
+    assert sum(digit * X_ABS**i for i, digit in enumerate(digits)) == scalar
+
+
+@pytest.mark.parametrize('sk', [_random.randrange(1, curve_order) for _ in range(4)])
+def test_sign(sk: int, monkeypatch) -> None:
+    message = sk.to_bytes(32, 'big')
+    monkeypatch.delenv(G2_MULTIPLY_ENV_VAR, raising=False)
+    assert use_glv_multiply()
+    assert PyEccBackend.Sign(sk, message) == py_ecc_bls.Sign(sk, message)
+    monkeypatch.setenv(G2_MULTIPLY_ENV_VAR, 'py_ecc')
+    assert not use_glv_multiply()
+    assert PyEccBackend.Sign(sk, message) == py_ecc_bls.Sign(sk, message)
+
+
+def test_use_glv_multiply_invalid(monkeypatch) -> None:
+    monkeypatch.setenv(G2_MULTIPLY_ENV_VAR, 'unknown')
+    with pytest.raises(ValueError):
+        use_glv_multiply()
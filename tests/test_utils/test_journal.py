@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from staking_deposit.exceptions import ValidationError
+from staking_deposit.key_handling.keystore import Pbkdf2Keystore
+from staking_deposit.utils.journal import JOURNAL_FILE_NAME, KeyGenerationJournal
+
+PARAMETERS = {'start_index': 3, 'num_validators': 4, 'network_name': 'mainnet'}
+
+
+def test_journal_resume(tmp_path) -> None:
+    folder = str(tmp_path)
+    (tmp_path / 'keystore-3.json').write_text('{}')
+    (tmp_path / 'keystore-4.json').write_text('{}')
+    journal = KeyGenerationJournal.open(folder, PARAMETERS, resume=False)
+    assert journal.next_index == 3
+    journal.record(index=3, keystore='keystore-3.json', deposit_datum={'pubkey': 'aa'})
+    with pytest.raises(ValueError):
+        journal.record(index=5, keystore='keystore-5.json', deposit_datum={'pubkey': 'cc'})
+
+    # A line cut short by a crash is dropped
+    with open(os.path.join(folder, JOURNAL_FILE_NAME), 'a') as f:
+        f.write('{"index": 4, "keyst')
+
+    with pytest.raises(ValidationError):
+        KeyGenerationJournal.open(folder, PARAMETERS, resume=False)
+    with pytest.raises(ValidationError):
+        KeyGenerationJournal.open(folder, {**PARAMETERS, 'network_name': 'goerli'}, resume=True)
+
+    journal = KeyGenerationJournal.open(folder, PARAMETERS, resume=True)
+    assert journal.next_index == 4
+    assert journal.deposit_data == [{'pubkey': 'aa'}]
+    journal.record(index=4, keystore='keystore-4.json', deposit_datum={'pubkey': 'bb'})
+    assert KeyGenerationJournal.open(folder, PARAMETERS, resume=True).deposit_data == [
+        {'pubkey': 'aa'}, {'pubkey': 'bb'},
+    ]
+
+    journal.remove()
+    assert not os.path.exists(os.path.join(folder, JOURNAL_FILE_NAME))
+
+
+def test_journal_missing_keystore(tmp_path) -> None:
+    folder = str(tmp_path)
+    journal = KeyGenerationJournal.open(folder, PARAMETERS, resume=False)
+    journal.record(index=3, keystore='keystore-3.json', deposit_datum={'pubkey': 'aa'})
+    with pytest.raises(ValidationError):
+        KeyGenerationJournal.open(folder, PARAMETERS, resume=True)
+
+
+def test_journal_keystore_password(tmp_path) -> None:
+    folder = str(tmp_path)
+    journal = KeyGenerationJournal.open(folder, PARAMETERS, resume=False)
+    assert not journal.resumed
+    journal.verify_keystore_password('anything')  # Nothing recorded yet
+
+    Pbkdf2Keystore.encrypt(secret=b'\x11' * 32, password='MyPassword').save(str(tmp_path / 'keystore-3.json'))
+    journal.record(index=3, keystore='keystore-3.json', deposit_datum={'pubkey': 'aa'})
+    journal = KeyGenerationJournal.open(folder, PARAMETERS, resume=True)
+    assert journal.resumed
+    journal.verify_keystore_password('MyPassword')
+    with pytest.raises(ValidationError):
+        journal.verify_keystore_password('AnotherPassword')
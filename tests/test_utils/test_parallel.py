@@ -0,0 +1,41 @@
+from contextlib import closing
+
+import pytest
+
+from staking_deposit.utils.parallel import (
+    iter_search_results,
+    search_stopped,
+    split_into_chunks,
+)
+
+
+@pytest.mark.parametrize(
+    'items, num_chunks, expected',
+    [
+        (range(0, 10), 3, [range(0, 4), range(4, 8), range(8, 10)]),
+        (range(5, 7), 4, [range(5, 6), range(6, 7)]),
+        ([1, 2, 3], 1, [[1, 2, 3]]),
+        ([], 2, []),
+    ]
+)
+def test_split_into_chunks(items, num_chunks, expected) -> None:
+    chunks = split_into_chunks(items, num_chunks)
+    assert chunks == expected
+    assert [item for chunk in chunks for item in chunk] == list(items)
+
+
+def test_split_into_chunks_invalid() -> None:
+    with pytest.raises(ValueError):
+        split_into_chunks([1, 2, 3], 0)
+
+
+def test_iter_search_results() -> None:
+    tasks = [dict(base=base, exp=2) for base in range(10)]
+    results = dict(iter_search_results(pow, tasks, num_workers=2))
+    assert results == {task_number: task_number**2 for task_number in range(10)}
+
+    # The search can be stopped early; only the workers are ever told to stop
+    with closing(iter_search_results(pow, tasks, num_workers=2)) as search_results:
+        task_number, result = next(search_results)
+        assert result == task_number**2
+    assert not search_stopped()
@@ -2,6 +2,9 @@ import pytest
 
 from staking_deposit.utils.ssz import (
     DepositMessage,
+    ForkData,
+    _compute_fork_data_root,
+    compute_bls_to_execution_change_domain,
     compute_deposit_domain,
     compute_deposit_fork_data_root,
     compute_signing_root,
@@ -40,6 +43,18 @@ def test_compute_deposit_fork_data_root(current_version, valid, result):
             compute_deposit_fork_data_root(current_version=current_version)
 
 
+def test_fork_data_root_cache():
+    genesis_validators_root = b"\x34" * 32
+    _compute_fork_data_root.cache_clear()
+    domain = compute_bls_to_execution_change_domain(b"\x12" * 4, genesis_validators_root)
+    # Equal inputs of another bytes-like type share the cached root
+    assert compute_bls_to_execution_change_domain(bytearray(b"\x12" * 4), genesis_validators_root) == domain
+    assert _compute_fork_data_root.cache_info().hits == 1
+    assert _compute_fork_data_root.cache_info().misses == 1
+    fork_data = ForkData(current_version=b"\x12" * 4, genesis_validators_root=genesis_validators_root)
+    assert domain[4:] == fork_data.hash_tree_root[:28]
+
+
 @pytest.mark.parametrize(
     'domain, valid, result',
     [
@@ -1,13 +1,29 @@
+import json
+import os
 import pytest
 from typing import (
     Any,
+    Callable,
+    Dict,
+    List,
 )
 
+from eth_typing import HexAddress
+
+from staking_deposit.credentials import CredentialList, deposit_datum_to_json
 from staking_deposit.exceptions import ValidationError
+from staking_deposit.settings import MainnetSetting
+from staking_deposit.utils.constants import MAX_DEPOSIT_AMOUNT
+from staking_deposit.utils.ssz import DepositData
 from staking_deposit.utils.validation import (
     normalize_input_list,
     validate_int_range,
     validate_password_strength,
+    validate_pubkey_or_bls_withdrawal_credentials,
+    validate_pubkeys_list,
+    verify_bls_to_execution_change_json,
+    verify_deposit_data_json,
+    verify_deposit_signatures,
 )
 
 
@@ -60,3 +76,129 @@ def test_validate_int_range(num: Any, low: int, high: int, valid: bool) -> None:
 )
 def test_normalize_input_list(input, result):
     assert normalize_input_list(input) == result
+
+
+@pytest.mark.parametrize(
+    'input, valid',
+    [
+        ('0x' + '11' * 48, True),
+        ('11' * 48, True),
+        ('0x00' + '11' * 31, True),
+        ('0x01' + '00' * 11 + '11' * 20, False),
+        ('0x' + '11' * 20, False),
+        ('0xzz', False),
+    ]
+)
+def test_validate_pubkey_or_bls_withdrawal_credentials(input, valid):
+    if valid:
+        assert validate_pubkey_or_bls_withdrawal_credentials(input) == bytes.fromhex(input.replace('0x', ''))
+    else:
+        with pytest.raises(ValidationError):
+            validate_pubkey_or_bls_withdrawal_credentials(input)
+
+
+@pytest.mark.parametrize(
+    'input, result',
+    [
+        ('0x' + '11' * 48 + '\n' + '22' * 48 + ',\n\n', [b'\x11' * 48, b'\x22' * 48]),
+        ('0x' + '11' * 48 + ', 0x' + '22' * 48, [b'\x11' * 48, b'\x22' * 48]),
+        ('\n', []),
+        ('0x00' + '11' * 31, None),
+        ('0xzz', None),
+    ]
+)
+def test_validate_pubkeys_list(input, result):
+    if result is not None:
+        assert validate_pubkeys_list(input) == result
+    else:
+        with pytest.raises(ValidationError):
+            validate_pubkeys_list(input)
+
+
+def _tamper_json_file(filefolder: str, tamper: Callable[[List[Dict[str, Any]]], None]) -> None:
+    with open(filefolder) as f:
+        items = json.load(f)
+    tamper(items)
+    os.chmod(filefolder, 0o640)
+    with open(filefolder, 'w') as f:
+        json.dump(items, f)
+
+
+def _swap_signatures(items: List[Dict[str, Any]]) -> None:
+    items[0]['signature'], items[2]['signature'] = items[2]['signature'], items[0]['signature']
+
+
+def _swap_deposit_signatures(deposits: List[Dict[str, Any]]) -> None:
+    # The deposit data roots are recomputed, so that only the signatures are invalid
+    _swap_signatures(deposits)
+    for deposit in deposits:
+        deposit['deposit_data_root'] = DepositData(
+            pubkey=bytes.fromhex(deposit['pubkey']),
+            withdrawal_credentials=bytes.fromhex(deposit['withdrawal_credentials']),
+            amount=deposit['amount'],
+            signature=bytes.fromhex(deposit['signature']),
+        ).hash_tree_root.hex()
+
+
+@pytest.fixture(scope='module')
+def credential_list() -> CredentialList:
+    return CredentialList.from_mnemonic(
+        mnemonic='abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about',
+        mnemonic_password='',
+        num_keys=4,
+        amounts=[MAX_DEPOSIT_AMOUNT] * 4,
+        chain_setting=MainnetSetting,
+        start_index=0,
+        hex_eth1_withdrawal_address=HexAddress('0x00000000219ab540356cBB839Cbe05303d7705Fa'),
+    )
+
+
+def test_verify_deposit_data_json(tmp_path, capsys, credential_list: CredentialList) -> None:
+    credentials = credential_list.credentials
+    filefolder = credential_list.export_deposit_data_json(str(tmp_path))
+    assert verify_deposit_data_json(filefolder, credentials)
+
+    # The invalid signatures are found by bisecting the batch and reported
+    _tamper_json_file(filefolder, _swap_deposit_signatures)
+    capsys.readouterr()
+    assert not verify_deposit_data_json(filefolder, credentials)
+    output = capsys.readouterr().out
+    assert credentials[0].signing_pk.hex() in output
+    assert credentials[1].signing_pk.hex() not in output
+    assert credentials[2].signing_pk.hex() in output
+
+
+def test_verify_deposit_signatures(capsys, credential_list: CredentialList) -> None:
+    credentials = credential_list.credentials
+    deposit_data = [deposit_datum_to_json(credential.deposit_datum_dict) for credential in credentials]
+    assert verify_deposit_signatures(deposit_data)
+    assert verify_deposit_signatures([])
+
+    # Swap two of the signatures
+    signature = deposit_data[1]['signature']
+    deposit_data[1]['signature'] = deposit_data[3]['signature']
+    deposit_data[3]['signature'] = signature
+    capsys.readouterr()
+    assert not verify_deposit_signatures(deposit_data)
+    output = capsys.readouterr().out
+    assert credentials[1].signing_pk.hex() in output
+    assert credentials[3].signing_pk.hex() in output
+
+
+def test_verify_bls_to_execution_change_json(tmp_path, capsys, credential_list: CredentialList) -> None:
+    credentials = credential_list.credentials
+    validator_indices = [10, 11, 12, 13]
+    filefolder = credential_list.export_bls_to_execution_change_json(str(tmp_path), validator_indices)
+    kwargs = dict(
+        input_validator_indices=validator_indices,
+        input_execution_address='0x00000000219ab540356cBB839Cbe05303d7705Fa',
+        chain_setting=MainnetSetting,
+    )
+    assert verify_bls_to_execution_change_json(filefolder, credentials, **kwargs)
+
+    _tamper_json_file(filefolder, _swap_signatures)
+    capsys.readouterr()
+    assert not verify_bls_to_execution_change_json(filefolder, credentials, **kwargs)
+    output = capsys.readouterr().out
+    assert credentials[0].withdrawal_pk.hex() in output
+    assert credentials[3].withdrawal_pk.hex() not in output